@@ -1,7 +1,8 @@
-from flask import Flask, render_template, request, jsonify, redirect, url_for
+from flask import Flask, render_template, request, jsonify, redirect, url_for, Response, stream_with_context, g, has_request_context
 from flask_cors import CORS
 from datetime import datetime, date
 import json
+import os
 import webbrowser
 import threading
 import socket
@@ -10,23 +11,82 @@ import time
 import signal
 import atexit
 import logging
+import queue
+import random
+import hashlib
+import io
+import zipfile
+from collections import OrderedDict
+from functools import wraps
+from concurrent.futures import wait, FIRST_COMPLETED, TimeoutError as FuturesTimeoutError
+from psycopg2.extras import execute_values
 from datetime import datetime
-from postgre import create_pg_connection, end_pg_connection
+from postgre import get_pooled_connection, end_pg_connection, get_pg_pool, close_pg_pool, apply_migrations, PgListener
+from pdf_elevador import PDF_TEMPLATE_VERSAO, ServicoRenderizacaoPdf, ServicoSaturadoError
+from servidor_wsgi import ao_encerrar
+from registro_log import configurar_logging, encerrar_logging
+from metricas import MetricasRequisicao
+from consultas_lentas import MonitorConsultasLentas
+from json_rapido import ProvedorJsonRapido
+from compressao import Compressao, precomprimir_estaticos
+from estaticos import EstaticosVersionados
+from pacotes_js import PacotesJs
 
 #Teste update
-# Configurar logging para debug
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler('homemanager.log'),
-        logging.StreamHandler()
-    ]
+# Logging assíncrono (registro_log.py): JSON com rotação em homemanager.log, gravado
+# por uma thread separada. LOG_NIVEL, LOG_MAX_MB e LOG_BACKUPS no .env
+configurar_logging(
+    'homemanager.log',
+    nivel=os.getenv('LOG_NIVEL', 'INFO').upper(),
+    max_bytes=int(float(os.getenv('LOG_MAX_MB', '10')) * 1024 * 1024),
+    backups=int(os.getenv('LOG_BACKUPS', '5'))
 )
 
 app = Flask(__name__)
 CORS(app)
 
+# jsonify com orjson (se instalado); date/datetime saem em ISO 8601 sem conversão manual
+app.json = ProvedorJsonRapido(app)
+
+# gzip/brotli nas respostas acima de COMPRESSAO_MIN_BYTES; static/ usa as variantes .gz/.br
+compressao = Compressao(app, tamanho_minimo=int(os.getenv('COMPRESSAO_MIN_BYTES', '1024')))
+
+# url_for('static', ...) aponta para cópias com hash do conteúdo, com cache imutável de 1 ano
+estaticos = EstaticosVersionados(app)
+
+# Um script por página (static/dist): locale-config.js + common.js + script da página, minificados
+pacotes_js = PacotesJs(app)
+
+# Latência, tempo de banco e SQL por endpoint: /metrics e cabeçalho Server-Timing
+metricas = MetricasRequisicao(app)
+
+# Consultas acima de CONSULTA_LENTA_MS vão para o log; CONSULTA_LENTA_EXPLAIN=1 também
+# captura o plano (EXPLAIN ANALYZE, BUFFERS) numa thread separada
+monitor_consultas = MonitorConsultasLentas(
+    limite_ms=float(os.getenv('CONSULTA_LENTA_MS', '500')),
+    explain=os.getenv('CONSULTA_LENTA_EXPLAIN', '0') == '1'
+)
+metricas.observar_sql(monitor_consultas.observar)
+
+# Relatórios leem da tabela de resumo relatorio_vendas; RELATORIOS_ROLLUP=0 no .env
+# (ou ?fonte=ao-vivo na requisição) volta à agregação ao vivo, útil para conferência
+app.config['RELATORIOS_ROLLUP'] = os.getenv('RELATORIOS_ROLLUP', '1') != '0'
+
+# Cache em disco das fichas PDF (PDF_CACHE_DIR / PDF_CACHE_MAX_MB no .env)
+app.config['PDF_CACHE_DIR'] = os.getenv('PDF_CACHE_DIR') or os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), 'cache', 'pdf')
+app.config['PDF_CACHE_MAX_MB'] = float(os.getenv('PDF_CACHE_MAX_MB', '200'))
+
+# Cache em memória dos dados de referência (estados, vendedores, cabines, filtros):
+# validade em segundos (CACHE_REFERENCIA_TTL) e número máximo de entradas
+app.config['CACHE_REFERENCIA_TTL'] = float(os.getenv('CACHE_REFERENCIA_TTL', '300'))
+app.config['CACHE_REFERENCIA_MAX'] = int(os.getenv('CACHE_REFERENCIA_MAX', '64'))
+
+# Log por requisição: só uma fração das requisições normais (LOG_AMOSTRA_REQUISICOES,
+# de 0 a 1); erros (status >= 400) e requisições lentas são sempre registrados
+app.config['LOG_AMOSTRA_REQUISICOES'] = float(os.getenv('LOG_AMOSTRA_REQUISICOES', '0.1'))
+app.config['LOG_REQUISICAO_LENTA_MS'] = float(os.getenv('LOG_REQUISICAO_LENTA_MS', '1000'))
+
 # Variáveis globais para controle do servidor
 server_running = True
 last_activity = time.time()
@@ -38,7 +98,32 @@ def track_activity():
     """Registra atividade do usuário em cada requisição"""
     global last_activity
     last_activity = time.time()
-    logging.info(f"Atividade registrada: {request.endpoint} - {request.remote_addr}")
+    g.inicio_requisicao = time.perf_counter()
+
+@app.after_request
+def registrar_requisicao(response):
+    """Registra método, rota, status e latência da requisição (com amostragem)"""
+    inicio = g.pop('inicio_requisicao', None)
+    if inicio is None:
+        return response
+    latencia_ms = (time.perf_counter() - inicio) * 1000
+    
+    sempre = response.status_code >= 400 or latencia_ms >= app.config['LOG_REQUISICAO_LENTA_MS']
+    if not sempre and random.random() >= app.config['LOG_AMOSTRA_REQUISICOES']:
+        return response
+    
+    nivel = logging.WARNING if response.status_code >= 500 else logging.INFO
+    logging.log(nivel, f"{request.method} {request.path} {response.status_code} {latencia_ms:.1f}ms", extra={
+        'evento': 'requisicao',
+        'metodo': request.method,
+        'rota': request.path,
+        'endpoint': request.endpoint,
+        'status': response.status_code,
+        'latencia_ms': round(latencia_ms, 1),
+        'ip': request.remote_addr,
+        'amostrado': not sempre
+    })
+    return response
 
 def monitor_activity():
     """Monitora atividade do servidor e para quando não há atividade"""
@@ -77,6 +162,7 @@ def shutdown_server():
     try:
         # Tentar parar o servidor de desenvolvimento do Flask
         import os
+        encerrar_logging()  # os._exit não roda o atexit
         os._exit(0)
     except:
         sys.exit(0)
@@ -93,16 +179,48 @@ def signal_handler(signum, frame):
 # Registrar handler para Ctrl+C
 signal.signal(signal.SIGINT, signal_handler)
 
+# Fechar conexões do pool ao encerrar o processo
+atexit.register(close_pg_pool)
+
 def get_db_connection():
     try:
-        conn = create_pg_connection()
+        conn = get_pooled_connection()
         if conn is None:
             logging.error("Falha ao criar conexão com o banco de dados")
-        return conn
+        return metricas.instrumentar(conn)
     except Exception as e:
         logging.error(f"Erro ao conectar ao banco de dados: {e}")
         return None
 
+def aplicar_migracoes():
+    """Aplica as migrações de esquema pendentes (pasta migrations/) ao iniciar"""
+    conn = get_db_connection()
+    if not conn:
+        return
+    try:
+        apply_migrations(conn)
+    except Exception as e:
+        logging.error(f"Erro ao aplicar migrações: {e}")
+    finally:
+        end_pg_connection(conn)
+
+def construir_estaticos():
+    """Gera os arquivos derivados de static/ (atualização do sistema e python app.py --build-static).
+    
+    Ao importar o app só o manifesto já gerado é lido (EstaticosVersionados.init_app);
+    na instalação e nas atualizações o build é feito por setup.py e update_manager.py.
+    """
+    # Pacotes JS, depois cópias com hash e manifesto, e por fim as variantes comprimidas
+    pacotes_js.atualizar()
+    estaticos.atualizar()
+    # Gera só as variantes .gz/.br que faltam ou ficaram desatualizadas
+    precomprimir_estaticos(app.static_folder)
+
+# Os processos do pool de PDFs reimportam este arquivo como __mp_main__ quando o
+# multiprocessing usa "spawn" (Windows) e o servidor foi iniciado com "python app.py"
+if __name__ != '__mp_main__':
+    aplicar_migracoes()
+
 def parse_date_safe(date_string):
     """
     Função para converter string de data de forma segura.
@@ -131,6 +249,19 @@ def parse_date_safe(date_string):
     except (ValueError, IndexError):
         raise ValueError(f"Formato de data inválido: {date_string}")
 
+def parse_month_range(filtro_mes):
+    """
+    Converte um filtro de mês MM/YYYY no intervalo semiaberto [início, início do mês seguinte).
+    Retorna None se o formato for inválido.
+    """
+    try:
+        mes, ano = (int(parte) for parte in filtro_mes.split('/'))
+        inicio = date(ano, mes, 1)
+    except (ValueError, TypeError):
+        return None
+    fim = date(ano + 1, 1, 1) if mes == 12 else date(ano, mes + 1, 1)
+    return inicio, fim
+
 def validate_date_range(data_inicio, data_fim):
     """
     Valida se a data de fim é posterior à data de início
@@ -143,6 +274,83 @@ def validate_date_range(data_inicio, data_fim):
             return False
     return True
 
+# Paginação por chave (keyset) das listagens: ?limit=N&after_id=ID
+MAX_PAGE_SIZE = 500
+
+def get_pagination_args():
+    """Lê limit/after_id da query string. Sem limit, a listagem vem completa."""
+    limit = request.args.get('limit', type=int)
+    after_id = request.args.get('after_id', type=int)
+    if limit is not None:
+        limit = max(1, min(limit, MAX_PAGE_SIZE))
+    return limit, after_id
+
+def get_date_arg(name):
+    """Lê um parâmetro de data da query string (levanta ValueError se inválido)."""
+    value = request.args.get(name)
+    return parse_date_safe(value) if value else None
+
+def paginated_response(items, total, limit):
+    """Monta a resposta JSON de uma listagem com os cabeçalhos de paginação"""
+    response = jsonify(items)
+    response.headers['X-Total-Count'] = str(total)
+    if limit and len(items) == limit:
+        response.headers['X-Next-After-Id'] = str(items[-1]['id'])
+    return response
+
+# GET condicional das listagens: o ETag combina a URL com as versões das entidades
+# lidas (tabela versao_entidade, migração 004). Incrementar LISTAGENS_VERSAO quando o
+# formato das respostas mudar, para os navegadores não reaproveitarem o antigo.
+LISTAGENS_VERSAO = 1
+
+def versoes_entidades(entidades):
+    """Versões atuais das entidades, ou None se não for possível ler (sem ETag)"""
+    conn = get_db_connection()
+    if not conn:
+        return None
+    
+    cursor = conn.cursor()
+    try:
+        cursor.execute("SELECT entidade, versao FROM versao_entidade WHERE entidade = ANY(%s) ORDER BY entidade",
+                       (list(entidades),))
+        return cursor.fetchall()
+    except Exception as e:
+        logging.warning(f"Não foi possível ler as versões das entidades: {e}")
+        return None
+    finally:
+        cursor.close()
+        end_pg_connection(conn)
+
+def listagem_condicional(*entidades, por_dia=False):
+    """
+    Decorador de listagem: calcula o ETag antes da consulta e responde 304 se o
+    If-None-Match corresponder. por_dia=True para respostas que dependem de CURRENT_DATE.
+    """
+    def decorador(funcao):
+        @wraps(funcao)
+        def rota(*args, **kwargs):
+            versoes = versoes_entidades(entidades)
+            if versoes is None:
+                return funcao(*args, **kwargs)
+            
+            partes = [LISTAGENS_VERSAO, request.full_path, versoes]
+            if por_dia:
+                partes.append(date.today().isoformat())
+            etag = hashlib.sha256(json.dumps(partes, default=str).encode('utf-8')).hexdigest()[:32]
+            
+            # Comparação fraca: a compressão transforma o ETag em W/"..."
+            if request.if_none_match.contains_weak(etag):
+                response = app.response_class(status=304)
+            else:
+                response = app.make_response(funcao(*args, **kwargs))
+                if response.status_code != 200:
+                    return response
+            response.set_etag(etag)
+            response.headers['Cache-Control'] = 'private, no-cache'
+            return response
+        return rota
+    return decorador
+
 # Rota principal
 @app.route('/')
 def index():
@@ -156,6 +364,12 @@ def heartbeat():
     last_activity = time.time()
     return jsonify({'status': 'alive', 'timestamp': last_activity})
 
+# Rota para inspecionar o pool de conexões com o banco
+@app.route('/api/sistema/pool')
+def pool_stats():
+    """Retorna estatísticas do pool de conexões PostgreSQL"""
+    return jsonify(get_pg_pool().stats())
+
 # Rota para parar o servidor via API
 @app.route('/api/shutdown', methods=['POST'])
 def api_shutdown():
@@ -174,6 +388,7 @@ def clientes():
     return render_template('clientes.html')
 
 @app.route('/api/clientes', methods=['GET'])
+@listagem_condicional('cliente')
 def get_clientes():
     conn = get_db_connection()
     if not conn:
@@ -181,33 +396,64 @@ def get_clientes():
     
     cursor = conn.cursor()
     try:
-        cursor.execute("""
+        limit, after_id = get_pagination_args()
+        filtro_texto = request.args.get('q', '').strip()
+        filtro_estado = request.args.get('estado')
+        filtro_comercial = request.args.get('comercial')
+        
+        # Construir filtros (aplicados à tabela cliente, antes do JOIN com endereços)
+        where_conditions = []
+        params = []
+        
+        if filtro_texto:
+            where_conditions.append("(c.nome ILIKE %s OR c.email ILIKE %s OR c.documento LIKE %s OR CAST(c.id AS TEXT) = %s)")
+            params.extend([f'%{filtro_texto}%', f'%{filtro_texto}%', f'%{filtro_texto}%', filtro_texto])
+        
+        if filtro_estado:
+            where_conditions.append("EXISTS (SELECT 1 FROM endereco en WHERE en.id_cliente = c.id AND en.estado = %s)")
+            params.append(filtro_estado)
+        
+        if filtro_comercial in ('true', 'false'):
+            where_conditions.append("COALESCE(c.comercial, false) = %s")
+            params.append(filtro_comercial == 'true')
+        
+        where_clause = ""
+        if where_conditions:
+            where_clause = "WHERE " + " AND ".join(where_conditions)
+        
+        total = None
+        if limit:
+            cursor.execute(f"SELECT COUNT(*) FROM cliente c {where_clause}", params)
+            total = cursor.fetchone()[0]
+        
+        page_conditions = list(where_conditions)
+        page_params = list(params)
+        if after_id is not None:
+            page_conditions.append("c.id > %s")
+            page_params.append(after_id)
+        page_where = ("WHERE " + " AND ".join(page_conditions)) if page_conditions else ""
+        limit_clause = ""
+        if limit:
+            limit_clause = "LIMIT %s"
+            page_params.append(limit)
+        
+        cursor.execute(f"""
             SELECT c.id, c.nome, c.comercial, c.documento, c.email,
                    e.rua, e.numero, e.cidade, e.estado, e.complemento, e.cep, e.id as endereco_id
-            FROM cliente c
+            FROM (
+                SELECT c.* FROM cliente c
+                {page_where}
+                ORDER BY c.id
+                {limit_clause}
+            ) c
             LEFT JOIN endereco e ON c.id = e.id_cliente
             ORDER BY c.id
-        """)
-        clientes = []
+        """, page_params)
+        # Agrupar endereços por cliente em um dicionário (ordem de inserção preserva ORDER BY c.id)
+        clientes = {}
         for row in cursor.fetchall():
-            cliente_id = row[0]
-            # Verifica se o cliente já está na lista
-            cliente_existente = next((c for c in clientes if c['id'] == cliente_id), None)
-            
-            if cliente_existente:
-                # Adiciona o endereço ao cliente existente
-                if row[5]:  # Se há rua (endereco existe)
-                    cliente_existente['enderecos'].append({
-                        'id': row[11],
-                        'rua': row[5],
-                        'numero': row[6],
-                        'cidade': row[7],
-                        'estado': row[8],
-                        'complemento': row[9],
-                        'cep': row[10]
-                    })
-            else:
-                # Cria novo cliente
+            cliente = clientes.get(row[0])
+            if cliente is None:
                 cliente = {
                     'id': row[0],
                     'nome': row[1],
@@ -218,19 +464,21 @@ def get_clientes():
                     'cnpj': row[3] if row[2] else '',    # Para compatibilidade: documento como cnpj se comercial
                     'enderecos': []
                 }
-                if row[5]:  # Se há rua (endereco existe)
-                    cliente['enderecos'].append({
-                        'id': row[11],
-                        'rua': row[5],
-                        'numero': row[6],
-                        'cidade': row[7],
-                        'estado': row[8],
-                        'complemento': row[9],
-                        'cep': row[10]
-                    })
-                clientes.append(cliente)
-        
-        return jsonify(clientes)
+                clientes[row[0]] = cliente
+            
+            if row[5]:  # Se há rua (endereco existe)
+                cliente['enderecos'].append({
+                    'id': row[11],
+                    'rua': row[5],
+                    'numero': row[6],
+                    'cidade': row[7],
+                    'estado': row[8],
+                    'complemento': row[9],
+                    'cep': row[10]
+                })
+        
+        clientes = list(clientes.values())
+        return paginated_response(clientes, total if total is not None else len(clientes), limit)
     except Exception as e:
         return jsonify({'error': str(e)}), 500
     finally:
@@ -298,6 +546,7 @@ def add_cliente():
                       endereco.get('cidade'), endereco.get('estado'), 
                       endereco.get('complemento'), endereco.get('cep')))
         
+        notificar_alteracao(cursor, 'cliente', 'criado', cliente_id)
         conn.commit()
         return jsonify({'id': cliente_id, 'message': 'Cliente criado com sucesso'})
     except Exception as e:
@@ -353,6 +602,8 @@ def update_cliente(cliente_id):
             WHERE id = %s
         """, (data['nome'].strip(), (data.get('email') or '').strip() or None, comercial, documento, cliente_id))
         
+        invalidar_pdfs(cursor, clientes=[cliente_id])
+        notificar_alteracao(cursor, 'cliente', 'atualizado', cliente_id)
         conn.commit()
         return jsonify({'message': 'Cliente atualizado com sucesso'})
     except Exception as e:
@@ -370,7 +621,10 @@ def delete_cliente(cliente_id):
     
     cursor = conn.cursor()
     try:
+        invalidar_pdfs(cursor, clientes=[cliente_id])
         cursor.execute("DELETE FROM cliente WHERE id = %s", (cliente_id,))
+        atualizar_rollup_vendas(cursor, clientes=[cliente_id])
+        notificar_alteracao(cursor, 'cliente', 'removido', cliente_id)
         conn.commit()
         return jsonify({'message': 'Cliente excluído com sucesso'})
     except Exception as e:
@@ -406,6 +660,9 @@ def add_endereco():
               data.get('complemento'), data.get('cep')))
         
         endereco_id = cursor.fetchone()[0]
+        atualizar_rollup_vendas(cursor, clientes=[data['id_cliente']])
+        invalidar_pdfs(cursor, clientes=[data['id_cliente']])
+        notificar_alteracao(cursor, 'cliente', 'atualizado', data['id_cliente'])
         conn.commit()
         return jsonify({'id': endereco_id, 'message': 'Endereço criado com sucesso'})
     except Exception as e:
@@ -428,9 +685,15 @@ def update_endereco(endereco_id):
             UPDATE endereco SET rua = %s, numero = %s, cidade = %s, 
                    estado = %s, complemento = %s, cep = %s
             WHERE id = %s
+            RETURNING id_cliente
         """, (data['rua'], data['numero'], data['cidade'], 
               data['estado'], data.get('complemento'), data['cep'], endereco_id))
         
+        endereco = cursor.fetchone()
+        if endereco:
+            atualizar_rollup_vendas(cursor, clientes=[endereco[0]])
+            invalidar_pdfs(cursor, clientes=[endereco[0]])
+            notificar_alteracao(cursor, 'cliente', 'atualizado', endereco[0])
         conn.commit()
         return jsonify({'message': 'Endereço atualizado com sucesso'})
     except Exception as e:
@@ -448,7 +711,12 @@ def delete_endereco(endereco_id):
     
     cursor = conn.cursor()
     try:
-        cursor.execute("DELETE FROM endereco WHERE id = %s", (endereco_id,))
+        cursor.execute("DELETE FROM endereco WHERE id = %s RETURNING id_cliente", (endereco_id,))
+        endereco = cursor.fetchone()
+        if endereco:
+            atualizar_rollup_vendas(cursor, clientes=[endereco[0]])
+            invalidar_pdfs(cursor, clientes=[endereco[0]])
+            notificar_alteracao(cursor, 'cliente', 'atualizado', endereco[0])
         conn.commit()
         return jsonify({'message': 'Endereço excluído com sucesso'})
     except Exception as e:
@@ -458,8 +726,125 @@ def delete_endereco(endereco_id):
         cursor.close()
         end_pg_connection(conn)
 
+class CacheReferencia:
+    """Cache em memória das respostas de dados de referência, com validade e limite de entradas.
+    
+    Guarda o JSON já serializado e o ETag de cada rota; ao passar de max_entradas,
+    descarta a menos usada. As escritas (notificar_alteracao) marcam as entidades
+    alteradas e, depois do commit, as entradas que dependem delas são invalidadas.
+    O cache é por processo: em outros workers a entrada expira pelo TTL.
+    
+    Cada chave tem uma geração, incrementada por invalidar/limpar. Uma requisição
+    que não achou a entrada anota a geração antes de consultar o banco e só guarda
+    o resultado se ela não mudou: uma leitura feita antes de um commit que termina
+    depois da invalidação não volta a pôr o dado antigo no cache.
+    """
+    
+    def __init__(self, ttl, max_entradas):
+        self.ttl = ttl
+        self.max_entradas = max_entradas
+        self._entradas = OrderedDict()   # chave -> (expira_em, corpo, etag, mimetype)
+        self._dependencias = {}          # entidade -> chaves que dependem dela
+        self._geracoes = {}              # chave -> invalidações sofridas
+        self._limpezas = 0
+        self._lock = threading.Lock()
+        self._stats = {'hits': 0, 'misses': 0, 'invalidacoes': 0, 'descartes': 0}
+    
+    def em_cache(self, chave, depende_de=(), ttl=None, cache_control='private, no-cache'):
+        """Decorador de rota: serve do cache, com ETag (304) e o Cache-Control informado"""
+        for entidade in depende_de:
+            self._dependencias.setdefault(entidade, set()).add(chave)
+        
+        def decorador(funcao):
+            @wraps(funcao)
+            def rota(*args, **kwargs):
+                entrada, geracao = self._obter(chave)
+                if entrada is None:
+                    response = app.make_response(funcao(*args, **kwargs))
+                    if response.status_code != 200:
+                        return response  # erros não entram no cache
+                    entrada = self._guardar(chave, geracao, response.get_data(), response.mimetype, ttl)
+                _, corpo, etag, mimetype = entrada
+                response = app.response_class(corpo, mimetype=mimetype)
+                response.set_etag(etag)
+                response.headers['Cache-Control'] = cache_control
+                return response.make_conditional(request)
+            return rota
+        return decorador
+    
+    def _geracao(self, chave):
+        return self._limpezas, self._geracoes.get(chave, 0)
+    
+    def _obter(self, chave):
+        """(entrada, None) se estiver no cache; (None, geração atual da chave) se não"""
+        with self._lock:
+            entrada = self._entradas.get(chave)
+            if entrada is None or entrada[0] < time.monotonic():
+                self._stats['misses'] += 1
+                return None, self._geracao(chave)
+            self._entradas.move_to_end(chave)
+            self._stats['hits'] += 1
+            return entrada, None
+    
+    def _guardar(self, chave, geracao, corpo, mimetype, ttl):
+        etag = hashlib.sha256(corpo).hexdigest()[:32]
+        entrada = (time.monotonic() + (self.ttl if ttl is None else ttl), corpo, etag, mimetype)
+        with self._lock:
+            if self._geracao(chave) != geracao:
+                return entrada  # invalidada durante a consulta: responde sem guardar
+            self._entradas[chave] = entrada
+            self._entradas.move_to_end(chave)
+            while len(self._entradas) > self.max_entradas:
+                self._entradas.popitem(last=False)
+                self._stats['descartes'] += 1
+        return entrada
+    
+    def invalidar(self, *entidades):
+        """Remove as entradas que dependem das entidades alteradas"""
+        chaves = set()
+        for entidade in entidades:
+            chaves |= self._dependencias.get(entidade, set())
+        with self._lock:
+            for chave in chaves:
+                self._geracoes[chave] = self._geracoes.get(chave, 0) + 1
+                if self._entradas.pop(chave, None) is not None:
+                    self._stats['invalidacoes'] += 1
+    
+    def limpar(self):
+        with self._lock:
+            self._limpezas += 1
+            self._stats['invalidacoes'] += len(self._entradas)
+            self._entradas.clear()
+    
+    def stats(self):
+        with self._lock:
+            return {**self._stats, 'entradas': len(self._entradas), 'max_entradas': self.max_entradas,
+                    'ttl': self.ttl}
+
+cache_referencia = CacheReferencia(app.config['CACHE_REFERENCIA_TTL'], app.config['CACHE_REFERENCIA_MAX'])
+
+@app.after_request
+def invalidar_cache_referencia(response):
+    """Invalida o cache de referência depois das escritas (o commit já foi feito na rota)"""
+    entidades = g.pop('entidades_alteradas', None)
+    if entidades:
+        cache_referencia.invalidar(*entidades)
+    return response
+
+@app.route('/api/sistema/cache-referencia')
+def cache_referencia_stats():
+    """Retorna estatísticas do cache de dados de referência"""
+    return jsonify(cache_referencia.stats())
+
+@app.route('/api/sistema/cache-referencia', methods=['DELETE'])
+def limpar_cache_referencia():
+    """Esvazia o cache de dados de referência (ex.: após alterar o banco fora do sistema)"""
+    cache_referencia.limpar()
+    return jsonify({'message': 'Cache de dados de referência esvaziado'})
+
 # Rotas para estados
 @app.route('/api/estados', methods=['GET'])
+@cache_referencia.em_cache('estados', ttl=86400, cache_control='public, max-age=86400')
 def get_estados():
     conn = get_db_connection()
     if not conn:
@@ -478,6 +863,7 @@ def get_estados():
 
 # API para vendedores
 @app.route('/api/vendedores', methods=['GET'])
+@cache_referencia.em_cache('vendedores', ttl=86400, cache_control='public, max-age=3600')
 def get_vendedores():
     """Retorna lista de vendedores disponíveis"""
     vendedores = ['Deuclides', 'Leandro', 'Jean']
@@ -490,6 +876,7 @@ def contratos():
 
 # API para cabines (somente leitura - usado pelos elevadores)
 @app.route('/api/cabines', methods=['GET'])
+@cache_referencia.em_cache('cabines', depende_de=('elevador',))
 def get_cabines():
     conn = get_db_connection()
     if not conn:
@@ -507,6 +894,7 @@ def get_cabines():
         end_pg_connection(conn)
 
 @app.route('/api/contratos', methods=['GET'])
+@listagem_condicional('contrato', 'cliente')
 def get_contratos():
     conn = get_db_connection()
     if not conn:
@@ -514,12 +902,79 @@ def get_contratos():
     
     cursor = conn.cursor()
     try:
-        cursor.execute("""
-            SELECT c.id, c.data_venda, c.data_entrega, c.id_cliente, cl.nome, c.vendedor
+        limit, after_id = get_pagination_args()
+        filtro_texto = request.args.get('q', '').strip()
+        filtro_cliente = request.args.get('cliente', type=int)
+        filtro_estado = request.args.get('estado')
+        filtro_vendedor = request.args.get('vendedor')
+        try:
+            venda_de = get_date_arg('venda_de')
+            venda_ate = get_date_arg('venda_ate')
+            entrega_de = get_date_arg('entrega_de')
+            entrega_ate = get_date_arg('entrega_ate')
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+        
+        # Construir query com filtros
+        where_conditions = []
+        params = []
+        
+        if filtro_texto:
+            where_conditions.append("(cl.nome ILIKE %s OR c.vendedor ILIKE %s OR CAST(c.id AS TEXT) = %s)")
+            params.extend([f'%{filtro_texto}%', f'%{filtro_texto}%', filtro_texto])
+        
+        if filtro_cliente:
+            where_conditions.append("c.id_cliente = %s")
+            params.append(filtro_cliente)
+        
+        if filtro_estado:
+            where_conditions.append("EXISTS (SELECT 1 FROM endereco en WHERE en.id_cliente = c.id_cliente AND en.estado = %s)")
+            params.append(filtro_estado)
+        
+        if filtro_vendedor:
+            where_conditions.append("c.vendedor = %s")
+            params.append(filtro_vendedor)
+        
+        if venda_de:
+            where_conditions.append("c.data_venda >= %s")
+            params.append(venda_de)
+        if venda_ate:
+            where_conditions.append("c.data_venda <= %s")
+            params.append(venda_ate)
+        if entrega_de:
+            where_conditions.append("c.data_entrega >= %s")
+            params.append(entrega_de)
+        if entrega_ate:
+            where_conditions.append("c.data_entrega <= %s")
+            params.append(entrega_ate)
+        
+        from_clause = """
             FROM contrato c
             LEFT JOIN cliente cl ON c.id_cliente = cl.id
+        """
+        
+        total = None
+        if limit:
+            count_where = ("WHERE " + " AND ".join(where_conditions)) if where_conditions else ""
+            cursor.execute(f"SELECT COUNT(*) {from_clause} {count_where}", params)
+            total = cursor.fetchone()[0]
+        
+        if after_id is not None:
+            where_conditions.append("c.id > %s")
+            params.append(after_id)
+        where_clause = ("WHERE " + " AND ".join(where_conditions)) if where_conditions else ""
+        limit_clause = ""
+        if limit:
+            limit_clause = "LIMIT %s"
+            params.append(limit)
+        
+        cursor.execute(f"""
+            SELECT c.id, c.data_venda, c.data_entrega, c.id_cliente, cl.nome, c.vendedor
+            {from_clause}
+            {where_clause}
             ORDER BY c.id
-        """)
+            {limit_clause}
+        """, params)
         contratos = []
         for row in cursor.fetchall():
             contratos.append({
@@ -530,7 +985,7 @@ def get_contratos():
                 'cliente_nome': row[4],
                 'vendedor': row[5]
             })
-        return jsonify(contratos)
+        return paginated_response(contratos, total if total is not None else len(contratos), limit)
     except Exception as e:
         return jsonify({'error': str(e)}), 500
     finally:
@@ -578,6 +1033,8 @@ def add_contrato():
         """, (data_venda, data_entrega, data['id_cliente'], data.get('vendedor')))
         
         contrato_id = cursor.fetchone()[0]
+        atualizar_rollup_vendas(cursor, contratos=[contrato_id])
+        notificar_alteracao(cursor, 'contrato', 'criado', contrato_id)
         conn.commit()
         return jsonify({'id': contrato_id, 'message': 'Contrato criado com sucesso'})
     except Exception as e:
@@ -588,6 +1045,7 @@ def add_contrato():
         end_pg_connection(conn)
 
 @app.route('/api/contratos/<int:contrato_id>', methods=['GET'])
+@listagem_condicional('contrato', 'cliente')
 def get_contrato(contrato_id):
     conn = get_db_connection()
     if not conn:
@@ -667,6 +1125,9 @@ def update_contrato(contrato_id):
             WHERE id = %s
         """, (data_venda, data_entrega, data['id_cliente'], data.get('vendedor'), contrato_id))
         
+        atualizar_rollup_vendas(cursor, contratos=[contrato_id])
+        invalidar_pdfs(cursor, contratos=[contrato_id])
+        notificar_alteracao(cursor, 'contrato', 'atualizado', contrato_id)
         conn.commit()
         return jsonify({'message': 'Contrato atualizado com sucesso'})
     except Exception as e:
@@ -684,7 +1145,10 @@ def delete_contrato(contrato_id):
     
     cursor = conn.cursor()
     try:
+        invalidar_pdfs(cursor, contratos=[contrato_id])
         cursor.execute("DELETE FROM contrato WHERE id = %s", (contrato_id,))
+        atualizar_rollup_vendas(cursor, contratos=[contrato_id])
+        notificar_alteracao(cursor, 'contrato', 'removido', contrato_id)
         conn.commit()
         return jsonify({'message': 'Contrato excluído com sucesso'})
     except Exception as e:
@@ -700,70 +1164,113 @@ def elevadores():
     return render_template('elevadores.html')
 
 @app.route('/api/elevadores', methods=['GET'])
+@listagem_condicional('elevador', 'contrato', 'cliente')
 def get_elevadores():
     conn = get_db_connection()
     if not conn:
         return jsonify({'error': 'Erro na conexão com o banco'}), 500
     
-    # Verificar se há filtro por contrato
-    contrato_id = request.args.get('contrato')
-    
     cursor = conn.cursor()
     try:
-        if contrato_id:
-            # Buscar elevadores de um contrato específico
-            cursor.execute("""
-                SELECT e.id, e.id_contrato, e.comando, e.observacao, 
-                       e.porta_inferior, e.porta_superior, e.cor, e.status
-                FROM elevador e
-                WHERE e.id_contrato = %s
-                ORDER BY e.id
-            """, (contrato_id,))
-        else:
-            # Buscar todos os elevadores
-            cursor.execute("""
-                SELECT e.id, e.id_contrato, e.comando, e.observacao, 
-                       e.porta_inferior, e.porta_superior, e.cor, e.status
+        limit, after_id = get_pagination_args()
+        filtro_id = request.args.get('id', type=int)
+        filtro_contrato = request.args.get('contrato', type=int)
+        filtro_cliente = request.args.get('cliente', type=int)
+        filtro_status = request.args.get('status')
+        filtro_estado = request.args.get('estado')
+        filtro_texto = request.args.get('q', '').strip()
+        try:
+            entrega_de = get_date_arg('entrega_de')
+            entrega_ate = get_date_arg('entrega_ate')
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+        
+        # Construir query com filtros
+        where_conditions = []
+        params = []
+        
+        if filtro_id:
+            where_conditions.append("e.id = %s")
+            params.append(filtro_id)
+        
+        if filtro_contrato:
+            where_conditions.append("e.id_contrato = %s")
+            params.append(filtro_contrato)
+        
+        if filtro_cliente:
+            where_conditions.append("c.id_cliente = %s")
+            params.append(filtro_cliente)
+        
+        if filtro_status:
+            where_conditions.append("e.status = %s")
+            params.append(filtro_status)
+        
+        if filtro_estado:
+            where_conditions.append("EXISTS (SELECT 1 FROM endereco en WHERE en.id_cliente = c.id_cliente AND en.estado = %s)")
+            params.append(filtro_estado)
+        
+        if entrega_de:
+            where_conditions.append("c.data_entrega >= %s")
+            params.append(entrega_de)
+        if entrega_ate:
+            where_conditions.append("c.data_entrega <= %s")
+            params.append(entrega_ate)
+        
+        if filtro_texto:
+            where_conditions.append("""(cl.nome ILIKE %s OR e.comando ILIKE %s OR e.cor ILIKE %s
+                                        OR e.status ILIKE %s OR CAST(e.id AS TEXT) = %s)""")
+            params.extend([f'%{filtro_texto}%'] * 4 + [filtro_texto])
+        
+        total = None
+        if limit:
+            count_where = ("WHERE " + " AND ".join(where_conditions)) if where_conditions else ""
+            cursor.execute(f"""
+                SELECT COUNT(*)
                 FROM elevador e
-                ORDER BY e.id
-            """)
+                LEFT JOIN contrato c ON c.id = e.id_contrato
+                LEFT JOIN cliente cl ON c.id_cliente = cl.id
+                {count_where}
+            """, params)
+            total = cursor.fetchone()[0]
+        
+        if after_id is not None:
+            where_conditions.append("e.id > %s")
+            params.append(after_id)
+        where_clause = ("WHERE " + " AND ".join(where_conditions)) if where_conditions else ""
+        limit_clause = ""
+        if limit:
+            limit_clause = "LIMIT %s"
+            params.append(limit)
+        
+        # Uma única consulta traz elevador, cabine, coluna, adicionais e contrato/cliente
+        # (cabine, coluna e adicionais têm id_elevador como chave primária: no máximo uma linha cada)
+        query = """
+            SELECT e.id, e.id_contrato, e.comando, e.observacao, 
+                   e.porta_inferior, e.porta_superior, e.cor, e.status,
+                   cab.id_elevador IS NOT NULL as tem_cabine,
+                   cab.altura, cab.largura, cab.profundidade, cab.piso, cab.montada,
+                   cab.lado_entrada, cab.lado_saida,
+                   col.id_elevador IS NOT NULL as tem_coluna,
+                   col.elevacao, col.montada,
+                   ad.id_elevador IS NOT NULL as tem_adicionais,
+                   ad.cancela, ad.porta, ad.portao, ad.barreira_eletronica,
+                   ad.lados_enclausuramento, ad.sensor_esmagamento,
+                   ad.rampa_acesso, ad.nobreak, ad.galvanizada,
+                   c.data_entrega, cl.nome
+            FROM elevador e
+            LEFT JOIN cabine cab ON cab.id_elevador = e.id
+            LEFT JOIN coluna col ON col.id_elevador = e.id
+            LEFT JOIN adicionais ad ON ad.id_elevador = e.id
+            LEFT JOIN contrato c ON c.id = e.id_contrato
+            LEFT JOIN cliente cl ON c.id_cliente = cl.id
+        """
+        cursor.execute(f"{query} {where_clause} ORDER BY e.id {limit_clause}", params)
         
         elevadores = []
         for row in cursor.fetchall():
-            elevador_id = row[0]
-            
-            # Buscar dados da cabine
-            cursor.execute("""
-                SELECT altura, largura, profundidade, piso, montada, 
-                       lado_entrada, lado_saida
-                FROM cabine WHERE id_elevador = %s
-            """, (elevador_id,))
-            cabine_data = cursor.fetchone()
-            
-            # Buscar dados da coluna
-            cursor.execute("""
-                SELECT elevacao, montada
-                FROM coluna WHERE id_elevador = %s
-            """, (elevador_id,))
-            coluna_data = cursor.fetchone()
-            
-            # Buscar adicionais
-            cursor.execute("""
-                SELECT cancela, porta, portao, barreira_eletronica,
-                       lados_enclausuramento, sensor_esmagamento,
-                       rampa_acesso, nobreak, galvanizada
-                FROM adicionais WHERE id_elevador = %s
-            """, (elevador_id,))
-            adicionais_data = cursor.fetchone()
-            
-            # Buscar dados do contrato para mostrar informações completas
-            cursor.execute("""
-                SELECT c.data_venda, c.data_entrega, cl.nome
-                FROM contrato c
-                LEFT JOIN cliente cl ON c.id_cliente = cl.id
-                WHERE c.id = %s
-            """, (row[1],))  # row[1] é id_contrato
-            contrato_data = cursor.fetchone()
+            cabine_data = row[9:16] if row[8] else None
+            coluna_data = row[17:19] if row[16] else None
+            adicionais_data = row[20:29] if row[19] else None
             
             elevador = {
                 'id': row[0],
@@ -775,47 +1282,63 @@ def get_elevadores():
                 'cor': row[6],
                 'status': row[7],
                 'cabine': {
-                    'altura': cabine_data[0] if cabine_data else None,
-                    'largura': cabine_data[1] if cabine_data else None,
-                    'profundidade': cabine_data[2] if cabine_data else None,
-                    'piso': cabine_data[3] if cabine_data else None,
-                    'montada': cabine_data[4] if cabine_data else False,
-                    'lado_entrada': cabine_data[5] if cabine_data else None,
-                    'lado_saida': cabine_data[6] if cabine_data else None,
+                    'altura': cabine_data[0],
+                    'largura': cabine_data[1],
+                    'profundidade': cabine_data[2],
+                    'piso': cabine_data[3],
+                    'montada': cabine_data[4],
+                    'lado_entrada': cabine_data[5],
+                    'lado_saida': cabine_data[6],
                     # Descrição calculada para compatibilidade
-                    'descricao': f"{cabine_data[0]}x{cabine_data[1]}x{cabine_data[2]}" if cabine_data and all([cabine_data[0], cabine_data[1], cabine_data[2]]) else "N/A"
+                    'descricao': f"{cabine_data[0]}x{cabine_data[1]}x{cabine_data[2]}" if all([cabine_data[0], cabine_data[1], cabine_data[2]]) else "N/A"
                 } if cabine_data else None,
                 'coluna': {
-                    'elevacao': coluna_data[0] if coluna_data else None,
-                    'montada': coluna_data[1] if coluna_data else False
+                    'elevacao': coluna_data[0],
+                    'montada': coluna_data[1]
                 } if coluna_data else None,
                 'adicionais': {
-                    'cancela': adicionais_data[0] if adicionais_data else 0,
-                    'porta': adicionais_data[1] if adicionais_data else 0,
-                    'portao': adicionais_data[2] if adicionais_data else 0,
-                    'barreira_eletronica': adicionais_data[3] if adicionais_data else 0,
-                    'lados_enclausuramento': adicionais_data[4] if adicionais_data else 0,
-                    'sensor_esmagamento': adicionais_data[5] if adicionais_data else 0,
-                    'rampa_acesso': adicionais_data[6] if adicionais_data else 0,
-                    'nobreak': adicionais_data[7] if adicionais_data else 0,
-                    'galvanizada': adicionais_data[8] if adicionais_data else False
+                    'cancela': adicionais_data[0],
+                    'porta': adicionais_data[1],
+                    'portao': adicionais_data[2],
+                    'barreira_eletronica': adicionais_data[3],
+                    'lados_enclausuramento': adicionais_data[4],
+                    'sensor_esmagamento': adicionais_data[5],
+                    'rampa_acesso': adicionais_data[6],
+                    'nobreak': adicionais_data[7],
+                    'galvanizada': adicionais_data[8]
                 } if adicionais_data else None,
                 # Campos adicionais para compatibilidade com o frontend
-                'cliente_nome': contrato_data[2] if contrato_data else None,
-                'data_entrega': contrato_data[1].isoformat() if contrato_data and contrato_data[1] else None,
+                'cliente_nome': row[30],
+                'data_entrega': row[29],
                 'cabine_descricao': f"{cabine_data[0]}x{cabine_data[1]}x{cabine_data[2]}" if cabine_data else "N/A",
                 'elevacao': coluna_data[0] if coluna_data else None
             }
             
             elevadores.append(elevador)
         
-        return jsonify(elevadores)
+        return paginated_response(elevadores, total if total is not None else len(elevadores), limit)
     except Exception as e:
         return jsonify({'error': str(e)}), 500
     finally:
         cursor.close()
         end_pg_connection(conn)
 
+def validar_elevador(data):
+    """Retorna a mensagem de erro dos dados obrigatórios de um elevador, ou None"""
+    if not data.get('id_contrato'):
+        return 'Contrato é obrigatório'
+    if not data.get('comando'):
+        return 'Comando é obrigatório'
+    cabine = data.get('cabine')
+    if not isinstance(cabine, dict) or not cabine.get('altura') or not cabine.get('largura') or not cabine.get('profundidade'):
+        return 'Dados da cabine (altura, largura, profundidade) são obrigatórios'
+    coluna = data.get('coluna')
+    if not isinstance(coluna, dict) or not coluna.get('elevacao'):
+        return 'Elevação da coluna é obrigatória'
+    if data.get('adicionais') and not isinstance(data['adicionais'], dict):
+        return 'Adicionais inválidos'
+    return None
+
 @app.route('/api/elevadores', methods=['POST'])
 def add_elevador():
     data = request.json
@@ -826,14 +1349,9 @@ def add_elevador():
     cursor = conn.cursor()
     try:
         # Validar dados obrigatórios
-        if not data.get('id_contrato'):
-            return jsonify({'error': 'Contrato é obrigatório'}), 400
-        if not data.get('comando'):
-            return jsonify({'error': 'Comando é obrigatório'}), 400
-        if not data.get('cabine') or not data['cabine'].get('altura') or not data['cabine'].get('largura') or not data['cabine'].get('profundidade'):
-            return jsonify({'error': 'Dados da cabine (altura, largura, profundidade) são obrigatórios'}), 400
-        if not data.get('coluna') or not data['coluna'].get('elevacao'):
-            return jsonify({'error': 'Elevação da coluna é obrigatória'}), 400
+        erro = validar_elevador(data)
+        if erro:
+            return jsonify({'error': erro}), 400
         
         # Validar se contrato existe
         cursor.execute("SELECT id FROM contrato WHERE id = %s", (data['id_contrato'],))
@@ -925,6 +1443,8 @@ def add_elevador():
             adicionais.get('galvanizada', False)
         ))
         
+        atualizar_rollup_vendas(cursor, contratos=[data['id_contrato']])
+        notificar_alteracao(cursor, 'elevador', 'criado', elevador_id, contrato_id=data['id_contrato'])
         conn.commit()
         return jsonify({'id': elevador_id, 'message': 'Elevador criado com sucesso'})
     except Exception as e:
@@ -934,6 +1454,138 @@ def add_elevador():
         cursor.close()
         end_pg_connection(conn)
 
+# Criação em lote: limite de elevadores por requisição e linhas por INSERT
+ELEVADORES_LOTE_MAX = int(os.getenv('ELEVADORES_LOTE_MAX', '10000'))
+ELEVADORES_LOTE_PAGINA = 1000
+
+@app.route('/api/elevadores/bulk', methods=['POST'])
+def add_elevadores_lote():
+    """
+    Cria vários elevadores numa única transação.
+    
+    Corpo: {"elevadores": [...]}, cada item no formato de POST /api/elevadores, com
+    "quantidade" opcional para repetir um item (contratos com vários elevadores iguais).
+    Os ids são reservados de uma vez na sequência e as quatro tabelas recebem INSERTs
+    por conjunto (execute_values); a resposta traz os ids na ordem da lista.
+    """
+    data = request.get_json(silent=True)
+    itens = data.get('elevadores') if isinstance(data, dict) else data
+    if not isinstance(itens, list) or not itens:
+        return jsonify({'error': 'Lista de elevadores é obrigatória'}), 400
+    
+    # Validar tudo antes de abrir a transação; os erros indicam a posição na lista
+    elevadores = []
+    erros = []
+    for indice, item in enumerate(itens):
+        if not isinstance(item, dict):
+            erros.append({'indice': indice, 'error': 'Elevador inválido'})
+            continue
+        erro = validar_elevador(item)
+        quantidade = item.get('quantidade', 1)
+        if not erro and (not isinstance(quantidade, int) or isinstance(quantidade, bool) or quantidade < 1):
+            erro = 'Quantidade inválida'
+        if not erro and not str(item['id_contrato']).isdigit():
+            erro = 'Contrato inválido'
+        if erro:
+            erros.append({'indice': indice, 'error': erro})
+            continue
+        # Limite conferido antes de expandir a quantidade, que vem do cliente
+        if quantidade > ELEVADORES_LOTE_MAX - len(elevadores):
+            return jsonify({'error': f'Máximo de {ELEVADORES_LOTE_MAX} elevadores por requisição', 'indice': indice}), 400
+        elevadores.extend([item] * quantidade)
+    if erros:
+        return jsonify({'error': 'Há elevadores com dados inválidos', 'detalhes': erros[:100]}), 400
+    
+    conn = get_db_connection()
+    if not conn:
+        return jsonify({'error': 'Erro na conexão com o banco'}), 500
+    
+    cursor = conn.cursor()
+    try:
+        # Validar se os contratos existem (uma consulta para todos)
+        contratos = sorted({int(e['id_contrato']) for e in elevadores})
+        cursor.execute("SELECT id FROM contrato WHERE id = ANY(%s)", (contratos,))
+        encontrados = {row[0] for row in cursor.fetchall()}
+        faltando = [c for c in contratos if c not in encontrados]
+        if faltando:
+            return jsonify({'error': f'Contrato não encontrado: {", ".join(map(str, faltando))}'}), 400
+        
+        # Reservar os ids: cabine/coluna/adicionais já sabem o elevador de cada linha
+        cursor.execute("SELECT nextval(pg_get_serial_sequence('elevador', 'id')) FROM generate_series(1, %s)",
+                       (len(elevadores),))
+        ids = [row[0] for row in cursor.fetchall()]
+        
+        execute_values(cursor, """
+            INSERT INTO elevador (id, id_contrato, comando, observacao, porta_inferior, porta_superior, cor, status)
+            VALUES %s
+        """, [(
+            elevador_id,
+            int(e['id_contrato']),
+            e['comando'],
+            e.get('observacao'),
+            e.get('porta_inferior'),
+            e.get('porta_superior'),
+            e.get('cor'),
+            e.get('status', 'Não iniciado')
+        ) for elevador_id, e in zip(ids, elevadores)], page_size=ELEVADORES_LOTE_PAGINA)
+        
+        execute_values(cursor, """
+            INSERT INTO cabine (id_elevador, altura, largura, profundidade, piso, montada, lado_entrada, lado_saida)
+            VALUES %s
+        """, [(
+            elevador_id,
+            e['cabine']['altura'],
+            e['cabine']['largura'],
+            e['cabine']['profundidade'],
+            e['cabine'].get('piso'),
+            e['cabine'].get('montada', False),
+            e['cabine'].get('lado_entrada'),
+            e['cabine'].get('lado_saida')
+        ) for elevador_id, e in zip(ids, elevadores)], page_size=ELEVADORES_LOTE_PAGINA)
+        
+        execute_values(cursor, """
+            INSERT INTO coluna (id_elevador, elevacao, montada)
+            VALUES %s
+        """, [(
+            elevador_id,
+            e['coluna']['elevacao'],
+            e['coluna'].get('montada', False)
+        ) for elevador_id, e in zip(ids, elevadores)], page_size=ELEVADORES_LOTE_PAGINA)
+        
+        linhas_adicionais = []
+        for elevador_id, e in zip(ids, elevadores):
+            adicionais = e.get('adicionais') or {}
+            linhas_adicionais.append((
+                elevador_id,
+                adicionais.get('cancela', 0),
+                adicionais.get('porta', 0),
+                adicionais.get('portao', 0),
+                adicionais.get('barreira_eletronica', 0),
+                adicionais.get('lados_enclausuramento', 0),
+                adicionais.get('sensor_esmagamento', 0),
+                adicionais.get('rampa_acesso', 0),
+                adicionais.get('nobreak', 0),
+                adicionais.get('galvanizada', False)
+            ))
+        execute_values(cursor, """
+            INSERT INTO adicionais (id_elevador, cancela, porta, portao, barreira_eletronica,
+                                  lados_enclausuramento, sensor_esmagamento, rampa_acesso, nobreak, galvanizada)
+            VALUES %s
+        """, linhas_adicionais, page_size=ELEVADORES_LOTE_PAGINA)
+        
+        atualizar_rollup_vendas(cursor, contratos=contratos)
+        # Uma notificação para o lote (o payload do NOTIFY é limitado a 8000 bytes);
+        # as páginas recarregam a lista ao receber 'criado'
+        notificar_alteracao(cursor, 'elevador', 'criado', None, quantidade=len(ids), contratos=contratos[:100])
+        conn.commit()
+        return jsonify({'ids': ids, 'message': f'{len(ids)} elevadores criados com sucesso'})
+    except Exception as e:
+        conn.rollback()
+        return jsonify({'error': f'Erro ao criar elevadores: {str(e)}'}), 500
+    finally:
+        cursor.close()
+        end_pg_connection(conn)
+
 @app.route('/api/elevadores/<int:elevador_id>', methods=['PUT'])
 def update_elevador(elevador_id):
     data = request.json
@@ -943,6 +1595,10 @@ def update_elevador(elevador_id):
     
     cursor = conn.cursor()
     try:
+        # Contrato atual, para atualizar o resumo dos relatórios caso o elevador mude de contrato
+        cursor.execute("SELECT id_contrato FROM elevador WHERE id = %s", (elevador_id,))
+        anterior = cursor.fetchone()
+        
         # Atualizar dados principais do elevador
         cursor.execute("""
             UPDATE elevador 
@@ -1014,6 +1670,9 @@ def update_elevador(elevador_id):
                 elevador_id
             ))
         
+        atualizar_rollup_vendas(cursor, contratos=[anterior[0] if anterior else None, data.get('id_contrato')])
+        invalidar_pdfs(cursor, elevadores=[elevador_id])
+        notificar_alteracao(cursor, 'elevador', 'atualizado', elevador_id, contrato_id=data.get('id_contrato'))
         conn.commit()
         return jsonify({'message': 'Elevador atualizado com sucesso'})
     except Exception as e:
@@ -1031,7 +1690,12 @@ def delete_elevador(elevador_id):
     
     cursor = conn.cursor()
     try:
-        cursor.execute("DELETE FROM elevador WHERE id = %s", (elevador_id,))
+        cursor.execute("DELETE FROM elevador WHERE id = %s RETURNING id_contrato", (elevador_id,))
+        elevador = cursor.fetchone()
+        if elevador:
+            atualizar_rollup_vendas(cursor, contratos=[elevador[0]])
+            invalidar_pdfs(cursor, elevadores=[elevador_id])
+            notificar_alteracao(cursor, 'elevador', 'removido', elevador_id, contrato_id=elevador[0])
         conn.commit()
         return jsonify({'message': 'Elevador excluído com sucesso'})
     except Exception as e:
@@ -1041,6 +1705,212 @@ def delete_elevador(elevador_id):
         cursor.close()
         end_pg_connection(conn)
 
+# ===== Ficha do elevador em PDF =====
+# Dados da ficha; DISTINCT ON + ORDER BY escolhem um endereço por elevador, sempre o
+# mesmo a cada chamada (e portanto o mesmo hash no cache)
+PDF_ELEVADOR_SQL = """
+    SELECT DISTINCT ON (e.id)
+        e.id, e.comando, e.observacao, e.porta_inferior, e.porta_superior, e.cor,
+        c.id as contrato_id, c.data_venda, c.data_entrega, c.vendedor,
+        cl.nome as cliente_nome, cl.documento,
+        cab.altura as cabine_altura, cab.largura as cabine_largura, 
+        cab.profundidade as cabine_profundidade, cab.piso as cabine_piso,
+        cab.montada as cabine_montada, cab.lado_entrada, cab.lado_saida,
+        col.elevacao, col.montada as coluna_montada,
+        ad.cancela, ad.porta, ad.portao, ad.barreira_eletronica,
+        ad.lados_enclausuramento, ad.sensor_esmagamento, ad.rampa_acesso,
+        ad.nobreak, ad.galvanizada,
+        en.rua, en.numero, en.complemento, en.cidade, en.estado, en.cep,
+        est.nome as estado_nome
+    FROM elevador e
+    LEFT JOIN contrato c ON e.id_contrato = c.id
+    LEFT JOIN cliente cl ON c.id_cliente = cl.id
+    LEFT JOIN cabine cab ON e.id = cab.id_elevador
+    LEFT JOIN coluna col ON e.id = col.id_elevador
+    LEFT JOIN adicionais ad ON e.id = ad.id_elevador
+    LEFT JOIN endereco en ON cl.id = en.id_cliente
+    LEFT JOIN estado est ON en.estado = est.sigla
+    WHERE {filtro}
+    ORDER BY e.id, en.id
+"""
+
+# Limite de fichas por ZIP na exportação em lote
+PDF_LOTE_MAX = 500
+
+# Renderização em processos separados, para o ReportLab não disputar o GIL com a API JSON
+# (PDF_WORKERS, PDF_FILA_MAX e PDF_TIMEOUT no .env; 0 = padrão do serviço)
+app.config['PDF_WORKERS'] = int(os.getenv('PDF_WORKERS', '0')) or None      # padrão: número de CPUs
+app.config['PDF_FILA_MAX'] = int(os.getenv('PDF_FILA_MAX', '0')) or None    # padrão: 4 por processo
+app.config['PDF_TIMEOUT'] = float(os.getenv('PDF_TIMEOUT', '30'))
+app.config['PDF_RETRY_AFTER'] = int(os.getenv('PDF_RETRY_AFTER', '5'))      # segundos sugeridos no 503
+
+servico_pdf = ServicoRenderizacaoPdf(workers=app.config['PDF_WORKERS'],
+                                     max_fila=app.config['PDF_FILA_MAX'],
+                                     timeout=app.config['PDF_TIMEOUT'])
+atexit.register(servico_pdf.encerrar)
+
+def resposta_servico_pdf_ocupado(mensagem):
+    """503 com Retry-After: o cliente deve tentar de novo em alguns segundos"""
+    response = jsonify({'error': mensagem})
+    response.status_code = 503
+    response.headers['Retry-After'] = str(app.config['PDF_RETRY_AFTER'])
+    return response
+
+def caminho_logo_pdf():
+    return os.path.join(app.static_folder, 'images', 'home-escrito.png')
+
+class SaidaZip(io.RawIOBase):
+    """Destino sem seek para o ZipFile: guarda os bytes escritos até o gerador enviá-los"""
+    
+    def __init__(self):
+        super().__init__()
+        self._partes = []
+    
+    def writable(self):
+        return True
+    
+    def write(self, dados):
+        self._partes.append(bytes(dados))
+        return len(dados)
+    
+    def esvaziar(self):
+        dados = b''.join(self._partes)
+        self._partes.clear()
+        return dados
+
+class CachePdf:
+    """Cache em disco dos PDFs gerados, com limite de tamanho e descarte LRU.
+    
+    Os arquivos se chamam <id_elevador>-<hash>.pdf, onde o hash cobre os dados da ficha
+    e PDF_TEMPLATE_VERSAO: dados alterados geram outra chave, então um PDF desatualizado
+    nunca é servido e a invalidação explícita só libera espaço. O mtime do arquivo marca o
+    último uso; ao passar do limite, os menos usados são apagados até 90% do limite.
+    """
+    
+    def __init__(self, diretorio, tamanho_maximo):
+        self.diretorio = diretorio
+        self.tamanho_maximo = tamanho_maximo
+        self._tamanho_total = None
+        self._lock = threading.Lock()
+        self._stats = {'hits': 0, 'misses': 0, 'descartes': 0}
+    
+    @staticmethod
+    def chave(result):
+        conteudo = json.dumps([PDF_TEMPLATE_VERSAO, list(result)], default=str, ensure_ascii=False)
+        return hashlib.sha256(conteudo.encode('utf-8')).hexdigest()
+    
+    def _caminho(self, elevador_id, chave):
+        return os.path.join(self.diretorio, f'{elevador_id}-{chave}.pdf')
+    
+    def obter(self, elevador_id, chave):
+        caminho = self._caminho(elevador_id, chave)
+        try:
+            with open(caminho, 'rb') as f:
+                dados = f.read()
+            os.utime(caminho)  # marca como usado recentemente
+        except OSError:
+            with self._lock:
+                self._stats['misses'] += 1
+            return None
+        with self._lock:
+            self._stats['hits'] += 1
+        return dados
+    
+    def guardar(self, elevador_id, chave, dados):
+        try:
+            os.makedirs(self.diretorio, exist_ok=True)
+            caminho = self._caminho(elevador_id, chave)
+            # Grava num temporário e renomeia: outro processo nunca lê um PDF pela metade
+            temporario = f'{caminho}.{os.getpid()}.tmp'
+            with open(temporario, 'wb') as f:
+                f.write(dados)
+            os.replace(temporario, caminho)
+            with self._lock:
+                if self._tamanho_total is None:
+                    self._tamanho_total = self._varrer()[1]
+                else:
+                    self._tamanho_total += len(dados)
+                if self._tamanho_total > self.tamanho_maximo:
+                    self._descartar_antigos()
+        except OSError as e:
+            logging.warning(f"Não foi possível gravar o PDF em cache: {e}")
+    
+    def _varrer(self):
+        """Lista (mtime, tamanho, caminho) dos PDFs em cache e o tamanho total"""
+        arquivos = []
+        for entrada in os.scandir(self.diretorio):
+            if entrada.name.endswith('.pdf'):
+                try:
+                    info = entrada.stat()
+                except OSError:
+                    continue
+                arquivos.append((info.st_mtime, info.st_size, entrada.path))
+        return arquivos, sum(a[1] for a in arquivos)
+    
+    def _descartar_antigos(self):
+        # Varredura completa: corrige o total quando outros processos também gravam
+        arquivos, total = self._varrer()
+        alvo = self.tamanho_maximo * 0.9
+        for _, tamanho, caminho in sorted(arquivos):
+            if total <= alvo:
+                break
+            try:
+                os.remove(caminho)
+                total -= tamanho
+                self._stats['descartes'] += 1
+            except OSError:
+                pass
+        self._tamanho_total = total
+    
+    def invalidar(self, elevadores):
+        """Apaga os PDFs em cache dos elevadores informados"""
+        if not elevadores or not os.path.isdir(self.diretorio):
+            return
+        prefixos = tuple(f'{int(e)}-' for e in elevadores)
+        with self._lock:
+            for entrada in os.scandir(self.diretorio):
+                if entrada.name.startswith(prefixos):
+                    try:
+                        tamanho = entrada.stat().st_size
+                        os.remove(entrada.path)
+                        if self._tamanho_total is not None:
+                            self._tamanho_total -= tamanho
+                    except OSError:
+                        pass
+    
+    def stats(self):
+        with self._lock:
+            return {**self._stats, 'bytes': self._tamanho_total, 'limite_bytes': self.tamanho_maximo}
+
+cache_pdf = CachePdf(app.config['PDF_CACHE_DIR'], app.config['PDF_CACHE_MAX_MB'] * 1024 * 1024)
+
+def invalidar_pdfs(cursor, elevadores=(), contratos=(), clientes=()):
+    """
+    Libera do cache os PDFs afetados por uma escrita: os elevadores informados e
+    todos os elevadores dos contratos/clientes informados.
+    """
+    elevadores = [int(e) for e in elevadores if e]
+    contratos = [int(c) for c in contratos if c]
+    clientes = [int(c) for c in clientes if c]
+    if contratos or clientes:
+        cursor.execute("""
+            SELECT e.id FROM elevador e
+            JOIN contrato c ON e.id_contrato = c.id
+            WHERE c.id = ANY(%s) OR c.id_cliente = ANY(%s)
+        """, (contratos, clientes))
+        elevadores.extend(row[0] for row in cursor.fetchall())
+    cache_pdf.invalidar(elevadores)
+
+@app.route('/api/sistema/cache-pdf')
+def cache_pdf_stats():
+    """Retorna estatísticas do cache de PDFs"""
+    return jsonify(cache_pdf.stats())
+
+@app.route('/api/sistema/renderizacao-pdf')
+def renderizacao_pdf_stats():
+    """Retorna estatísticas do serviço de renderização de PDFs"""
+    return jsonify(servico_pdf.stats())
+
 @app.route('/api/elevadores/<int:elevador_id>/pdf')
 def gerar_pdf_elevador(elevador_id):
     conn = get_db_connection()
@@ -1050,496 +1920,344 @@ def gerar_pdf_elevador(elevador_id):
     cursor = conn.cursor()
     try:
         # Buscar dados completos do elevador
-        query = """
-            SELECT 
-                e.id, e.comando, e.observacao, e.porta_inferior, e.porta_superior, e.cor,
-                c.id as contrato_id, c.data_venda, c.data_entrega, c.vendedor,
-                cl.nome as cliente_nome, cl.documento,
-                cab.altura as cabine_altura, cab.largura as cabine_largura, 
-                cab.profundidade as cabine_profundidade, cab.piso as cabine_piso,
-                cab.montada as cabine_montada, cab.lado_entrada, cab.lado_saida,
-                col.elevacao, col.montada as coluna_montada,
-                ad.cancela, ad.porta, ad.portao, ad.barreira_eletronica,
-                ad.lados_enclausuramento, ad.sensor_esmagamento, ad.rampa_acesso,
-                ad.nobreak, ad.galvanizada,
-                en.rua, en.numero, en.complemento, en.cidade, en.estado, en.cep,
-                est.nome as estado_nome
-            FROM elevador e
-            LEFT JOIN contrato c ON e.id_contrato = c.id
-            LEFT JOIN cliente cl ON c.id_cliente = cl.id
-            LEFT JOIN cabine cab ON e.id = cab.id_elevador
-            LEFT JOIN coluna col ON e.id = col.id_elevador
-            LEFT JOIN adicionais ad ON e.id = ad.id_elevador
-            LEFT JOIN endereco en ON cl.id = en.id_cliente
-            LEFT JOIN estado est ON en.estado = est.sigla
-            WHERE e.id = %s
-        """
-        
-        cursor.execute(query, (elevador_id,))
+        cursor.execute(PDF_ELEVADOR_SQL.format(filtro="e.id = %s"), (elevador_id,))
         result = cursor.fetchone()
-        
-        if not result:
-            return jsonify({'error': 'Elevador não encontrado'}), 404
-        
-        # Imports para PDF
-        from reportlab.lib.pagesizes import A4
-        from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle, Image
-        from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-        from reportlab.lib.units import inch, cm
-        from reportlab.lib import colors
-        from reportlab.graphics.shapes import Drawing, Rect, Line, Polygon, String
-        from io import BytesIO
-        import os
-        from datetime import datetime
-        
-        # ========== CONSTANTES DE CONFIGURAÇÃO DO PDF ==========
-        # Margens do documento (você pode alterar estas margens individualmente)
-        MARGEM_ESQUERDA = 0.05*cm   # Margem esquerda - reduzida para aproveitar mais espaço
-        MARGEM_DIREITA = 0.05*cm    # Margem direita - reduzida para aproveitar mais espaço  
-        MARGEM_SUPERIOR = 0.3*cm    # Margem superior
-        MARGEM_INFERIOR = 0.3*cm    # Margem inferior
-        
-        # Tamanhos de fonte
-        FONTE_TITULO = 32
-        FONTE_SECAO = 20
-        FONTE_TABELA = 14
-        FONTE_CABECALHO = 14
-        FONTE_RODAPE = 12
-        FONTE_DESENHO = 12
-        
-        # Espaçamentos
-        ESPACAMENTO_TITULO = 16
-        ESPACAMENTO_SECAO_ANTES = 16
-        ESPACAMENTO_SECAO_DEPOIS = 8
-        ESPACAMENTO_RODAPE = 4
-        ESPACAMENTO_TABELA_VERTICAL = 6
-        ESPACAMENTO_TABELA_HORIZONTAL = 4
-        ESPACAMENTO_GERAL = 6
-        
-        # Dimensões de imagem
-        LOGO_LARGURA = 3*inch
-        LOGO_ALTURA = 0.8*inch
-        
-        # Dimensões de tabelas - otimizadas para melhor distribuição horizontal
-        LARGURA_COLUNA_PEQUENA = 2*cm
-        LARGURA_COLUNA_MEDIA = 2.5*cm
-        LARGURA_COLUNA_GRANDE = 4*cm
-        LARGURA_CABECALHO_1 = 3.5*cm      # Aumentada ligeiramente
-        LARGURA_CABECALHO_2 = 4.5*cm      # Aumentada para melhor proporção
-        LARGURA_CABECALHO_3 = 14*cm        # Aumentada para aproveitar espaço
-        LARGURA_DESENHO_CABINE = 6*cm     # Aumentada para melhor proporção
-        LARGURA_DESENHO_VISUAL = 10*cm    # Aumentada para aproveitar espaço extra
-        
-        # Larguras específicas para cada seção - otimizadas para melhor distribuição
-        LARGURA_INFO_COLUNA_1 = 3*cm      # Aumentada para melhor distribuição
-        LARGURA_INFO_COLUNA_2 = 4.5*cm    # Aumentada para aproveitar espaço
-        LARGURA_INFO_COLUNA_3 = 3*cm      # Aumentada para melhor distribuição
-        LARGURA_INFO_COLUNA_4 = 4.5*cm    # Aumentada para aproveitar espaço
-        
-        LARGURA_CABINE_COLUNA_1 = 2.5*cm  # Aumentada ligeiramente
-        LARGURA_CABINE_COLUNA_2 = 3.5*cm  # Aumentada para melhor proporção
-        
-        LARGURA_ESTRUTURA_COLUNA_1 = 3.5*cm   # Aumentada para melhor distribuição
-        LARGURA_ESTRUTURA_COLUNA_2 = 3*cm     # Aumentada ligeiramente
-        LARGURA_ESTRUTURA_COLUNA_3 = 3.5*cm   # Aumentada para melhor distribuição
-        LARGURA_ESTRUTURA_COLUNA_4 = 3*cm     # Aumentada ligeiramente
-        
-        LARGURA_ADICIONAIS_COLUNA_1 = 6*cm  # Aumentada para melhor distribuição
-        LARGURA_ADICIONAIS_COLUNA_2 = 1*cm    # Aumentada para aproveitar espaço
-        LARGURA_ADICIONAIS_COLUNA_3 = 6*cm  # Aumentada para melhor distribuição
-        LARGURA_ADICIONAIS_COLUNA_4 = 1*cm    # Aumentada para aproveitar espaço
-        
-        # Espaçamentos adicionais
-        ESPACAMENTO_TABELA_SECAO = 6
-        
-        # Dimensões e configurações do desenho da cabine
-        DESENHO_LARGURA = 180
-        DESENHO_ALTURA = 120
-        DESENHO_ESCALA = 1.5
-        DESENHO_LARGURA_PADRAO = 50
-        DESENHO_ALTURA_PADRAO = 35
-        DESENHO_MARGEM_PLATAFORMA = 6
-        DESENHO_TAMANHO_SETA = 12
-        DESENHO_OFFSET_SETA_DUPLA = 15
-        DESENHO_OFFSET_SETA_Y = 18
-        DESENHO_OFFSET_SETA_X = 18
-        DESENHO_POSICAO_DIMENSOES_Y = 10
-        DESENHO_POSICAO_CENTRO_X = 90
-        DESENHO_POSICAO_CENTRO_Y = 60
-        
-        # Dimensões do desenho da cabine
-        DESENHO_LARGURA = 180
-        DESENHO_ALTURA = 120
-        ESCALA_CABINE = 1.5
-        MARGEM_PLATAFORMA = 6
-        # ====================================================
-        
-        # Preparar dados
-        endereco_completo = 'Não informado'
-        if result[30]:  # rua
-            endereco_completo = f"{result[30]}, {result[31]}"
-            if result[32]:  # complemento
-                endereco_completo += f", {result[32]}"
-            endereco_completo += f" - {result[33]}/{result[34]} - CEP: {result[35]}"
-        
-        # Criar buffer em memória
-        buffer = BytesIO()
-        
-        # Configurar documento PDF - margens configuráveis
-        doc = SimpleDocTemplate(buffer, pagesize=A4, 
-                              rightMargin=MARGEM_DIREITA, leftMargin=MARGEM_ESQUERDA, 
-                              topMargin=MARGEM_SUPERIOR, bottomMargin=MARGEM_INFERIOR)
-        
-        # Configurar estilos com fontes maiores
-        styles = getSampleStyleSheet()
-        
-        title_style = ParagraphStyle('CustomTitle',
-                                   parent=styles['Heading1'],
-                                   fontSize=FONTE_TITULO,
-                                   spaceAfter=ESPACAMENTO_TITULO,
-                                   alignment=1)  # Centralizado
-        
-        section_style = ParagraphStyle('SectionStyle',
-                                     parent=styles['Heading2'],
-                                     fontSize=FONTE_SECAO,
-                                     spaceAfter=ESPACAMENTO_SECAO_DEPOIS,
-                                     spaceBefore=ESPACAMENTO_SECAO_ANTES,
-                                     textColor=colors.darkblue,
-                                     alignment=1)
-        
-        small_style = ParagraphStyle('Small',
-                                   parent=styles['Normal'],
-                                   fontSize=FONTE_RODAPE,
-                                   spaceAfter=ESPACAMENTO_RODAPE)
-        
-        text_style = ParagraphStyle('Text',
-                                    parent=styles['Normal'],
-                                    fontSize=FONTE_TABELA,
-                                    spaceAfter=ESPACAMENTO_GERAL)
-        
-        # Conteúdo do PDF
-        story = []
-        
-        # # Título principal
-        # title = Paragraph(f"RELATÓRIO DO ELEVADOR #{result[0]}", title_style)
-        # story.append(title)
-        # story.append(Spacer(1, 4))
-
-        # ====== CABEÇALHO COM LOGO, PEDIDO E CLIENTE ======
-        pedido_data = [
-            ['OS:', str(result[6]) if result[6] else 'N/A'],
-            ['Data Venda:', result[7].strftime('%d/%m/%Y') if result[7] else 'N/A'],
-            ['Data Entrega:', result[8].strftime('%d/%m/%Y') if result[8] else 'N/A']
-        ]
-
-        if result[33] and result[34]:
-            cidade_estado = f"{result[33]}, {result[34]}"
-        elif result[33]:
-            cidade_estado = result[33]
-        else:
-            cidade_estado = 'N/A'
-
-        cliente_data = [
-            ['Cliente:', result[10] or 'N/A'],
-            ['Cidade:', cidade_estado]
-        ]
-
-        # Montar logo + pedido_data lado a lado
-        logo_path = os.path.join(app.static_folder, 'images', 'home-escrito.png')
-        logo_img = None
-        if os.path.exists(logo_path):
-            logo_img = Image(logo_path, width=LOGO_LARGURA, height=LOGO_ALTURA)
-            logo_img.hAlign = 'LEFT'
-
-        pedido_table = Table(pedido_data, colWidths=[LARGURA_CABECALHO_1, LARGURA_CABECALHO_2])
-        pedido_table.setStyle(TableStyle([
-            ('FONTSIZE', (0, 0), (-1, -1), FONTE_CABECALHO),
-            ('BOTTOMPADDING', (0, 0), (-1, -1), ESPACAMENTO_TABELA_HORIZONTAL),
-            ('TOPPADDING', (0, 0), (-1, -1), ESPACAMENTO_TABELA_HORIZONTAL),
-            ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-        ]))
-
-        # Cabeçalho: logo à esquerda, pedido à direita - larguras otimizadas
-        if logo_img:
-            cabecalho_table = Table([[logo_img, pedido_table]], colWidths=[8*cm, 6*cm])
-        else:
-            cabecalho_table = Table([['', pedido_table]], colWidths=[8*cm, 6*cm])
-        cabecalho_table.setStyle(TableStyle([
-            ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
-            ('ALIGN', (1, 0), (1, 0), 'RIGHT'),
-            ('LEFTPADDING', (0, 0), (-1, -1), 0),
-            ('RIGHTPADDING', (0, 0), (-1, -1), 0),
-        ]))
-        story.append(cabecalho_table)
-
-        # Cliente_data logo abaixo do cabeçalho
-        cliente_table = Table(cliente_data, colWidths=[LARGURA_CABECALHO_1, LARGURA_CABECALHO_3])
-        cliente_table.setStyle(TableStyle([
-            ('FONTSIZE', (0, 0), (-1, -1), FONTE_CABECALHO),
-            ('BOTTOMPADDING', (0, 0), (-1, -1), ESPACAMENTO_TABELA_HORIZONTAL),
-            ('TOPPADDING', (0, 0), (-1, -1), ESPACAMENTO_TABELA_HORIZONTAL),
-            ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-        ]))
-        story.append(cliente_table)
-        story.append(Spacer(1, ESPACAMENTO_GERAL))
-        
-        # Função para criar desenho da cabine
-        def criar_desenho_cabine(largura, profundidade, lado_entrada, lado_saida):
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+    finally:
+        # A conexão volta ao pool antes da renderização, que pode esperar na fila
+        cursor.close()
+        end_pg_connection(conn)
+    
+    if not result:
+        return jsonify({'error': 'Elevador não encontrado'}), 404
+    
+    try:
+        # A chave do cache também é o ETag: o navegador revalida e recebe 304 se nada mudou
+        chave = cache_pdf.chave(result)
+        if request.if_none_match.contains(chave):
+            response = Response(status=304)
+            response.set_etag(chave)
+            return response
+        
+        pdf_data = cache_pdf.obter(elevador_id, chave)
+        origem = 'HIT'
+        if pdf_data is None:
+            origem = 'MISS'
             try:
-                # Criar desenho
-                drawing = Drawing(DESENHO_LARGURA, DESENHO_ALTURA)
-                
-                # Dimensões base para o desenho (escaladas)
-                scale = DESENHO_ESCALA
-                
-                # Usar dimensões reais se disponíveis, senão usar valores padrão
-                cab_width = float(largura) * scale if largura else DESENHO_LARGURA_PADRAO
-                cab_height = float(profundidade) * scale if profundidade else DESENHO_ALTURA_PADRAO
-                
-                # Centralizar desenho
-                start_x = DESENHO_POSICAO_CENTRO_X - cab_width/2
-                start_y = DESENHO_POSICAO_CENTRO_Y - cab_height/2
-                
-                # Desenhar cabine (retângulo principal)
-                cabine_rect = Rect(start_x, start_y, cab_width, cab_height)
-                cabine_rect.fillColor = colors.lightblue
-                cabine_rect.strokeColor = colors.black
-                cabine_rect.strokeWidth = 2
-                drawing.add(cabine_rect)
-                
-                # Desenhar plataforma (retângulo menor dentro da cabine)
-                plat_margin = DESENHO_MARGEM_PLATAFORMA
-                plataforma = Rect(start_x + plat_margin, start_y + plat_margin, 
-                                cab_width - 2*plat_margin, cab_height - 2*plat_margin)
-                plataforma.fillColor = colors.lightyellow
-                plataforma.strokeColor = colors.darkgray
-                plataforma.strokeWidth = 1
-                drawing.add(plataforma)
-                
-                # Função para desenhar seta
-                def desenhar_seta(x, y, direcao, cor=colors.red):
-                    seta_tamanho = DESENHO_TAMANHO_SETA
-                    if direcao == 'direita':
-                        # Seta para direita
-                        seta = Polygon([x, y, x+seta_tamanho, y+seta_tamanho/2, x, y+seta_tamanho, x+2, y+seta_tamanho/2])
-                    elif direcao == 'esquerda':
-                        # Seta para esquerda
-                        seta = Polygon([x+seta_tamanho, y, x, y+seta_tamanho/2, x+seta_tamanho, y+seta_tamanho, x+seta_tamanho-2, y+seta_tamanho/2])
-                    elif direcao == 'cima':
-                        # Seta para cima
-                        seta = Polygon([x, y+seta_tamanho, x+seta_tamanho/2, y, x+seta_tamanho, y+seta_tamanho, x+seta_tamanho/2, y+seta_tamanho-2])
-                    elif direcao == 'baixo':
-                        # Seta para baixo
-                        seta = Polygon([x, y, x+seta_tamanho/2, y+seta_tamanho, x+seta_tamanho, y, x+seta_tamanho/2, y+2])
-                    else:
-                        return
-                    
-                    seta.fillColor = cor
-                    seta.strokeColor = colors.darkred
-                    seta.strokeWidth = 1
-                    drawing.add(seta)
-                
-                # Mapear lados para posições e direções
-                lados_config = {
-                    'frente': {'pos': (start_x + cab_width/2 - DESENHO_TAMANHO_SETA/2, start_y - DESENHO_OFFSET_SETA_Y), 'dir': 'cima'},
-                    'tras': {'pos': (start_x + cab_width/2 - DESENHO_TAMANHO_SETA/2, start_y + cab_height + 6), 'dir': 'baixo'},
-                    'direita': {'pos': (start_x + cab_width + 6, start_y + cab_height/2 - DESENHO_TAMANHO_SETA/2), 'dir': 'direita'},
-                    'esquerda': {'pos': (start_x - DESENHO_OFFSET_SETA_X, start_y + cab_height/2 - DESENHO_TAMANHO_SETA/2), 'dir': 'esquerda'}
-                }
-                
-                # Desenhar seta de entrada
-                if lado_entrada and lado_entrada.lower() in lados_config:
-                    config = lados_config[lado_entrada.lower()]
-                    desenhar_seta(config['pos'][0], config['pos'][1], config['dir'], colors.green)
-                    
-                    # Adicionar texto "E"
-                    entrada_text = String(config['pos'][0] + DESENHO_TAMANHO_SETA/2, config['pos'][1] - 8, 'E')
-                    entrada_text.fontSize = FONTE_DESENHO
-                    entrada_text.fillColor = colors.green
-                    entrada_text.textAnchor = 'middle'
-                    drawing.add(entrada_text)
-                
-                # Desenhar seta de saída
-                if lado_saida and lado_saida.lower() in lados_config:
-                    config = lados_config[lado_saida.lower()]
-                    # Usar posição ligeiramente deslocada se for o mesmo lado da entrada
-                    offset_x = DESENHO_OFFSET_SETA_DUPLA if lado_entrada == lado_saida else 0
-                    desenhar_seta(config['pos'][0] + offset_x, config['pos'][1], config['dir'], colors.red)
-                    
-                    # Adicionar texto "S"
-                    saida_text = String(config['pos'][0] + offset_x + DESENHO_TAMANHO_SETA/2, config['pos'][1] - 8, 'S')
-                    saida_text.fontSize = FONTE_DESENHO
-                    saida_text.fillColor = colors.red
-                    saida_text.textAnchor = 'middle'
-                    drawing.add(saida_text)
-                
-                # Adicionar dimensões como texto
-                if largura and profundidade:
-                    dim_text = String(DESENHO_POSICAO_CENTRO_X, DESENHO_POSICAO_DIMENSOES_Y, f'{largura} x {profundidade}')
-                    dim_text.fontSize = FONTE_DESENHO
-                    dim_text.fillColor = colors.black
-                    dim_text.textAnchor = 'middle'
-                    drawing.add(dim_text)
-                
-                return drawing
-                
-            except Exception as e:
-                print(f"Erro ao criar desenho da cabine: {e}")
-                # Retornar desenho vazio em caso de erro
-                return Drawing(DESENHO_LARGURA, DESENHO_ALTURA)
-        
-        # SETOR 1: INFORMAÇÕES BÁSICAS
-        section_title = Paragraph("INFORMAÇÕES BÁSICAS", section_style)
-        story.append(section_title)
-        
-        info_data = [
-            ['Comando:', result[1] or 'Não informado', 'Cor:', result[5] or 'Não especificada'],
-            ['Porta Inferior:', result[3] or 'N/A', 'Porta Superior:', result[4] or 'N/A']]
-        
-        info_table = Table(info_data, colWidths=[LARGURA_INFO_COLUNA_1, LARGURA_INFO_COLUNA_2, LARGURA_INFO_COLUNA_3, LARGURA_INFO_COLUNA_4])
-        info_table.setStyle(TableStyle([
-            ('FONTSIZE', (0, 0), (-1, -1), FONTE_TABELA),
-            ('BOTTOMPADDING', (0, 0), (-1, -1), ESPACAMENTO_TABELA_HORIZONTAL),
-            ('TOPPADDING', (0, 0), (-1, -1), ESPACAMENTO_TABELA_HORIZONTAL),
-            ('GRID', (0, 0), (-1, -1), 0.5, colors.gray),
-            ('BACKGROUND', (0, 0), (0, -1), colors.lightgrey),
-            ('BACKGROUND', (2, 0), (2, -1), colors.lightgrey),
-        ]))
-        story.append(info_table)
-        story.append(Spacer(1, ESPACAMENTO_TABELA_SECAO))
-
-        if result[2]:
-            text = f'Observação: {result[2]}.'
-        else:
-            text = 'Sem observações.'
-        obs = Paragraph(text, text_style)
-        story.append(obs)
-        
-        # SETOR 2 e 3: CABINE E DESENHO (lado a lado)
-        section_title = Paragraph("CABINE E VISUALIZAÇÃO", section_style)
-        story.append(section_title)
-        
-        # Dados da cabine
-        cabine_data = [
-            ['Altura:', str(result[12]) if result[12] else 'N/A'],
-            ['Largura:', str(result[13]) if result[13] else 'N/A'],
-            ['Profundidade:', str(result[14]) if result[14] else 'N/A'],
-            ['Piso:', result[15] or 'N/A'],
-            ['Montada:', 'Sim' if result[16] else 'Não'],
-            ['Entrada:', result[17] or 'N/A'],
-            ['Saída:', result[18] or 'N/A']
-        ]
-        
-        cabine_table = Table(cabine_data, colWidths=[LARGURA_CABINE_COLUNA_1, LARGURA_CABINE_COLUNA_2])
-        cabine_table.setStyle(TableStyle([
-            ('FONTSIZE', (0, 0), (-1, -1), FONTE_TABELA),
-            ('BOTTOMPADDING', (0, 0), (-1, -1), ESPACAMENTO_TABELA_HORIZONTAL),
-            ('TOPPADDING', (0, 0), (-1, -1), ESPACAMENTO_TABELA_HORIZONTAL),
-            ('GRID', (0, 0), (-1, -1), 0.5, colors.gray),
-            ('BACKGROUND', (0, 0), (0, -1), colors.lightblue),
-        ]))
-        
-        # Criar desenho da cabine
-        desenho_cabine = criar_desenho_cabine(
-            result[13],  # largura
-            result[14],  # profundidade  
-            result[17],  # lado_entrada
-            result[18]   # lado_saida
-        )
-        
-        # Juntar cabine e desenho lado a lado
-        cabine_desenho_table = Table([[cabine_table, desenho_cabine]], colWidths=[LARGURA_DESENHO_CABINE, LARGURA_DESENHO_VISUAL])
-        cabine_desenho_table.setStyle(TableStyle([
-            ('VALIGN', (0, 0), (-1, -1), 'TOP'),
-            ('LEFTPADDING', (0, 0), (-1, -1), 5),
-            ('RIGHTPADDING', (0, 0), (-1, -1), 5),
-        ]))
-        story.append(cabine_desenho_table)
-        story.append(Spacer(1, ESPACAMENTO_TABELA_SECAO))
-        
-        # SETOR 4: COLUNA E ESTRUTURA
-        section_title = Paragraph("COLUNA E ESTRUTURA", section_style)
-        story.append(section_title)
-        
-        coluna_data = [
-            ['Elevação:', str(result[19]) if result[19] else 'N/A', 'Coluna Montada:', 'Sim' if result[20] else 'Não'],
-            ['Galvanizada:', 'Sim' if result[29] else 'Não', '', '']
-        ]
-        
-        coluna_table = Table(coluna_data, colWidths=[LARGURA_ESTRUTURA_COLUNA_1, LARGURA_ESTRUTURA_COLUNA_2, LARGURA_ESTRUTURA_COLUNA_3, LARGURA_ESTRUTURA_COLUNA_4])
-        coluna_table.setStyle(TableStyle([
-            ('FONTSIZE', (0, 0), (-1, -1), FONTE_TABELA),
-            ('BOTTOMPADDING', (0, 0), (-1, -1), ESPACAMENTO_TABELA_HORIZONTAL),
-            ('TOPPADDING', (0, 0), (-1, -1), ESPACAMENTO_TABELA_HORIZONTAL),
-            ('GRID', (0, 0), (-1, -1), 0.5, colors.gray),
-            ('BACKGROUND', (0, 0), (0, -1), colors.lightgreen),
-            ('BACKGROUND', (2, 0), (2, -1), colors.lightgreen),
-        ]))
-        story.append(coluna_table)
-        story.append(Spacer(1, ESPACAMENTO_TABELA_SECAO))
-        
-        # SETOR 5: ADICIONAIS
-        section_title = Paragraph("ADICIONAIS", section_style)
-        story.append(section_title)
-        
-        adicionais_data = [
-            ['Cancela:', str(result[21]) if result[21] else '0', 'Porta:', str(result[22]) if result[22] else '0'],
-            ['Portão:', str(result[23]) if result[23] else '0', 'Barreira Eletrônica:', str(result[24]) if result[24] else '0'],
-            ['Lados Enclausuramento:', str(result[25]) if result[25] else '0', 'Sensor Esmagamento:', str(result[26]) if result[26] else '0'],
-            ['Rampa Acesso:', str(result[27]) if result[27] else '0', 'NoBreak:', str(result[28]) if result[28] else '0']
-        ]
-        
-        adicionais_table = Table(adicionais_data, colWidths=[LARGURA_ADICIONAIS_COLUNA_1, LARGURA_ADICIONAIS_COLUNA_2, LARGURA_ADICIONAIS_COLUNA_3, LARGURA_ADICIONAIS_COLUNA_4])
-        adicionais_table.setStyle(TableStyle([
-            ('FONTSIZE', (0, 0), (-1, -1), FONTE_TABELA),
-            ('BOTTOMPADDING', (0, 0), (-1, -1), ESPACAMENTO_TABELA_HORIZONTAL),
-            ('TOPPADDING', (0, 0), (-1, -1), ESPACAMENTO_TABELA_HORIZONTAL),
-            ('GRID', (0, 0), (-1, -1), 0.5, colors.gray),
-            ('BACKGROUND', (0, 0), (0, -1), colors.lightyellow),
-            ('BACKGROUND', (2, 0), (2, -1), colors.lightyellow),
-        ]))
-        story.append(adicionais_table)
-        story.append(Spacer(1, ESPACAMENTO_RODAPE))
-        
-        # Rodapé com data de geração
-        story.append(Spacer(1, ESPACAMENTO_TABELA_SECAO))
-        rodape = Paragraph(f"Relatório gerado em {datetime.now().strftime('%d/%m/%Y às %H:%M')}", small_style)
-        story.append(rodape)
-        
-        # Construir PDF
-        doc.build(story)
-        
-        # Obter dados do buffer
-        pdf_data = buffer.getvalue()
-        buffer.close()
+                pdf_data = servico_pdf.renderizar(result, caminho_logo_pdf())
+            except ServicoSaturadoError:
+                return resposta_servico_pdf_ocupado('Muitos PDFs sendo gerados no momento, tente novamente')
+            except FuturesTimeoutError:
+                return jsonify({'error': 'Tempo esgotado ao gerar o PDF'}), 504
+            cache_pdf.guardar(elevador_id, chave, pdf_data)
         
         # Retornar PDF
-        from flask import Response
-        return Response(
+        response = Response(
             pdf_data,
             mimetype='application/pdf',
             headers={
-                'Content-Disposition': f'inline; filename="elevador_{elevador_id}.pdf"'
+                'Content-Disposition': f'inline; filename="elevador_{elevador_id}.pdf"',
+                'Cache-Control': 'private, no-cache',
+                'X-Cache': origem
             }
         )
-        
+        response.set_etag(chave)
+        return response
+    
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/api/elevadores/pdf-lote')
+def gerar_pdfs_elevadores_lote():
+    """
+    Fichas de vários elevadores num ZIP enviado aos poucos (streaming).
+    Seleção por ?ids=1,2,3 e/ou filtros status, contrato, entrega_de, entrega_ate.
+    PDFs em cache saem primeiro; os demais são renderizados pelo servico_pdf e entram
+    no ZIP na ordem em que ficam prontos. O lote mantém no máximo um PDF por processo
+    em andamento, deixando o resto da fila livre para as fichas avulsas.
+    """
+    conn = get_db_connection()
+    if not conn:
+        return jsonify({'error': 'Erro na conexão com o banco'}), 500
+    
+    cursor = conn.cursor()
+    try:
+        where_conditions = []
+        params = []
+        try:
+            ids = [int(i) for i in request.args.get('ids', '').split(',') if i.strip()]
+            entrega_de = get_date_arg('entrega_de')
+            entrega_ate = get_date_arg('entrega_ate')
+        except ValueError:
+            return jsonify({'error': 'Parâmetros inválidos'}), 400
+        filtro_status = request.args.get('status')
+        filtro_contrato = request.args.get('contrato', type=int)
+        
+        if ids:
+            where_conditions.append("e.id = ANY(%s)")
+            params.append(ids)
+        if filtro_status:
+            where_conditions.append("e.status = %s")
+            params.append(filtro_status)
+        if filtro_contrato:
+            where_conditions.append("e.id_contrato = %s")
+            params.append(filtro_contrato)
+        if entrega_de:
+            where_conditions.append("c.data_entrega >= %s")
+            params.append(entrega_de)
+        if entrega_ate:
+            where_conditions.append("c.data_entrega <= %s")
+            params.append(entrega_ate)
+        
+        if not where_conditions:
+            return jsonify({'error': 'Informe ids ou ao menos um filtro'}), 400
+        
+        cursor.execute(PDF_ELEVADOR_SQL.format(filtro=' AND '.join(where_conditions)), params)
+        rows = cursor.fetchmany(PDF_LOTE_MAX + 1)
+        if len(rows) > PDF_LOTE_MAX:
+            return jsonify({'error': f'Máximo de {PDF_LOTE_MAX} elevadores por exportação'}), 400
+        if not rows:
+            return jsonify({'error': 'Nenhum elevador encontrado'}), 404
     except Exception as e:
         return jsonify({'error': str(e)}), 500
     finally:
+        # A conexão volta ao pool antes do streaming, que pode demorar
         cursor.close()
         end_pg_connection(conn)
+    
+    logo_path = caminho_logo_pdf()
+    
+    def gerar():
+        saida = SaidaZip()
+        em_andamento = {}
+        erros = []
+        
+        def receber_prontos(arquivo_zip):
+            """Espera ao menos uma ficha em andamento e grava as prontas no ZIP"""
+            prontos, _ = wait(em_andamento, timeout=servico_pdf.timeout, return_when=FIRST_COMPLETED)
+            if not prontos:
+                # Nenhuma ficha terminou no prazo: desistir das que estão em andamento
+                # (se alguma travou num processo, o servico_pdf recicla o pool)
+                for futuro, (elevador_id, _) in em_andamento.items():
+                    servico_pdf.desistir(futuro)
+                    erros.append(f'Elevador #{elevador_id}: tempo esgotado')
+                em_andamento.clear()
+                return
+            for futuro in prontos:
+                elevador_id, chave = em_andamento.pop(futuro)
+                try:
+                    pdf_data = futuro.result()
+                except Exception as e:
+                    erros.append(f'Elevador #{elevador_id}: {e}')
+                    continue
+                cache_pdf.guardar(elevador_id, chave, pdf_data)
+                arquivo_zip.writestr(f'elevador_{elevador_id}.pdf', pdf_data)
+        
+        try:
+            with zipfile.ZipFile(saida, 'w', zipfile.ZIP_STORED) as arquivo_zip:
+                faltando = []
+                for row in rows:
+                    chave = cache_pdf.chave(row)
+                    pdf_data = cache_pdf.obter(row[0], chave)
+                    if pdf_data is not None:
+                        arquivo_zip.writestr(f'elevador_{row[0]}.pdf', pdf_data)
+                        yield saida.esvaziar()
+                    else:
+                        faltando.append((row, chave))
+                
+                for row, chave in faltando:
+                    while len(em_andamento) >= servico_pdf.workers:
+                        receber_prontos(arquivo_zip)
+                        yield saida.esvaziar()
+                    try:
+                        futuro = servico_pdf.submeter(row, logo_path, espera=servico_pdf.timeout)
+                    except ServicoSaturadoError as e:
+                        erros.append(f'Elevador #{row[0]}: {e}')
+                        continue
+                    em_andamento[futuro] = (row[0], chave)
+                
+                while em_andamento:
+                    receber_prontos(arquivo_zip)
+                    yield saida.esvaziar()
+                
+                if erros:
+                    arquivo_zip.writestr('ERROS.txt', '\n'.join(erros))
+            yield saida.esvaziar()
+        finally:
+            # Cliente desconectou no meio: não renderizar o que ainda está na fila
+            for futuro in em_andamento:
+                futuro.cancel()
+    
+    nome_arquivo = f"fichas_elevadores_{datetime.now().strftime('%Y%m%d_%H%M')}.zip"
+    return Response(
+        stream_with_context(gerar()),
+        mimetype='application/zip',
+        headers={'Content-Disposition': f'attachment; filename="{nome_arquivo}"'}
+    )
 
 # Rota para o calendário
 @app.route('/calendario')
 def calendario():
     return render_template('calendario.html')
 
+# ===== Resumo (rollup) dos relatórios de vendas =====
+# Linhas de relatorio_vendas (ver migrations/002_rollup_relatorio_vendas.sql)
+ROLLUP_VENDAS_SQL = """
+    INSERT INTO relatorio_vendas
+        (estado, id_contrato, id_cliente, data_venda, total_elevadores, soma_elevacao, qtd_elevacao)
+    SELECT e.estado, c.id, c.id_cliente, c.data_venda,
+           COUNT(el.id), COALESCE(SUM(col.elevacao), 0), COUNT(col.elevacao)
+    FROM contrato c
+    JOIN endereco e ON e.id_cliente = c.id_cliente
+    LEFT JOIN elevador el ON el.id_contrato = c.id
+    LEFT JOIN coluna col ON col.id_elevador = el.id
+    WHERE {filtro}
+    GROUP BY e.estado, c.id, c.id_cliente, c.data_venda
+"""
+
+def atualizar_rollup_vendas(cursor, contratos=(), clientes=()):
+    """
+    Recalcula as linhas de relatorio_vendas dos contratos/clientes afetados por uma escrita.
+    Roda na mesma transação da escrita; se falhar, a escrita segue e o erro é registrado.
+    """
+    contratos = [int(c) for c in contratos if c]
+    clientes = [int(c) for c in clientes if c]
+    if not contratos and not clientes:
+        return
+    
+    cursor.execute("SAVEPOINT rollup_vendas")
+    try:
+        if contratos:
+            cursor.execute("DELETE FROM relatorio_vendas WHERE id_contrato = ANY(%s)", (contratos,))
+            cursor.execute(ROLLUP_VENDAS_SQL.format(filtro="c.id = ANY(%s)"), (contratos,))
+        if clientes:
+            cursor.execute("DELETE FROM relatorio_vendas WHERE id_cliente = ANY(%s)", (clientes,))
+            cursor.execute(ROLLUP_VENDAS_SQL.format(filtro="c.id_cliente = ANY(%s)"), (clientes,))
+        cursor.execute("RELEASE SAVEPOINT rollup_vendas")
+    except Exception as e:
+        cursor.execute("ROLLBACK TO SAVEPOINT rollup_vendas")
+        logging.error(f"Erro ao atualizar resumo dos relatórios: {e}")
+
+def usar_rollup_relatorios():
+    """Indica se os relatórios devem ler do resumo ou agregar ao vivo"""
+    return app.config['RELATORIOS_ROLLUP'] and request.args.get('fonte') != 'ao-vivo'
+
+# Notificações de alterações (LISTEN/NOTIFY) transmitidas às páginas via Server-Sent Events
+CANAL_ALTERACOES = 'alteracoes'
+SSE_HEARTBEAT = 15        # segundos entre comentários de keep-alive no stream
+SSE_TAMANHO_FILA = 100    # alterações pendentes por cliente antes de pedir ressincronização
+
+def notificar_alteracao(cursor, entidade, acao, entidade_id, **extras):
+    """Publica uma alteração no canal do Postgres.
+    
+    Deve ser chamada antes do commit: o NOTIFY só é entregue se a transação for
+    confirmada, e chega a todos os processos que escutam o canal.
+    """
+    mensagem = {'entidade': entidade, 'acao': acao, 'id': entidade_id, **extras}
+    if has_request_context():
+        # Invalidação do cache de referência: só depois da rota (e do commit)
+        g.setdefault('entidades_alteradas', set()).add(entidade)
+    # Nova versão da entidade (ETag das listagens); isolada num savepoint, como o rollup
+    cursor.execute("SAVEPOINT versao_entidade")
+    try:
+        cursor.execute("UPDATE versao_entidade SET versao = versao + 1 WHERE entidade = %s", (entidade,))
+        cursor.execute("RELEASE SAVEPOINT versao_entidade")
+    except Exception as e:
+        cursor.execute("ROLLBACK TO SAVEPOINT versao_entidade")
+        logging.error(f"Erro ao atualizar a versão de {entidade}: {e}")
+    cursor.execute("SELECT pg_notify(%s, %s)", (CANAL_ALTERACOES, json.dumps(mensagem, default=str)))
+
+class TransmissorAlteracoes:
+    """Distribui as notificações recebidas para as filas dos streams SSE abertos"""
+    
+    def __init__(self, tamanho_fila=SSE_TAMANHO_FILA):
+        self.tamanho_fila = tamanho_fila
+        self._filas = set()
+        self._lock = threading.Lock()
+    
+    def assinar(self):
+        fila = queue.Queue(maxsize=self.tamanho_fila)
+        with self._lock:
+            self._filas.add(fila)
+        return fila
+    
+    def cancelar(self, fila):
+        with self._lock:
+            self._filas.discard(fila)
+    
+    def publicar(self, mensagem):
+        with self._lock:
+            filas = list(self._filas)
+        for fila in filas:
+            try:
+                fila.put_nowait(mensagem)
+            except queue.Full:
+                # Cliente lento: descarta o acumulado e pede que recarregue tudo
+                with fila.mutex:
+                    fila.queue.clear()
+                fila.put_nowait({'acao': 'ressincronizar'})
+    
+    def receber_notificacao(self, payload):
+        """Callback do PgListener; payload None indica reconexão (notificações perdidas)"""
+        if payload is None:
+            self.publicar({'acao': 'ressincronizar'})
+            return
+        try:
+            self.publicar(json.loads(payload))
+        except ValueError:
+            logging.warning(f"Notificação inválida no canal {CANAL_ALTERACOES}: {payload}")
+    
+    def encerrar(self):
+        """Fecha os streams abertos; o navegador reconecta sozinho (retry) ao novo servidor"""
+        with self._lock:
+            filas = list(self._filas)
+            self._filas.clear()
+        for fila in filas:
+            with fila.mutex:
+                fila.queue.clear()
+            fila.put_nowait(None)
+
+transmissor_alteracoes = TransmissorAlteracoes()
+escuta_alteracoes = PgListener(CANAL_ALTERACOES, transmissor_alteracoes.receber_notificacao)
+# Streams SSE nunca terminam sozinhos: sem isso o servidor de produção esperaria
+# o tempo de encerramento inteiro por eles
+ao_encerrar(transmissor_alteracoes.encerrar)
+
+@app.route('/api/eventos')
+def stream_alteracoes():
+    """Stream SSE com as alterações de elevadores, contratos e clientes"""
+    # A escuta só começa quando a primeira página se conecta
+    escuta_alteracoes.start()
+    fila = transmissor_alteracoes.assinar()
+    
+    def gerar():
+        try:
+            yield 'retry: 5000\n\n'
+            while True:
+                try:
+                    mensagem = fila.get(timeout=SSE_HEARTBEAT)
+                except queue.Empty:
+                    yield ': ping\n\n'
+                    continue
+                if mensagem is None:  # servidor encerrando
+                    break
+                yield f'data: {json.dumps(mensagem)}\n\n'
+        finally:
+            transmissor_alteracoes.cancelar(fila)
+    
+    response = Response(stream_with_context(gerar()), mimetype='text/event-stream')
+    response.headers['Cache-Control'] = 'no-cache'
+    response.headers['X-Accel-Buffering'] = 'no'
+    return response
+
 # Rota para relatórios
 @app.route('/relatorios')
 def relatorios():
     return render_template('relatorios.html')
 
 @app.route('/api/relatorios/vendas-por-estado')
+@listagem_condicional('elevador', 'contrato', 'cliente')
 def get_vendas_por_estado():
     conn = get_db_connection()
     if not conn:
@@ -1550,6 +2268,8 @@ def get_vendas_por_estado():
         # Obter parâmetros de filtro
         filtro_mes = request.args.get('mes')
         filtro_estado = request.args.get('estado')
+        rollup = usar_rollup_relatorios()
+        coluna_data = 'r.data_venda' if rollup else 'c.data_venda'
         
         # Construir query com filtros
         where_conditions = []
@@ -1560,36 +2280,50 @@ def get_vendas_por_estado():
             params.append(filtro_estado)
         
         if filtro_mes:
-            # Converter formato MM/YYYY para YYYY-MM
-            try:
-                mes_parts = filtro_mes.split('/')
-                if len(mes_parts) == 2:
-                    mes_formatado = f"{mes_parts[1]}-{mes_parts[0]}"
-                    where_conditions.append("TO_CHAR(c.data_venda, 'YYYY-MM') = %s")
-                    params.append(mes_formatado)
-            except:
-                pass  # Ignorar formato inválido
+            # Converter MM/YYYY em intervalo de datas (permite usar o índice de data_venda)
+            intervalo_mes = parse_month_range(filtro_mes)
+            if intervalo_mes:  # Ignorar formato inválido
+                where_conditions.append(f"{coluna_data} >= %s AND {coluna_data} < %s")
+                params.extend(intervalo_mes)
         
         where_clause = ""
         if where_conditions:
             where_clause = "WHERE " + " AND ".join(where_conditions)
         
-        query = f"""
-            SELECT 
-                e.estado,
-                est.nome as estado_nome,
-                COUNT(el.id) as total_elevadores,
-                COUNT(DISTINCT c.id_cliente) as total_clientes,
-                AVG(el.elevacao) as elevacao_media
-            FROM endereco e
-            JOIN estado est ON e.estado = est.sigla
-            LEFT JOIN cliente cli ON e.id_cliente = cli.id
-            LEFT JOIN contrato c ON cli.id = c.id_cliente
-            LEFT JOIN elevador el ON c.id = el.id_contrato
-            {where_clause}
-            GROUP BY e.estado, est.nome
-            ORDER BY total_elevadores DESC
-        """
+        if rollup:
+            # Estados com endereço cadastrado aparecem mesmo sem vendas, como na agregação ao vivo
+            query = f"""
+                SELECT 
+                    e.estado,
+                    est.nome as estado_nome,
+                    COALESCE(SUM(r.total_elevadores), 0) as total_elevadores,
+                    COUNT(DISTINCT r.id_cliente) as total_clientes,
+                    SUM(r.soma_elevacao)::numeric / NULLIF(SUM(r.qtd_elevacao), 0) as elevacao_media
+                FROM (SELECT DISTINCT estado FROM endereco) e
+                JOIN estado est ON e.estado = est.sigla
+                LEFT JOIN relatorio_vendas r ON r.estado = e.estado
+                {where_clause}
+                GROUP BY e.estado, est.nome
+                ORDER BY total_elevadores DESC
+            """
+        else:
+            query = f"""
+                SELECT 
+                    e.estado,
+                    est.nome as estado_nome,
+                    COUNT(el.id) as total_elevadores,
+                    COUNT(DISTINCT c.id_cliente) as total_clientes,
+                    AVG(col.elevacao) as elevacao_media
+                FROM endereco e
+                JOIN estado est ON e.estado = est.sigla
+                LEFT JOIN cliente cli ON e.id_cliente = cli.id
+                LEFT JOIN contrato c ON cli.id = c.id_cliente
+                LEFT JOIN elevador el ON c.id = el.id_contrato
+                LEFT JOIN coluna col ON el.id = col.id_elevador
+                {where_clause}
+                GROUP BY e.estado, est.nome
+                ORDER BY total_elevadores DESC
+            """
         
         cursor.execute(query, params)
         
@@ -1611,6 +2345,7 @@ def get_vendas_por_estado():
         end_pg_connection(conn)
 
 @app.route('/api/relatorios/opcoes-filtros')
+@cache_referencia.em_cache('opcoes_filtros', depende_de=('contrato', 'cliente'))
 def get_opcoes_filtros():
     conn = get_db_connection()
     if not conn:
@@ -1651,6 +2386,7 @@ def get_opcoes_filtros():
         end_pg_connection(conn)
 
 @app.route('/api/relatorios/contratos-por-estado/<estado>')
+@listagem_condicional('elevador', 'contrato', 'cliente')
 def get_contratos_por_estado(estado):
     conn = get_db_connection()
     if not conn:
@@ -1666,15 +2402,11 @@ def get_contratos_por_estado(estado):
         params = [estado]
         
         if filtro_mes:
-            # Converter formato MM/YYYY para YYYY-MM
-            try:
-                mes_parts = filtro_mes.split('/')
-                if len(mes_parts) == 2:
-                    mes_formatado = f"{mes_parts[1]}-{mes_parts[0]}"
-                    where_conditions.append("TO_CHAR(c.data_venda, 'YYYY-MM') = %s")
-                    params.append(mes_formatado)
-            except:
-                pass  # Ignorar formato inválido
+            # Converter MM/YYYY em intervalo de datas (permite usar o índice de data_venda)
+            intervalo_mes = parse_month_range(filtro_mes)
+            if intervalo_mes:  # Ignorar formato inválido
+                where_conditions.append("c.data_venda >= %s AND c.data_venda < %s")
+                params.extend(intervalo_mes)
         
         where_clause = " AND ".join(where_conditions)
         
@@ -1736,6 +2468,7 @@ def get_contratos_por_estado(estado):
         end_pg_connection(conn)
 
 @app.route('/api/relatorios/vendas-temporais')
+@listagem_condicional('elevador', 'contrato', 'cliente', por_dia=True)
 def get_vendas_temporais():
     conn = get_db_connection()
     if not conn:
@@ -1749,68 +2482,88 @@ def get_vendas_temporais():
         intervalo = request.args.get('intervalo', 'mes')
         data_inicio = request.args.get('dataInicio')
         data_fim = request.args.get('dataFim')
+        rollup = usar_rollup_relatorios()
+        # Colunas de data e estado vêm do resumo ou das tabelas originais
+        coluna_data = 'r.data_venda' if rollup else 'c.data_venda'
+        coluna_estado = 'r.estado' if rollup else 'e.estado'
         
         # Construir condições WHERE
         where_conditions = []
         params = []
         
         if filtro_estado:
-            where_conditions.append("e.estado = %s")
+            where_conditions.append(f"{coluna_estado} = %s")
             params.append(filtro_estado)
         
         # Definir período baseado na seleção
         if periodo == 'personalizado' and data_inicio and data_fim:
-            where_conditions.append("c.data_venda BETWEEN %s AND %s")
+            where_conditions.append(f"{coluna_data} BETWEEN %s AND %s")
             params.extend([data_inicio, data_fim])
         elif periodo == 'ultimo-mes':
-            where_conditions.append("c.data_venda >= CURRENT_DATE - INTERVAL '1 month'")
+            where_conditions.append(f"{coluna_data} >= CURRENT_DATE - INTERVAL '1 month'")
         elif periodo == 'ultimos-3-meses':
-            where_conditions.append("c.data_venda >= CURRENT_DATE - INTERVAL '3 months'")
+            where_conditions.append(f"{coluna_data} >= CURRENT_DATE - INTERVAL '3 months'")
         elif periodo == 'ultimos-6-meses':
-            where_conditions.append("c.data_venda >= CURRENT_DATE - INTERVAL '6 months'")
+            where_conditions.append(f"{coluna_data} >= CURRENT_DATE - INTERVAL '6 months'")
         elif periodo == 'ultimo-ano':
-            where_conditions.append("c.data_venda >= CURRENT_DATE - INTERVAL '1 year'")
+            where_conditions.append(f"{coluna_data} >= CURRENT_DATE - INTERVAL '1 year'")
         
         # Adicionar condição para excluir datas nulas
-        where_conditions.append("c.data_venda IS NOT NULL")
+        where_conditions.append(f"{coluna_data} IS NOT NULL")
         
         # Determinar formato de agrupamento baseado no intervalo
         if intervalo == 'dia':
-            date_format = "DATE(c.data_venda)"
-            date_label = "TO_CHAR(c.data_venda, 'DD/MM/YYYY')"
+            date_format = f"DATE({coluna_data})"
+            date_label = f"TO_CHAR({coluna_data}, 'DD/MM/YYYY')"
         elif intervalo == 'semana':
-            date_format = "DATE_TRUNC('week', c.data_venda)"
-            date_label = "'Semana ' || TO_CHAR(c.data_venda, 'WW/YYYY')"
+            date_format = f"DATE_TRUNC('week', {coluna_data})"
+            date_label = f"'Semana ' || TO_CHAR({coluna_data}, 'WW/YYYY')"
         elif intervalo == 'trimestre':
-            date_format = "DATE_TRUNC('quarter', c.data_venda)"
-            date_label = "TO_CHAR(c.data_venda, 'Q') || 'º Tri/' || TO_CHAR(c.data_venda, 'YYYY')"
+            date_format = f"DATE_TRUNC('quarter', {coluna_data})"
+            date_label = f"TO_CHAR({coluna_data}, 'Q') || 'º Tri/' || TO_CHAR({coluna_data}, 'YYYY')"
         elif intervalo == 'ano':
-            date_format = "DATE_TRUNC('year', c.data_venda)"
-            date_label = "TO_CHAR(c.data_venda, 'YYYY')"
+            date_format = f"DATE_TRUNC('year', {coluna_data})"
+            date_label = f"TO_CHAR({coluna_data}, 'YYYY')"
         else:  # mes
-            date_format = "DATE_TRUNC('month', c.data_venda)"
-            date_label = "TO_CHAR(c.data_venda, 'MM/YYYY')"
+            date_format = f"DATE_TRUNC('month', {coluna_data})"
+            date_label = f"TO_CHAR({coluna_data}, 'MM/YYYY')"
         
         where_clause = ""
         if where_conditions:
             where_clause = "WHERE " + " AND ".join(where_conditions)
         
-        query = f"""
-            SELECT 
-                {date_format} as periodo,
-                {date_label} as periodo_label,
-                COUNT(el.id) as total_elevadores,
-                COUNT(DISTINCT c.id_cliente) as total_clientes,
-                COUNT(DISTINCT c.id) as total_contratos,
-                AVG(el.elevacao) as elevacao_media
-            FROM contrato c
-            JOIN cliente cl ON c.id_cliente = cl.id
-            JOIN endereco e ON cl.id = e.id_cliente
-            LEFT JOIN elevador el ON c.id = el.id_contrato
-            {where_clause}
-            GROUP BY {date_format}, {date_label}
-            ORDER BY periodo ASC
-        """
+        if rollup:
+            query = f"""
+                SELECT 
+                    {date_format} as periodo,
+                    {date_label} as periodo_label,
+                    COALESCE(SUM(r.total_elevadores), 0) as total_elevadores,
+                    COUNT(DISTINCT r.id_cliente) as total_clientes,
+                    COUNT(DISTINCT r.id_contrato) as total_contratos,
+                    SUM(r.soma_elevacao)::numeric / NULLIF(SUM(r.qtd_elevacao), 0) as elevacao_media
+                FROM relatorio_vendas r
+                {where_clause}
+                GROUP BY {date_format}, {date_label}
+                ORDER BY periodo ASC
+            """
+        else:
+            query = f"""
+                SELECT 
+                    {date_format} as periodo,
+                    {date_label} as periodo_label,
+                    COUNT(el.id) as total_elevadores,
+                    COUNT(DISTINCT c.id_cliente) as total_clientes,
+                    COUNT(DISTINCT c.id) as total_contratos,
+                    AVG(col.elevacao) as elevacao_media
+                FROM contrato c
+                JOIN cliente cl ON c.id_cliente = cl.id
+                JOIN endereco e ON cl.id = e.id_cliente
+                LEFT JOIN elevador el ON c.id = el.id_contrato
+                LEFT JOIN coluna col ON el.id = col.id_elevador
+                {where_clause}
+                GROUP BY {date_format}, {date_label}
+                ORDER BY periodo ASC
+            """
         
         cursor.execute(query, params)
         
@@ -1832,6 +2585,36 @@ def get_vendas_temporais():
         cursor.close()
         end_pg_connection(conn)
 
+def elevadores_alterados_desde(cursor, since):
+    """Ids dos elevadores cujo evento no calendário mudou desde o token (versao >= since).
+    
+    Considera as tabelas que compõem o evento: elevador, cabine, coluna, adicionais,
+    contrato, cliente e endereço. Cada parte usa o índice em versao.
+    """
+    cursor.execute("""
+        SELECT id FROM elevador WHERE versao >= %s
+        UNION SELECT id_elevador FROM cabine WHERE versao >= %s
+        UNION SELECT id_elevador FROM coluna WHERE versao >= %s
+        UNION SELECT id_elevador FROM adicionais WHERE versao >= %s
+        UNION SELECT e.id FROM contrato c
+              JOIN elevador e ON e.id_contrato = c.id
+              WHERE c.versao >= %s
+        UNION SELECT e.id FROM cliente cl
+              JOIN contrato c ON c.id_cliente = cl.id
+              JOIN elevador e ON e.id_contrato = c.id
+              WHERE cl.versao >= %s
+        UNION SELECT e.id FROM endereco en
+              JOIN contrato c ON c.id_cliente = en.id_cliente
+              JOIN elevador e ON e.id_contrato = c.id
+              WHERE en.versao >= %s
+    """, [since] * 7)
+    return {row[0] for row in cursor.fetchall()}
+
+def removidos_desde(cursor, since):
+    """Ids dos elevadores excluídos desde o token"""
+    cursor.execute("SELECT id_elevador FROM elevador_removido WHERE versao >= %s", (since,))
+    return [row[0] for row in cursor.fetchall()]
+
 @app.route('/api/calendario')
 def get_calendario_data():
     conn = get_db_connection()
@@ -1840,7 +2623,42 @@ def get_calendario_data():
     
     cursor = conn.cursor()
     try:
-        cursor.execute("""
+        # Janela visível enviada pelo FullCalendar (start inclusivo, end exclusivo).
+        # Aceita datas ISO com horário/fuso (ex.: 2025-06-29T00:00:00-03:00); usa só a data.
+        where_conditions = ["c.data_entrega IS NOT NULL"]
+        params = []
+        try:
+            inicio = request.args.get('start')
+            fim = request.args.get('end')
+            if inicio:
+                where_conditions.append("c.data_entrega >= %s")
+                params.append(parse_date_safe(inicio[:10]))
+            if fim:
+                where_conditions.append("c.data_entrega < %s")
+                params.append(parse_date_safe(fim[:10]))
+            since = request.args.get('since')
+            if since is not None:
+                since = int(since)
+        except ValueError:
+            return jsonify({'error': 'Parâmetros de data ou token inválidos'}), 400
+        
+        # Token da próxima sincronização: lido antes dos dados, então o que for
+        # confirmado durante a consulta é reenviado na próxima vez, nunca perdido
+        cursor.execute("SELECT txid_snapshot_xmin(txid_current_snapshot())")
+        token = cursor.fetchone()[0]
+        
+        # Sincronização incremental: só elevadores alterados desde o token
+        alterados = None
+        if since is not None:
+            alterados = elevadores_alterados_desde(cursor, since)
+            if not alterados:
+                response = jsonify({'eventos': [], 'removidos': removidos_desde(cursor, since)})
+                response.headers['X-Sync-Token'] = str(token)
+                return response
+            where_conditions.append("e.id = ANY(%s)")
+            params.append(list(alterados))
+        
+        cursor.execute(f"""
             SELECT e.id, e.cor, e.status, e.comando, e.porta_inferior, e.porta_superior, e.observacao,
                    col.elevacao,
                    c.id as contrato_id, c.data_entrega, c.data_venda, c.vendedor,
@@ -1862,7 +2680,7 @@ def get_calendario_data():
                        )
                        FROM adicionais
                        WHERE id_elevador = e.id),
-                       '{}'::json
+                       '{{}}'::json
                    ) as itens_adicionais
             FROM elevador e
             JOIN contrato c ON e.id_contrato = c.id
@@ -1870,9 +2688,9 @@ def get_calendario_data():
             LEFT JOIN cabine cab ON e.id = cab.id_elevador
             LEFT JOIN coluna col ON e.id = col.id_elevador
             LEFT JOIN endereco en ON cl.id = en.id_cliente
-            WHERE c.data_entrega IS NOT NULL
+            WHERE {' AND '.join(where_conditions)}
             ORDER BY c.data_entrega
-        """)
+        """, params)
         eventos = []
         for row in cursor.fetchall():
             # Formatação do título com quebras de linha: #ID, Nome cliente, Cidade/Estado
@@ -1915,18 +2733,15 @@ def get_calendario_data():
             else:
                 cor_evento = row[1] or '#007bff'  # Usar cor do elevador como fallback
             
-            # Garantir que a data seja formatada corretamente
+            # Pular se não há data de entrega (a data sai em ISO pelo provedor JSON)
             data_entrega = row[9]
-            if data_entrega:
-                # Converter para string no formato ISO (YYYY-MM-DD)
-                data_iso = data_entrega.strftime('%Y-%m-%d')
-            else:
-                continue  # Pular se não há data de entrega
+            if not data_entrega:
+                continue
             
             eventos.append({
                 'id': row[0],
                 'title': titulo,
-                'start': data_iso,
+                'start': data_entrega,
                 'allDay': True,  # Eventos de dia inteiro
                 'color': cor_evento,
                 'extendedProps': {
@@ -1942,7 +2757,7 @@ def get_calendario_data():
                     
                     # Dados do contrato
                     'contrato_id': row[8],
-                    'data_venda': row[10].strftime('%Y-%m-%d') if row[10] else None,
+                    'data_venda': row[10],
                     'vendedor': row[11],
                     
                     # Dados do cliente
@@ -1971,7 +2786,48 @@ def get_calendario_data():
                     'itens_adicionais': row[26] if row[26] else []
                 }
             })
-        return jsonify(eventos)
+        
+        if alterados is None:
+            response = jsonify(eventos)
+        else:
+            # Alterados que saíram da janela (ou perderam a data de entrega) também
+            # são removidos no cliente, junto com os elevadores excluídos
+            presentes = {evento['id'] for evento in eventos}
+            removidos = set(removidos_desde(cursor, since)) | (alterados - presentes)
+            response = jsonify({'eventos': eventos, 'removidos': sorted(removidos)})
+        response.headers['X-Sync-Token'] = str(token)
+        return response
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+    finally:
+        cursor.close()
+        end_pg_connection(conn)
+
+@app.route('/api/calendario/estatisticas')
+def get_calendario_estatisticas():
+    """Totais do painel do calendário, independentes da janela de datas exibida"""
+    conn = get_db_connection()
+    if not conn:
+        return jsonify({'error': 'Erro na conexão com o banco'}), 500
+    
+    cursor = conn.cursor()
+    try:
+        cursor.execute("""
+            SELECT COUNT(*),
+                   COUNT(*) FILTER (WHERE c.data_entrega >= DATE_TRUNC('month', CURRENT_DATE)
+                                      AND c.data_entrega < DATE_TRUNC('month', CURRENT_DATE) + INTERVAL '1 month'),
+                   COUNT(*) FILTER (WHERE c.data_entrega > CURRENT_DATE)
+            FROM elevador e
+            JOIN contrato c ON e.id_contrato = c.id
+            JOIN cliente cl ON c.id_cliente = cl.id
+            WHERE c.data_entrega IS NOT NULL
+        """)
+        row = cursor.fetchone()
+        return jsonify({
+            'total_elevadores': row[0],
+            'entregas_mes': row[1],
+            'entregas_pendentes': row[2]
+        })
     except Exception as e:
         return jsonify({'error': str(e)}), 500
     finally:
@@ -2059,9 +2915,19 @@ def atualizar_sistema():
         arquivos_backup = [
             'app.py',
             'postgre.py', 
+            'pdf_elevador.py',
+            'servidor_wsgi.py',
+            'registro_log.py',
+            'metricas.py',
+            'consultas_lentas.py',
+            'json_rapido.py',
+            'compressao.py',
+            'estaticos.py',
+            'pacotes_js.py',
             'requirements.txt',
             'templates',
             'static',
+            'migrations',
             'version.txt'
         ]
         
@@ -2104,8 +2970,18 @@ def atualizar_sistema():
                 # Arquivos que devem ser atualizados
                 arquivos_atualizar = [
                     'app.py',
+                    'pdf_elevador.py',
+                    'servidor_wsgi.py',
+                    'registro_log.py',
+                    'metricas.py',
+                    'consultas_lentas.py',
+                    'json_rapido.py',
+                    'compressao.py',
+                    'estaticos.py',
+                    'pacotes_js.py',
                     'templates',
                     'static',
+                    'migrations',
                     'requirements.txt'
                 ]
                 
@@ -2125,6 +3001,9 @@ def atualizar_sistema():
                         else:
                             shutil.copy2(source_path, item)
         
+        # static/ foi substituída: pacotes JS, cópias com hash, manifesto e variantes comprimidas novos
+        construir_estaticos()
+        
         # Atualizar version.txt
         with open('version.txt', 'w') as f:
             f.write(nova_versao)
@@ -2138,6 +3017,7 @@ def atualizar_sistema():
         def restart_server():
             import time
             time.sleep(2)  # Aguardar resposta ser enviada
+            encerrar_logging()
             os._exit(0)  # Força reinicialização
         
         threading.Timer(1, restart_server).start()
@@ -2195,6 +3075,11 @@ if __name__ == '__main__':
         
         sys.exit(0)
     
+    # --build-static: regenera pacotes JS, cópias com hash e variantes comprimidas antes de
+    # subir o servidor (ex.: depois de editar static/ sem rodar o setup.py)
+    if '--build-static' in sys.argv:
+        construir_estaticos()
+    
     # Verificar se deve abrir navegador automaticamente
     # Se foi iniciado com argumento --no-browser, não abre
     auto_open_browser = '--no-browser' not in sys.argv
@@ -2203,19 +3088,30 @@ if __name__ == '__main__':
     if auto_open_browser:
         threading.Timer(1, open_browser).start()
     
+    # --producao: servidor WSGI (waitress/gunicorn, ver servidor_wsgi.py), debug desligado
+    # e sem auto-desligamento por inatividade
+    modo_producao = '--producao' in sys.argv
+    
     # Iniciar thread de monitoramento de atividade
-    monitor_thread = threading.Thread(target=monitor_activity, daemon=True)
-    monitor_thread.start()
+    if not modo_producao:
+        monitor_thread = threading.Thread(target=monitor_activity, daemon=True)
+        monitor_thread.start()
     
     print("🏢 Sistema de Gerenciamento de Elevadores")
     print("="*50)
     print("🚀 Iniciando servidor...")
     print("🌐 Acesse: http://localhost:5000")
     print("⏹️  Pressione Ctrl+C para parar o servidor")
-    print("🔄 Auto-desligamento: 3 minutos sem atividade")
+    if not modo_producao:
+        print("🔄 Auto-desligamento: 3 minutos sem atividade")
     print("="*50)
     
     try:
-        app.run(debug=True, host='0.0.0.0', port=5000, use_reloader=False)
+        from servidor_wsgi import servir, servidor_da_linha_de_comando
+        if modo_producao:
+            servir(app, host='0.0.0.0', port=PORT, servidor=servidor_da_linha_de_comando())
+        else:
+            # Uso local: servidor de desenvolvimento só em 127.0.0.1 e sem o depurador do Werkzeug
+            servir(app, host='127.0.0.1', port=PORT, servidor='desenvolvimento')
     except KeyboardInterrupt:
         signal_handler(signal.SIGINT, None)
@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Benchmark da criação de elevadores: POST /api/elevadores um a um contra
+POST /api/elevadores/bulk (precisa do banco configurado no .env).
+
+Cria um cliente temporário (com endereço) e um contrato vazio para cada medição,
+insere os elevadores pelas duas rotas (pelo cliente de teste do Flask, com commit de
+verdade) e no final apaga os elevadores, os contratos e o cliente.
+
+    python benchmark_bulk.py [quantidades...]     # padrão: 1000 10000
+"""
+import sys
+import os
+import time
+
+# Adicionar o diretório atual ao path para importar app e postgre
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from postgre import create_pg_connection, end_pg_connection
+
+ELEVADOR_EXEMPLO = {
+    'comando': 'Botoeira',
+    'porta_inferior': 'Automática',
+    'porta_superior': 'Eixo Vert',
+    'cor': 'Branco',
+    'cabine': {'altura': 2100, 'largura': 1100, 'profundidade': 1400, 'piso': 'Antiderr', 'montada': False},
+    'coluna': {'elevacao': 3500, 'montada': False},
+    'adicionais': {'cancela': 1, 'portao': 2, 'nobreak': 1, 'galvanizada': True},
+}
+
+def executar(sql, params=()):
+    conn = create_pg_connection()
+    if not conn:
+        sys.exit("❌ Sem conexão com o banco (verifique o .env)")
+    cursor = conn.cursor()
+    cursor.execute(sql, params)
+    resultado = cursor.fetchone() if cursor.description else None
+    cursor.close()
+    end_pg_connection(conn)
+    return resultado
+
+def criar_cliente_temporario():
+    cliente_id = executar("""
+        INSERT INTO cliente (nome, comercial, documento, email)
+        VALUES ('Benchmark criação em lote', false, NULL, NULL) RETURNING id
+    """)[0]
+    # Com endereço, o resumo dos relatórios (relatorio_vendas) é recalculado como em produção
+    executar("INSERT INTO endereco (id_cliente, cidade, estado) VALUES (%s, 'Recife', 'PE')", (cliente_id,))
+    return cliente_id
+
+def criar_contrato(cliente_id):
+    return executar("INSERT INTO contrato (data_venda, id_cliente) VALUES (CURRENT_DATE, %s) RETURNING id",
+                    (cliente_id,))[0]
+
+def remover_cliente(cliente_id):
+    # elevador -> contrato é ON DELETE SET NULL: os elevadores saem antes do cliente
+    executar("""
+        DELETE FROM elevador WHERE id_contrato IN (SELECT id FROM contrato WHERE id_cliente = %s);
+        DELETE FROM relatorio_vendas WHERE id_cliente = %s;
+        DELETE FROM cliente WHERE id = %s;
+    """, (cliente_id, cliente_id, cliente_id))
+
+def medir(descricao, funcao, quantidade):
+    duracao = funcao(quantidade)
+    print(f"{descricao:<34} {quantidade:>6} elevadores  {duracao:8.2f} s  {quantidade / duracao:9.0f} elevadores/s")
+    return duracao
+
+def main():
+    quantidades = [int(q) for q in sys.argv[1:]] or [1000, 10000]
+
+    from app import app
+    cliente = app.test_client()
+    cliente_id = criar_cliente_temporario()
+
+    # Cada medição usa um contrato novo: as duas rotas partem de um contrato vazio
+    def um_a_um(quantidade):
+        elevador = {**ELEVADOR_EXEMPLO, 'id_contrato': criar_contrato(cliente_id)}
+        inicio = time.perf_counter()
+        for _ in range(quantidade):
+            response = cliente.post('/api/elevadores', json=elevador)
+            assert response.status_code == 200, response.get_json()
+        return time.perf_counter() - inicio
+
+    def em_lote(quantidade):
+        elevador = {**ELEVADOR_EXEMPLO, 'id_contrato': criar_contrato(cliente_id), 'quantidade': quantidade}
+        inicio = time.perf_counter()
+        response = cliente.post('/api/elevadores/bulk', json={'elevadores': [elevador]})
+        assert response.status_code == 200, response.get_json()
+        assert len(response.get_json()['ids']) == quantidade
+        return time.perf_counter() - inicio
+
+    try:
+        print(f"🧪 Criando elevadores para o cliente temporário {cliente_id}...")
+        for quantidade in quantidades:
+            antes = medir("POST /api/elevadores (um a um)", um_a_um, quantidade)
+            depois = medir("POST /api/elevadores/bulk", em_lote, quantidade)
+            print(f"✅ Ganho com {quantidade}: {antes / depois:.1f}x\n")
+    finally:
+        remover_cliente(cliente_id)
+        print("🧹 Cliente, contratos e elevadores temporários removidos")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark da serialização JSON das listagens (não precisa de banco).
+
+Serializa 10 mil elevadores no formato de /api/elevadores com:
+    - o provedor padrão do Flask, convertendo as datas com isoformat() antes (como era)
+    - ProvedorJsonRapido sem orjson (biblioteca padrão)
+    - ProvedorJsonRapido com orjson, datas nativas
+
+    python benchmark_json.py [quantidade] [repeticoes]
+"""
+import sys
+import os
+import time
+from datetime import date, timedelta
+from decimal import Decimal
+
+# Adicionar o diretório atual ao path para importar json_rapido
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from flask import Flask
+from flask.json.provider import DefaultJSONProvider
+import json_rapido
+from json_rapido import ProvedorJsonRapido
+
+def criar_elevadores(quantidade):
+    """Elevadores no mesmo formato de get_elevadores (app.py)"""
+    inicio = date(2025, 1, 1)
+    elevadores = []
+    for i in range(1, quantidade + 1):
+        elevadores.append({
+            'id': i,
+            'id_contrato': i // 3 + 1,
+            'comando': 'Botoeira',
+            'observacao': 'Instalar com cuidado' if i % 4 == 0 else None,
+            'porta_inferior': 'Automática',
+            'porta_superior': 'Eixo Vertical',
+            'cor': 'Branco',
+            'status': 'Em produção',
+            'cabine': {
+                'altura': Decimal('2.10'),
+                'largura': Decimal('1.10'),
+                'profundidade': Decimal('1.40'),
+                'piso': 'Antiderrapante',
+                'montada': i % 2 == 0,
+                'lado_entrada': 'frente',
+                'lado_saida': 'tras',
+                'descricao': '2.10x1.10x1.40'
+            },
+            'coluna': {'elevacao': Decimal('3.50'), 'montada': False},
+            'adicionais': {
+                'cancela': 1, 'porta': 0, 'portao': 2, 'barreira_eletronica': 0,
+                'lados_enclausuramento': 3, 'sensor_esmagamento': 1, 'rampa_acesso': 0,
+                'nobreak': 1, 'galvanizada': True
+            },
+            'cliente_nome': f'Cliente {i % 500}',
+            'data_entrega': inicio + timedelta(days=i % 365),
+            'cabine_descricao': '2.10x1.10x1.40',
+            'elevacao': Decimal('3.50')
+        })
+    return elevadores
+
+def converter_datas(elevadores):
+    """O que get_elevadores fazia antes: isoformat() em cada linha"""
+    return [{**e, 'data_entrega': e['data_entrega'].isoformat() if e['data_entrega'] else None}
+            for e in elevadores]
+
+def medir(descricao, funcao, repeticoes):
+    funcao()  # aquecimento
+    inicio = time.perf_counter()
+    for _ in range(repeticoes):
+        tamanho = len(funcao().get_data())
+    duracao = (time.perf_counter() - inicio) / repeticoes
+    print(f"{descricao:<48} {duracao * 1000:8.1f} ms  ({tamanho / 1024:.0f} KB)")
+    return duracao
+
+def main():
+    quantidade = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    repeticoes = int(sys.argv[2]) if len(sys.argv) > 2 else 10
+    elevadores = criar_elevadores(quantidade)
+    app = Flask(__name__)
+
+    print(f"🧪 Serializando {quantidade} elevadores ({repeticoes} repetições)...")
+    with app.app_context():
+        padrao = DefaultJSONProvider(app)
+        antes = medir("Flask padrão + isoformat() nas rotas (antes)",
+                      lambda: padrao.response(converter_datas(elevadores)), repeticoes)
+
+        rapido = ProvedorJsonRapido(app)
+        orjson = json_rapido.orjson
+        json_rapido.orjson = None
+        medir("ProvedorJsonRapido, biblioteca padrão",
+              lambda: rapido.response(elevadores), repeticoes)
+        json_rapido.orjson = orjson
+
+        if orjson is None:
+            print("⚠️  orjson não instalado: pip install -r requirements.txt")
+            return
+        depois = medir("ProvedorJsonRapido com orjson (depois)",
+                       lambda: rapido.response(elevadores), repeticoes)
+
+    print(f"✅ Ganho: {antes / depois:.1f}x")
+
+if __name__ == '__main__':
+    main()
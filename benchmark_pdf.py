@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark da ficha do elevador em PDF (não precisa de banco).
+
+Compara fichas/segundo montando o modelo a cada PDF (como era antes: estilos,
+TableStyles e logo refeitos em toda chamada) com o modelo reaproveitado do processo.
+
+    python benchmark_pdf.py [quantidade]
+"""
+import sys
+import os
+import time
+from datetime import date
+
+# Adicionar o diretório atual ao path para importar pdf_elevador
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from pdf_elevador import ModeloFichaPdf, renderizar_pdf_elevador
+
+LOGO_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'static', 'images', 'home-escrito.png')
+
+# Linha no formato de PDF_ELEVADOR_SQL (app.py)
+LINHA_EXEMPLO = (
+    1, 'Botoeira', 'Instalar com cuidado', 'Automática', 'Eixo Vertical', 'Branco',
+    1234, date(2025, 1, 10), date(2025, 3, 20), 'Pendente', 'Cliente Exemplo', None,
+    '2.10', '1.10', '1.40', 'Antiderrapante', True, 'frente', 'tras',
+    '3.50', False, 1, 0, 2, 0, 3, 1, 0, 1, True,
+    'Rua das Flores', '123', 'Sala 2', 'Recife', 'PE', '51020-000', None,
+)
+
+def medir(descricao, renderizar, quantidade):
+    renderizar()  # aquecimento: imports e caches do ReportLab
+    inicio = time.perf_counter()
+    for _ in range(quantidade):
+        renderizar()
+    duracao = time.perf_counter() - inicio
+    por_segundo = quantidade / duracao
+    print(f"{descricao:<40} {por_segundo:8.1f} fichas/s  ({duracao / quantidade * 1000:.1f} ms por ficha)")
+    return por_segundo
+
+def main():
+    quantidade = int(sys.argv[1]) if len(sys.argv) > 1 else 50
+    print(f"🧪 Renderizando {quantidade} fichas por cenário...")
+
+    antes = medir("Modelo montado a cada ficha (antes)",
+                  lambda: ModeloFichaPdf(LOGO_PATH).renderizar(LINHA_EXEMPLO), quantidade)
+    depois = medir("Modelo reaproveitado (depois)",
+                   lambda: renderizar_pdf_elevador(LINHA_EXEMPLO, LOGO_PATH), quantidade)
+
+    print(f"✅ Ganho: {depois / antes:.1f}x")
+
+if __name__ == '__main__':
+    main()
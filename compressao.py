@@ -0,0 +1,169 @@
+"""
+Compressão das respostas (extensão Flask).
+
+    - Respostas dinâmicas (JSON, HTML...) acima de ``tamanho_minimo`` são comprimidas
+      com brotli (se o pacote estiver instalado) ou gzip, conforme o Accept-Encoding.
+    - Arquivos de static/ são servidos pelas variantes pré-comprimidas .br/.gz ao lado
+      do original, quando existem e têm o mesmo mtime dele (a variante recebe o mtime
+      do original ao ser gerada; se o original mudar, ela é ignorada). As variantes
+      são geradas por ``precomprimir_estaticos`` (setup.py, atualizações do sistema ou
+      ``python compressao.py``).
+
+Respostas em streaming (SSE, ZIP), já codificadas ou de tipos fora da lista
+(imagens, PDF) passam sem alteração.
+"""
+import os
+import sys
+import gzip
+import logging
+import tempfile
+import mimetypes
+
+from flask import request, send_from_directory
+from werkzeug.utils import safe_join
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+TIPOS_COMPRIMIVEIS = {
+    'application/json',
+    'application/javascript',
+    'text/javascript',
+    'text/html',
+    'text/css',
+    'text/plain',
+    'text/csv',
+    'image/svg+xml',
+}
+
+# Extensões em static/ que ganham variantes pré-comprimidas
+EXTENSOES_ESTATICAS = ('.js', '.css', '.html', '.svg', '.json', '.txt', '.map')
+
+SUFIXOS = {'br': '.br', 'gzip': '.gz'}
+
+def codificacoes_disponiveis():
+    return ['br', 'gzip'] if brotli is not None else ['gzip']
+
+def comprimir(dados, codificacao, nivel):
+    if codificacao == 'br':
+        return brotli.compress(dados, quality=nivel)
+    return gzip.compress(dados, compresslevel=nivel, mtime=0)
+
+class Compressao:
+    """Extensão Flask de compressão: ``Compressao(app)`` ou ``init_app(app)``"""
+
+    def __init__(self, app=None, tamanho_minimo=1024, nivel_gzip=6, nivel_brotli=4):
+        self.tamanho_minimo = tamanho_minimo
+        self.niveis = {'gzip': nivel_gzip, 'br': nivel_brotli}
+        self.app = None
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        self.app = app
+        app.after_request(self._comprimir_resposta)
+        # A rota static passa a escolher a variante pré-comprimida
+        app.view_functions['static'] = self._servir_estatico
+        app.extensions['compressao'] = self
+
+    def _escolher_codificacao(self):
+        return request.accept_encodings.best_match(codificacoes_disponiveis())
+
+    def _comprimir_resposta(self, response):
+        if (response.status_code != 200
+                or response.is_streamed
+                or response.direct_passthrough
+                or 'Content-Encoding' in response.headers
+                or response.mimetype not in TIPOS_COMPRIMIVEIS):
+            return response
+        response.vary.add('Accept-Encoding')
+        dados = response.get_data()
+        if len(dados) < self.tamanho_minimo:
+            return response
+        codificacao = self._escolher_codificacao()
+        if not codificacao:
+            return response
+
+        response.set_data(comprimir(dados, codificacao, self.niveis[codificacao]))
+        response.headers['Content-Encoding'] = codificacao
+        # O ETag identifica o conteúdo, não os bytes comprimidos: vira fraco
+        etag, fraco = response.get_etag()
+        if etag and not fraco:
+            response.set_etag(etag, weak=True)
+        return response
+
+    def _servir_estatico(self, filename):
+        pasta = self.app.static_folder
+        caminho = safe_join(pasta, filename)
+        if filename.endswith(EXTENSOES_ESTATICAS) and caminho and os.path.isfile(caminho):
+            for opcao in codificacoes_disponiveis():
+                if not request.accept_encodings[opcao]:
+                    continue
+                variante = caminho + SUFIXOS[opcao]
+                if _variante_atual(caminho, variante):
+                    response = send_from_directory(
+                        pasta, filename + SUFIXOS[opcao],
+                        mimetype=mimetypes.guess_type(filename)[0],
+                        max_age=self.app.get_send_file_max_age(filename))
+                    response.headers['Content-Encoding'] = opcao
+                    response.vary.add('Accept-Encoding')
+                    return response
+        response = self.app.send_static_file(filename)
+        if filename.endswith(EXTENSOES_ESTATICAS):
+            response.vary.add('Accept-Encoding')
+        return response
+
+def _variante_atual(caminho, variante):
+    # Compara igualdade, não "mais nova": a atualização do sistema copia arquivos
+    # preservando o mtime do pacote, que pode ser mais antigo que a variante
+    try:
+        return os.path.getmtime(variante) == os.path.getmtime(caminho)
+    except OSError:
+        return False
+
+def precomprimir_estaticos(pasta, tamanho_minimo=1024):
+    """Gera/atualiza as variantes .gz e .br dos arquivos de ``pasta``; retorna quantas gravou"""
+    gravados = 0
+    for raiz, _, arquivos in os.walk(pasta):
+        for nome in arquivos:
+            if not nome.endswith(EXTENSOES_ESTATICAS):
+                continue
+            caminho = os.path.join(raiz, nome)
+            try:
+                gravados += _precomprimir_arquivo(caminho, tamanho_minimo)
+            except OSError as e:
+                logging.warning(f"Não foi possível pré-comprimir {caminho}: {e}")
+    return gravados
+
+def _precomprimir_arquivo(caminho, tamanho_minimo):
+    gravados = 0
+    dados = None
+    for codificacao in codificacoes_disponiveis():
+        variante = caminho + SUFIXOS[codificacao]
+        if _variante_atual(caminho, variante):
+            continue
+        if dados is None:
+            mtime = os.path.getmtime(caminho)
+            with open(caminho, 'rb') as f:
+                dados = f.read()
+        if len(dados) < tamanho_minimo:
+            break
+        nivel = 11 if codificacao == 'br' else 9  # feito uma vez: nível máximo
+        comprimido = comprimir(dados, codificacao, nivel)
+        if len(comprimido) >= len(dados):
+            continue
+        # Temporário único: o app e ``python compressao.py`` podem rodar ao mesmo tempo
+        descritor, temporario = tempfile.mkstemp(dir=os.path.dirname(caminho), suffix='.tmp')
+        with os.fdopen(descritor, 'wb') as f:
+            f.write(comprimido)
+        os.utime(temporario, (mtime, mtime))
+        os.replace(temporario, variante)
+        gravados += 1
+    return gravados
+
+if __name__ == '__main__':
+    pasta = sys.argv[1] if len(sys.argv) > 1 else os.path.join(os.path.dirname(os.path.abspath(__file__)), 'static')
+    logging.basicConfig(level=logging.INFO)
+    print(f"🗜️  {precomprimir_estaticos(pasta)} variantes geradas em {pasta}")
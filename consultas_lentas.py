@@ -0,0 +1,141 @@
+"""
+Log de consultas lentas.
+
+Todo comando que passa pelos cursores de get_db_connection() (CursorMedido, em
+metricas.py) é medido; os que passam de ``limite_ms`` vão para o log com o SQL
+normalizado, o formato dos parâmetros (tipos, nunca os valores), a duração e o
+endpoint. Com ``explain`` ligado, o plano (EXPLAIN ANALYZE, BUFFERS) é capturado
+numa thread separada, numa conexão própria e em transação somente leitura
+desfeita no final, então a requisição lenta não espera por ele. O plano pode
+conter os valores dos filtros; por isso o explain vem desligado por padrão.
+"""
+import re
+import time
+import queue
+import logging
+import threading
+
+from flask import has_request_context, request
+
+from postgre import create_pg_connection
+
+_LITERAL_TEXTO = re.compile(r"'(?:[^']|'')*'")
+_LITERAL_NUMERO = re.compile(r"(?<![\w$.])\d+(?:\.\d+)?\b")
+_ESPACOS = re.compile(r'\s+')
+_SOMENTE_LEITURA = re.compile(r'^\s*(select|with)\b', re.IGNORECASE)
+
+def texto_sql(query, cursor=None):
+    """SQL como str, seja ele str, bytes ou psycopg2.sql.Composed"""
+    if isinstance(query, bytes):
+        return query.decode('utf-8', 'replace')
+    if not isinstance(query, str) and hasattr(query, 'as_string') and cursor is not None:
+        return query.as_string(cursor)
+    return str(query)
+
+def normalizar_sql(sql):
+    """Troca literais por ? e compacta espaços: consultas iguais geram o mesmo texto"""
+    sql = _LITERAL_TEXTO.sub('?', sql)
+    sql = _LITERAL_NUMERO.sub('?', sql)
+    return _ESPACOS.sub(' ', sql).strip()
+
+def formato_parametros(parametros):
+    """Descreve os parâmetros só pelo tipo (ex.: ['int', 'str', 'list[3]'])"""
+    def tipo(valor):
+        if isinstance(valor, (list, tuple)):
+            return f'{type(valor).__name__}[{len(valor)}]'
+        return type(valor).__name__
+    if parametros is None:
+        return None
+    if isinstance(parametros, dict):
+        return {chave: tipo(valor) for chave, valor in parametros.items()}
+    return [tipo(valor) for valor in parametros]
+
+class MonitorConsultasLentas:
+    """Observador de SQL (ver MetricasRequisicao.observar_sql) que registra consultas lentas.
+
+    - ``limite_ms``: duração a partir da qual a consulta é registrada
+    - ``explain``: captura EXPLAIN (ANALYZE, BUFFERS) das consultas de leitura lentas
+    - ``intervalo_explain``: segundos até repetir o plano da mesma consulta normalizada
+    - ``max_fila``: planos aguardando captura; o excedente é descartado
+    """
+
+    def __init__(self, limite_ms=500, explain=False, intervalo_explain=600, max_fila=20, timeout_explain=30):
+        self.limite_ms = limite_ms
+        self.explain = explain
+        self.intervalo_explain = intervalo_explain
+        self.timeout_explain = timeout_explain
+        self._fila = queue.Queue(maxsize=max_fila)
+        self._ultimo_explain = {}
+        self._lock = threading.Lock()
+        self._thread = None
+
+    def observar(self, cursor, query, parametros, duracao):
+        duracao_ms = duracao * 1000
+        if duracao_ms < self.limite_ms:
+            return
+        sql = texto_sql(query, cursor)
+        normalizado = normalizar_sql(sql)
+        endpoint = request.endpoint if has_request_context() else None
+        logging.warning(f"Consulta lenta ({duracao_ms:.0f}ms) em {endpoint or '-'}: {normalizado[:200]}", extra={
+            'evento': 'consulta_lenta',
+            'sql': normalizado,
+            'parametros': formato_parametros(parametros),
+            'duracao_ms': round(duracao_ms, 1),
+            'linhas': cursor.rowcount,
+            'endpoint': endpoint
+        })
+        if self.explain and _SOMENTE_LEITURA.match(sql) and self._deve_explicar(normalizado):
+            self._iniciar()
+            try:
+                self._fila.put_nowait((sql, parametros, normalizado))
+            except queue.Full:
+                pass
+
+    def _deve_explicar(self, normalizado):
+        agora = time.monotonic()
+        with self._lock:
+            ultimo = self._ultimo_explain.get(normalizado)
+            if ultimo is not None and agora - ultimo < self.intervalo_explain:
+                return False
+            self._ultimo_explain[normalizado] = agora
+            return True
+
+    def _iniciar(self):
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._capturar_planos, name='explain-consultas-lentas',
+                                                daemon=True)
+                self._thread.start()
+
+    def _capturar_planos(self):
+        conn = None
+        while True:
+            sql, parametros, normalizado = self._fila.get()
+            try:
+                if conn is None or conn.closed:
+                    conn = create_pg_connection()
+                    if conn is None:
+                        continue
+                cursor = conn.cursor()
+                try:
+                    # ANALYZE executa a consulta de verdade: somente leitura e rollback no fim
+                    cursor.execute("SET TRANSACTION READ ONLY")
+                    cursor.execute("SET LOCAL statement_timeout = %s", (int(self.timeout_explain * 1000),))
+                    cursor.execute("EXPLAIN (ANALYZE, BUFFERS) " + sql, parametros)
+                    plano = '\n'.join(linha[0] for linha in cursor.fetchall())
+                finally:
+                    cursor.close()
+                    conn.rollback()
+                logging.info(f"Plano da consulta lenta: {normalizado[:200]}\n{plano}", extra={
+                    'evento': 'plano_consulta_lenta',
+                    'sql': normalizado,
+                    'plano': plano
+                })
+            except Exception as e:
+                logging.warning(f"Não foi possível capturar o plano da consulta lenta: {e}")
+                if conn is not None:
+                    try:
+                        conn.close()
+                    except Exception:
+                        pass
+                    conn = None
@@ -0,0 +1,141 @@
+"""
+Arquivos estáticos versionados pelo conteúdo (extensão Flask).
+
+``gerar_manifesto`` copia cada arquivo de static/ para um nome com o hash do
+conteúdo, ao lado do original (js/common.js -> js/common.3f9a1c2e7b4d.js), e grava
+static/manifesto.json com o mapeamento. Com a extensão ativa, o
+``url_for('static', filename='js/common.js')`` dos templates passa a gerar a URL
+da cópia com hash, servida com ``Cache-Control: public, max-age=31536000,
+immutable``: o navegador não revalida mais os arquivos e, quando um deles muda,
+a URL muda junto.
+
+    estaticos = EstaticosVersionados(app)
+    estaticos.atualizar()      # atualização do sistema (ao iniciar, só carregar())
+    python estaticos.py        # setup.py / atualizador
+
+Em modo debug as URLs continuam sem hash, para as edições aparecerem na hora.
+"""
+import os
+import re
+import sys
+import json
+import shutil
+import hashlib
+import logging
+import tempfile
+
+from flask import request
+
+MANIFESTO = 'manifesto.json'
+
+# Um ano, o máximo recomendado para Cache-Control
+MAX_AGE_IMUTAVEL = 31536000
+
+# Cópias com hash (nome.0123456789ab.ext) e variantes geradas por compressao.py
+_COM_HASH = re.compile(r'\.[0-9a-f]{12}\.[^.]+(\.gz|\.br)?$')
+_IGNORADOS = ('.gz', '.br', '.tmp', '.map')
+
+def _hash_arquivo(caminho):
+    sha = hashlib.sha256()
+    with open(caminho, 'rb') as f:
+        for bloco in iter(lambda: f.read(65536), b''):
+            sha.update(bloco)
+    return sha.hexdigest()[:12]
+
+def nome_com_hash(relativo, digest):
+    raiz, extensao = os.path.splitext(relativo)
+    return f'{raiz}.{digest}{extensao}'
+
+def gerar_manifesto(pasta):
+    """Cria as cópias com hash dos arquivos de ``pasta``, remove as obsoletas e grava o manifesto"""
+    manifesto = {}
+    existentes = set()
+    for raiz, _, arquivos in os.walk(pasta):
+        for nome in arquivos:
+            relativo = os.path.relpath(os.path.join(raiz, nome), pasta).replace(os.sep, '/')
+            if _COM_HASH.search(nome):
+                existentes.add(relativo)
+                continue
+            if nome == MANIFESTO or nome.endswith(_IGNORADOS):
+                continue
+            caminho = os.path.join(raiz, nome)
+            versionado = nome_com_hash(relativo, _hash_arquivo(caminho))
+            destino = os.path.join(pasta, versionado)
+            if not os.path.isfile(destino):
+                # copy2 mantém o mtime: as variantes .gz/.br do original servem de referência
+                shutil.copy2(caminho, destino)
+            manifesto[relativo] = versionado
+
+    # Versões anteriores (e suas variantes comprimidas) saem da pasta
+    atuais = set(manifesto.values())
+    for relativo in existentes:
+        base = relativo[:-3] if relativo.endswith(('.gz', '.br')) else relativo
+        if base in atuais:
+            continue
+        try:
+            os.remove(os.path.join(pasta, relativo))
+        except OSError as e:
+            logging.warning(f"Não foi possível remover {relativo}: {e}")
+
+    descritor, temporario = tempfile.mkstemp(dir=pasta, suffix='.tmp')
+    with os.fdopen(descritor, 'w', encoding='utf-8') as f:
+        json.dump(manifesto, f, indent=2, sort_keys=True)
+    os.replace(temporario, os.path.join(pasta, MANIFESTO))
+    return manifesto
+
+class EstaticosVersionados:
+    """Extensão Flask: URLs de static/ com hash e cache imutável"""
+
+    def __init__(self, app=None, max_age=MAX_AGE_IMUTAVEL):
+        self.max_age = max_age
+        self.manifesto = {}
+        self.versionados = set()
+        self.app = None
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        self.app = app
+        app.url_defaults(self._versionar_url)
+        app.after_request(self._cache_imutavel)
+        app.extensions['estaticos'] = self
+        self.carregar()
+
+    def carregar(self):
+        """Lê o manifesto gravado por ``gerar_manifesto`` (sem manifesto, URLs sem hash)"""
+        try:
+            with open(os.path.join(self.app.static_folder, MANIFESTO), encoding='utf-8') as f:
+                manifesto = json.load(f)
+        except (OSError, ValueError):
+            manifesto = {}
+        self.manifesto = manifesto
+        self.versionados = set(manifesto.values())
+
+    def atualizar(self):
+        """Regenera as cópias com hash e o manifesto e passa a usá-los"""
+        try:
+            gerar_manifesto(self.app.static_folder)
+        except OSError as e:
+            logging.warning(f"Não foi possível gerar o manifesto de static/: {e}")
+        self.carregar()
+
+    def _versionar_url(self, endpoint, values):
+        if endpoint != 'static' or self.app.debug:
+            return
+        filename = values.get('filename')
+        if filename in self.manifesto:
+            values['filename'] = self.manifesto[filename]
+
+    def _cache_imutavel(self, response):
+        if (request.endpoint == 'static'
+                and response.status_code in (200, 304)
+                and request.view_args.get('filename') in self.versionados):
+            response.cache_control.public = True
+            response.cache_control.max_age = self.max_age
+            response.cache_control.immutable = True
+            response.cache_control.no_cache = None
+        return response
+
+if __name__ == '__main__':
+    pasta = sys.argv[1] if len(sys.argv) > 1 else os.path.join(os.path.dirname(os.path.abspath(__file__)), 'static')
+    print(f"🔖 {len(gerar_manifesto(pasta))} arquivos versionados em {pasta}")
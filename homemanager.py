@@ -18,6 +18,8 @@ from pathlib import Path
 current_dir = Path(__file__).parent.absolute()
 sys.path.insert(0, str(current_dir))
 
+from servidor_wsgi import servidor_da_linha_de_comando
+
 # Variável global para controlar o servidor
 servidor_processo = None
 
@@ -69,7 +71,7 @@ def ativar_venv_e_instalar():
     # Verificar se as dependências estão instaladas no venv
     try:
         result = subprocess.run([str(python_venv), "-c", 
-                               "import flask, flask_cors, psycopg2, reportlab, psutil"], 
+                               "import flask, flask_cors, psycopg2, reportlab, psutil, waitress"], 
                               capture_output=True, text=True)
         if result.returncode != 0:
             print("⚠️  Instalando dependências no ambiente virtual...")
@@ -174,8 +176,8 @@ def encerrar_aplicativo():
     print("👋 HomeManager encerrado!")
     os._exit(0)
 
-def iniciar_servidor(python_path=None):
-    """Inicia o servidor Flask"""
+def iniciar_servidor(python_path=None, servidor=None):
+    """Inicia o servidor (waitress por padrão; ver servidor_wsgi.py)"""
     global servidor_processo
     
     try:
@@ -184,6 +186,11 @@ def iniciar_servidor(python_path=None):
         # Usar Python do venv se fornecido
         python_cmd = python_path if python_path else sys.executable
         
+        # --servidor=<nome> na linha de comando sobrepõe SERVIDOR_WSGI do .env
+        env = os.environ.copy()
+        if servidor:
+            env['SERVIDOR_WSGI'] = servidor
+        
         # Iniciar servidor como subprocesso
         servidor_processo = subprocess.Popen([
             python_cmd, "-c",
@@ -191,9 +198,10 @@ def iniciar_servidor(python_path=None):
 import sys
 sys.path.insert(0, '.')
 from app import app
-app.run(host='127.0.0.1', port=5000, debug=False, use_reloader=False, threaded=True)
+from servidor_wsgi import servir
+servir(app, host='127.0.0.1', port=5000)
             """
-        ], cwd=str(current_dir))
+        ], cwd=str(current_dir), env=env)
         
         # Aguardar servidor inicializar
         time.sleep(3)
@@ -284,8 +292,8 @@ except Exception as e:
     print("=" * 50)
     
     try:
-        # Iniciar servidor Flask
-        if not iniciar_servidor(python_venv):
+        # Iniciar servidor
+        if not iniciar_servidor(python_venv, servidor_da_linha_de_comando()):
             input("Pressione Enter para sair...")
             return
         
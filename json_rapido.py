@@ -0,0 +1,65 @@
+"""
+Provedor JSON do Flask com orjson (quando instalado) e fallback para a biblioteca padrão.
+
+Em relação ao provedor padrão do Flask:
+    - date/datetime saem em ISO 8601 ("2025-03-20", "2025-03-20T14:30:00"), sem
+      precisar converter com isoformat() em cada rota
+    - Decimal continua saindo como string, como no Flask
+    - as chaves não são ordenadas (a ordem de inserção do dict é mantida)
+
+    app.json = ProvedorJsonRapido(app)
+"""
+import uuid
+import decimal
+import dataclasses
+from datetime import date, datetime, time
+
+from flask.json.provider import DefaultJSONProvider
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+def _padrao(o):
+    """Tipos que nem o json nem o orjson serializam sozinhos"""
+    if isinstance(o, (date, datetime, time)):
+        return o.isoformat()
+    if isinstance(o, (decimal.Decimal, uuid.UUID)):
+        return str(o)
+    if dataclasses.is_dataclass(o):
+        return dataclasses.asdict(o)
+    if isinstance(o, (set, frozenset)):
+        return list(o)
+    if hasattr(o, '__html__'):
+        return str(o.__html__())
+    raise TypeError(f"Object of type {type(o).__name__} is not JSON serializable")
+
+class ProvedorJsonRapido(DefaultJSONProvider):
+    default = staticmethod(_padrao)
+    sort_keys = False
+
+    def _opcoes_orjson(self):
+        opcoes = orjson.OPT_NON_STR_KEYS
+        if (self.compact is None and self._app.debug) or self.compact is False:
+            opcoes |= orjson.OPT_INDENT_2
+        return opcoes
+
+    def dumps(self, obj, **kwargs):
+        # Argumentos do json.dumps (indent, separators...) só existem na biblioteca padrão
+        if orjson is None or kwargs:
+            return super().dumps(obj, **kwargs)
+        return orjson.dumps(obj, default=_padrao, option=orjson.OPT_NON_STR_KEYS).decode('utf-8')
+
+    def loads(self, s, **kwargs):
+        if orjson is None or kwargs:
+            return super().loads(s, **kwargs)
+        return orjson.loads(s)
+
+    def response(self, *args, **kwargs):
+        if orjson is None:
+            return super().response(*args, **kwargs)
+        obj = self._prepare_response_obj(args, kwargs)
+        # bytes direto para a resposta, sem passar por str
+        dados = orjson.dumps(obj, default=_padrao, option=self._opcoes_orjson()) + b'\n'
+        return self._app.response_class(dados, mimetype=self.mimetype)
@@ -0,0 +1,181 @@
+"""
+Métricas por endpoint (extensão Flask).
+
+Para cada requisição mede a latência total, o tempo gasto no banco, o número de
+comandos SQL e as linhas retornadas. Os valores acumulados por endpoint saem em
+/metrics (formato texto do Prometheus) e cada resposta leva um cabeçalho
+Server-Timing, visível na aba Rede do navegador.
+
+    metricas = MetricasRequisicao(app)
+    conn = metricas.instrumentar(conn)   # em get_db_connection
+
+Os números são por processo: com vários workers do gunicorn cada um expõe os seus.
+"""
+import time
+import logging
+import threading
+
+import psycopg2.extensions
+from flask import g, has_request_context, request, Response
+
+# Limites (em segundos) dos buckets dos histogramas
+BUCKETS_PADRAO = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+def _registrar_sql(duracao, linhas):
+    if has_request_context():
+        sql = g.setdefault('_metricas_sql', [0.0, 0, 0])
+        sql[0] += duracao
+        sql[1] += 1
+        sql[2] += linhas
+
+class CursorMedido(psycopg2.extensions.cursor):
+    """Cursor que soma tempo, comandos e linhas na requisição atual"""
+
+    # Funções chamadas com (cursor, query, parâmetros, duração) após cada comando
+    observadores = []
+
+    def execute(self, query, vars=None):
+        inicio = time.perf_counter()
+        try:
+            return super().execute(query, vars)
+        finally:
+            # psycopg2 traz o resultado inteiro no execute: o tempo já inclui a transferência
+            duracao = time.perf_counter() - inicio
+            linhas = self.rowcount if self.description is not None and self.rowcount > 0 else 0
+            _registrar_sql(duracao, linhas)
+            self._notificar(query, vars, duracao)
+
+    def executemany(self, query, vars_list):
+        inicio = time.perf_counter()
+        try:
+            return super().executemany(query, vars_list)
+        finally:
+            duracao = time.perf_counter() - inicio
+            _registrar_sql(duracao, 0)
+            self._notificar(query, None, duracao)
+
+    def _notificar(self, query, vars, duracao):
+        for observador in self.observadores:
+            try:
+                observador(self, query, vars, duracao)
+            except Exception as e:
+                logging.warning(f"Erro no observador de SQL: {e}")
+
+class Histograma:
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.contagens = [0] * len(buckets)
+        self.soma = 0.0
+        self.total = 0
+
+    def observar(self, valor):
+        for i, limite in enumerate(self.buckets):
+            if valor <= limite:
+                self.contagens[i] += 1
+                break
+        self.soma += valor
+        self.total += 1
+
+def _rotulos(**rotulos):
+    valores = []
+    for chave, valor in rotulos.items():
+        valor = str(valor).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+        valores.append(f'{chave}="{valor}"')
+    return '{' + ','.join(valores) + '}'
+
+class MetricasRequisicao:
+    """Extensão Flask: histogramas de latência e contadores de SQL por endpoint"""
+
+    def __init__(self, app=None, rota='/metrics', buckets=BUCKETS_PADRAO):
+        self.rota = rota
+        self.buckets = buckets
+        self._lock = threading.Lock()
+        self._latencia = {}     # (endpoint, metodo) -> Histograma
+        self._tempo_db = {}     # (endpoint, metodo) -> Histograma
+        self._requisicoes = {}  # (endpoint, metodo, status) -> quantidade
+        self._sql = {}          # (endpoint, metodo) -> [comandos, linhas]
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        app.before_request(self._iniciar)
+        app.after_request(self._finalizar)
+        app.add_url_rule(self.rota, 'metricas', self.exportar)
+        app.extensions['metricas'] = self
+
+    def observar_sql(self, funcao):
+        """Registra ``funcao(cursor, query, parametros, duracao)``, chamada após cada comando"""
+        CursorMedido.observadores.append(funcao)
+        return funcao
+
+    def instrumentar(self, conn):
+        """Faz os cursores da conexão registrarem o SQL na requisição atual"""
+        if conn is not None:
+            conn.cursor_factory = CursorMedido
+        return conn
+
+    def _iniciar(self):
+        g._metricas_inicio = time.perf_counter()
+
+    def _finalizar(self, response):
+        inicio = g.pop('_metricas_inicio', None)
+        if inicio is None:
+            return response
+        duracao = time.perf_counter() - inicio
+        tempo_db, comandos, linhas = g.pop('_metricas_sql', (0.0, 0, 0))
+
+        # Rotas inexistentes ficam juntas, para não criar uma série por URL
+        chave = (request.endpoint or 'nao_encontrado', request.method)
+        with self._lock:
+            if chave not in self._latencia:
+                self._latencia[chave] = Histograma(self.buckets)
+                self._tempo_db[chave] = Histograma(self.buckets)
+                self._sql[chave] = [0, 0]
+            self._latencia[chave].observar(duracao)
+            self._tempo_db[chave].observar(tempo_db)
+            self._sql[chave][0] += comandos
+            self._sql[chave][1] += linhas
+            chave_status = chave + (response.status_code,)
+            self._requisicoes[chave_status] = self._requisicoes.get(chave_status, 0) + 1
+
+        response.headers.add('Server-Timing',
+                             f'app;dur={duracao * 1000:.1f}, db;dur={tempo_db * 1000:.1f};desc="{comandos} SQL"')
+        return response
+
+    def exportar(self):
+        """Rota /metrics no formato texto do Prometheus"""
+        linhas = []
+        with self._lock:
+            linhas += self._exportar_histograma(
+                'homemanager_requisicao_segundos', 'Latência das requisições por endpoint', self._latencia)
+            linhas += self._exportar_histograma(
+                'homemanager_requisicao_db_segundos', 'Tempo no banco por requisição', self._tempo_db)
+
+            linhas.append('# HELP homemanager_requisicoes_total Requisições atendidas por endpoint e status')
+            linhas.append('# TYPE homemanager_requisicoes_total counter')
+            for (endpoint, metodo, status), quantidade in sorted(self._requisicoes.items()):
+                linhas.append(f'homemanager_requisicoes_total{_rotulos(endpoint=endpoint, metodo=metodo, status=status)} {quantidade}')
+
+            linhas.append('# HELP homemanager_sql_comandos_total Comandos SQL executados por endpoint')
+            linhas.append('# TYPE homemanager_sql_comandos_total counter')
+            for (endpoint, metodo), (comandos, _) in sorted(self._sql.items()):
+                linhas.append(f'homemanager_sql_comandos_total{_rotulos(endpoint=endpoint, metodo=metodo)} {comandos}')
+
+            linhas.append('# HELP homemanager_sql_linhas_total Linhas retornadas pelo banco por endpoint')
+            linhas.append('# TYPE homemanager_sql_linhas_total counter')
+            for (endpoint, metodo), (_, quantidade) in sorted(self._sql.items()):
+                linhas.append(f'homemanager_sql_linhas_total{_rotulos(endpoint=endpoint, metodo=metodo)} {quantidade}')
+
+        return Response('\n'.join(linhas) + '\n', mimetype='text/plain; version=0.0.4')
+
+    def _exportar_histograma(self, nome, descricao, histogramas):
+        linhas = [f'# HELP {nome} {descricao}', f'# TYPE {nome} histogram']
+        for (endpoint, metodo), histograma in sorted(histogramas.items()):
+            acumulado = 0
+            for limite, contagem in zip(histograma.buckets, histograma.contagens):
+                acumulado += contagem
+                linhas.append(f'{nome}_bucket{_rotulos(endpoint=endpoint, metodo=metodo, le=limite)} {acumulado}')
+            linhas.append(f'{nome}_bucket{_rotulos(endpoint=endpoint, metodo=metodo, le="+Inf")} {histograma.total}')
+            linhas.append(f'{nome}_sum{_rotulos(endpoint=endpoint, metodo=metodo)} {histograma.soma:.6f}')
+            linhas.append(f'{nome}_count{_rotulos(endpoint=endpoint, metodo=metodo)} {histograma.total}')
+        return linhas
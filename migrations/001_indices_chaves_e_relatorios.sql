@@ -0,0 +1,18 @@
+-- Índices para as chaves estrangeiras (PostgreSQL não os cria automaticamente)
+-- e para as colunas usadas nos filtros de relatórios e do calendário.
+
+-- Chaves estrangeiras
+CREATE INDEX IF NOT EXISTS idx_endereco_id_cliente ON public.endereco (id_cliente);
+CREATE INDEX IF NOT EXISTS idx_endereco_estado ON public.endereco (estado);
+CREATE INDEX IF NOT EXISTS idx_contrato_id_cliente ON public.contrato (id_cliente);
+CREATE INDEX IF NOT EXISTS idx_elevador_id_contrato ON public.elevador (id_contrato);
+
+-- Relatórios por período de venda
+CREATE INDEX IF NOT EXISTS idx_contrato_data_venda ON public.contrato (data_venda);
+
+-- Calendário: janela de datas de entrega, já trazendo o id para o JOIN com elevador
+CREATE INDEX IF NOT EXISTS idx_contrato_data_entrega ON public.contrato (data_entrega, id);
+
+-- Filtro por status + entrega: status fica em elevador e a data de entrega em contrato,
+-- então o composto guarda o status junto da chave do contrato usada no JOIN
+CREATE INDEX IF NOT EXISTS idx_elevador_status_contrato ON public.elevador (status, id_contrato);
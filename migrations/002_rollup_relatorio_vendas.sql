@@ -0,0 +1,34 @@
+-- Tabela de resumo (rollup) dos relatórios de vendas: uma linha por estado × contrato,
+-- com a data da venda e os totais de elevadores/elevação já agregados.
+-- Mantida incrementalmente pelas rotas de escrita da API (atualizar_rollup_vendas em app.py).
+-- Os totais reproduzem o JOIN endereco → contrato → elevador dos relatórios ao vivo,
+-- inclusive a multiplicação por endereços do mesmo cliente no mesmo estado.
+
+CREATE TABLE IF NOT EXISTS public.relatorio_vendas
+(
+    estado character varying(2) NOT NULL,
+    id_contrato integer NOT NULL,
+    id_cliente integer,
+    data_venda date,
+    total_elevadores integer NOT NULL DEFAULT 0,
+    soma_elevacao bigint NOT NULL DEFAULT 0,
+    qtd_elevacao integer NOT NULL DEFAULT 0,
+    PRIMARY KEY (estado, id_contrato)
+);
+
+CREATE INDEX IF NOT EXISTS idx_relatorio_vendas_estado_data ON public.relatorio_vendas (estado, data_venda);
+CREATE INDEX IF NOT EXISTS idx_relatorio_vendas_data ON public.relatorio_vendas (data_venda);
+CREATE INDEX IF NOT EXISTS idx_relatorio_vendas_contrato ON public.relatorio_vendas (id_contrato);
+CREATE INDEX IF NOT EXISTS idx_relatorio_vendas_cliente ON public.relatorio_vendas (id_cliente);
+
+-- Carga inicial
+INSERT INTO public.relatorio_vendas
+    (estado, id_contrato, id_cliente, data_venda, total_elevadores, soma_elevacao, qtd_elevacao)
+SELECT e.estado, c.id, c.id_cliente, c.data_venda,
+       COUNT(el.id), COALESCE(SUM(col.elevacao), 0), COUNT(col.elevacao)
+FROM contrato c
+JOIN endereco e ON e.id_cliente = c.id_cliente
+LEFT JOIN elevador el ON el.id_contrato = c.id
+LEFT JOIN coluna col ON col.id_elevador = el.id
+GROUP BY e.estado, c.id, c.id_cliente, c.data_venda
+ON CONFLICT (estado, id_contrato) DO NOTHING;
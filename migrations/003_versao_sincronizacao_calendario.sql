@@ -0,0 +1,103 @@
+-- Versão de alteração por linha para a sincronização incremental do calendário
+-- (/api/calendario?since=<token>).
+-- Cada linha guarda o id da transação (txid_current) que a criou/alterou por último.
+-- O token entregue ao cliente é o xmin do snapshot no momento da leitura: toda
+-- transação com id >= xmin ainda podia estar em andamento, então pedir "versao >= token"
+-- nunca perde alterações confirmadas depois (no máximo reenvia algumas já vistas).
+
+ALTER TABLE public.cliente    ADD COLUMN IF NOT EXISTS versao bigint NOT NULL DEFAULT txid_current();
+ALTER TABLE public.endereco   ADD COLUMN IF NOT EXISTS versao bigint NOT NULL DEFAULT txid_current();
+ALTER TABLE public.contrato   ADD COLUMN IF NOT EXISTS versao bigint NOT NULL DEFAULT txid_current();
+ALTER TABLE public.elevador   ADD COLUMN IF NOT EXISTS versao bigint NOT NULL DEFAULT txid_current();
+ALTER TABLE public.cabine     ADD COLUMN IF NOT EXISTS versao bigint NOT NULL DEFAULT txid_current();
+ALTER TABLE public.coluna     ADD COLUMN IF NOT EXISTS versao bigint NOT NULL DEFAULT txid_current();
+ALTER TABLE public.adicionais ADD COLUMN IF NOT EXISTS versao bigint NOT NULL DEFAULT txid_current();
+
+CREATE INDEX IF NOT EXISTS idx_cliente_versao ON public.cliente (versao);
+CREATE INDEX IF NOT EXISTS idx_endereco_versao ON public.endereco (versao);
+CREATE INDEX IF NOT EXISTS idx_contrato_versao ON public.contrato (versao);
+CREATE INDEX IF NOT EXISTS idx_elevador_versao ON public.elevador (versao);
+CREATE INDEX IF NOT EXISTS idx_cabine_versao ON public.cabine (versao);
+CREATE INDEX IF NOT EXISTS idx_coluna_versao ON public.coluna (versao);
+CREATE INDEX IF NOT EXISTS idx_adicionais_versao ON public.adicionais (versao);
+
+-- Atualiza a versão em todo UPDATE, inclusive os feitos fora da API
+CREATE OR REPLACE FUNCTION public.marcar_versao() RETURNS trigger AS $$
+BEGIN
+    NEW.versao := txid_current();
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS trg_cliente_versao ON public.cliente;
+CREATE TRIGGER trg_cliente_versao BEFORE UPDATE ON public.cliente
+    FOR EACH ROW EXECUTE PROCEDURE public.marcar_versao();
+DROP TRIGGER IF EXISTS trg_endereco_versao ON public.endereco;
+CREATE TRIGGER trg_endereco_versao BEFORE UPDATE ON public.endereco
+    FOR EACH ROW EXECUTE PROCEDURE public.marcar_versao();
+DROP TRIGGER IF EXISTS trg_contrato_versao ON public.contrato;
+CREATE TRIGGER trg_contrato_versao BEFORE UPDATE ON public.contrato
+    FOR EACH ROW EXECUTE PROCEDURE public.marcar_versao();
+DROP TRIGGER IF EXISTS trg_elevador_versao ON public.elevador;
+CREATE TRIGGER trg_elevador_versao BEFORE UPDATE ON public.elevador
+    FOR EACH ROW EXECUTE PROCEDURE public.marcar_versao();
+DROP TRIGGER IF EXISTS trg_cabine_versao ON public.cabine;
+CREATE TRIGGER trg_cabine_versao BEFORE UPDATE ON public.cabine
+    FOR EACH ROW EXECUTE PROCEDURE public.marcar_versao();
+DROP TRIGGER IF EXISTS trg_coluna_versao ON public.coluna;
+CREATE TRIGGER trg_coluna_versao BEFORE UPDATE ON public.coluna
+    FOR EACH ROW EXECUTE PROCEDURE public.marcar_versao();
+DROP TRIGGER IF EXISTS trg_adicionais_versao ON public.adicionais;
+CREATE TRIGGER trg_adicionais_versao BEFORE UPDATE ON public.adicionais
+    FOR EACH ROW EXECUTE PROCEDURE public.marcar_versao();
+
+-- Elevadores removidos (tombstones), para o cliente tirar o evento do calendário
+CREATE TABLE IF NOT EXISTS public.elevador_removido
+(
+    id_elevador integer PRIMARY KEY,
+    versao bigint NOT NULL DEFAULT txid_current(),
+    removido_em timestamp DEFAULT now()
+);
+
+CREATE INDEX IF NOT EXISTS idx_elevador_removido_versao ON public.elevador_removido (versao);
+
+CREATE OR REPLACE FUNCTION public.registrar_elevador_removido() RETURNS trigger AS $$
+BEGIN
+    INSERT INTO public.elevador_removido (id_elevador) VALUES (OLD.id)
+    ON CONFLICT (id_elevador) DO UPDATE SET versao = txid_current(), removido_em = now();
+    RETURN OLD;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS trg_elevador_removido ON public.elevador;
+CREATE TRIGGER trg_elevador_removido AFTER DELETE ON public.elevador
+    FOR EACH ROW EXECUTE PROCEDURE public.registrar_elevador_removido();
+
+-- Remover cabine/coluna/adicionais ou um endereço também altera o evento:
+-- propaga a versão para o elevador/cliente dono da linha.
+CREATE OR REPLACE FUNCTION public.propagar_versao_elevador() RETURNS trigger AS $$
+BEGIN
+    UPDATE public.elevador SET versao = txid_current() WHERE id = OLD.id_elevador;
+    RETURN OLD;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION public.propagar_versao_cliente() RETURNS trigger AS $$
+BEGIN
+    UPDATE public.cliente SET versao = txid_current() WHERE id = OLD.id_cliente;
+    RETURN OLD;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS trg_cabine_removida ON public.cabine;
+CREATE TRIGGER trg_cabine_removida AFTER DELETE ON public.cabine
+    FOR EACH ROW EXECUTE PROCEDURE public.propagar_versao_elevador();
+DROP TRIGGER IF EXISTS trg_coluna_removida ON public.coluna;
+CREATE TRIGGER trg_coluna_removida AFTER DELETE ON public.coluna
+    FOR EACH ROW EXECUTE PROCEDURE public.propagar_versao_elevador();
+DROP TRIGGER IF EXISTS trg_adicionais_removidos ON public.adicionais;
+CREATE TRIGGER trg_adicionais_removidos AFTER DELETE ON public.adicionais
+    FOR EACH ROW EXECUTE PROCEDURE public.propagar_versao_elevador();
+DROP TRIGGER IF EXISTS trg_endereco_removido ON public.endereco;
+CREATE TRIGGER trg_endereco_removido AFTER DELETE ON public.endereco
+    FOR EACH ROW EXECUTE PROCEDURE public.propagar_versao_cliente();
@@ -0,0 +1,15 @@
+-- Versão por entidade para o GET condicional das listagens (ETag / 304 Not Modified).
+-- notificar_alteracao (app.py) incrementa o contador da entidade na mesma transação
+-- da escrita, logo antes do commit: a nova versão só fica visível junto com os dados.
+-- As listagens leem estas poucas linhas antes da consulta principal e respondem 304
+-- quando o If-None-Match do navegador corresponde.
+-- Endereços contam como 'cliente' (as rotas de endereço notificam o cliente).
+
+CREATE TABLE IF NOT EXISTS public.versao_entidade
+(
+    entidade character varying(30) PRIMARY KEY,
+    versao bigint NOT NULL DEFAULT 0
+);
+
+INSERT INTO public.versao_entidade (entidade) VALUES ('cliente'), ('contrato'), ('elevador')
+ON CONFLICT (entidade) DO NOTHING;
@@ -0,0 +1,419 @@
+"""
+Pacotes de JavaScript por página (extensão Flask + etapa de build, sem Node).
+
+Cada página carrega dois arquivos minificados e com source map
+(static/dist/<pacote>.js.map), na mesma posição dos scripts originais:
+static/dist/base.js (locale-config.js + common.js) logo depois do Bootstrap,
+antes dos scripts inline, e static/dist/<pacote>.js (o script da página) depois
+do bloco scripts de cada template. A minificação é conservadora: remove
+comentários, indentação e linhas em branco, mas mantém as quebras de linha
+entre os comandos, então o ASI (ponto e vírgula automático) continua igual.
+
+    python pacotes_js.py            # gera os pacotes e mostra o relatório de tamanhos
+    pacotes = PacotesJs(app)        # templates: {% set pacote = 'elevadores' %}
+
+Sem os pacotes gerados (ou em modo debug) os templates carregam os arquivos
+originais, um por um, na mesma ordem.
+"""
+import os
+import re
+import sys
+import gzip
+import json
+import logging
+import tempfile
+
+from flask import url_for
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+PASTA_PACOTES = 'dist'
+
+PACOTE_BASE = 'base'
+
+# Pacote -> arquivos de static/, na ordem de execução. O base vem antes dos scripts
+# inline dos templates (que usam common.js) e os das páginas depois deles.
+PACOTES = {
+    PACOTE_BASE: ['js/locale-config.js', 'js/common.js'],
+    'clientes': ['js/clientes.js'],
+    'contratos': ['js/contratos.js'],
+    'elevadores': ['js/elevadores.js'],
+    'calendario': ['js/calendario.js'],
+    'relatorios': ['js/relatorios.js'],
+}
+
+_ESPACO = re.compile(r'[ \t\r\n\f\v\u00a0\ufeff\u2028\u2029]+')
+# Terminadores de linha para o ASI
+_TERMINADORES_LINHA = ('\n', '\r', '\u2028', '\u2029')
+_PALAVRA = re.compile(r'[A-Za-z0-9_$\u0080-\uffff]+')
+_CARACTER_PALAVRA = re.compile(r'[A-Za-z0-9_$\u0080-\uffff]')
+
+# Depois destas palavras, "/" começa uma expressão regular e não uma divisão
+_PALAVRAS_ANTES_DE_REGEX = {
+    'return', 'typeof', 'case', 'do', 'else', 'in', 'instanceof', 'new',
+    'delete', 'void', 'throw', 'yield', 'await', 'of',
+}
+
+# ---------------------------------------------------------------------------
+# Tokenização
+# ---------------------------------------------------------------------------
+
+def _fim_string(codigo, i):
+    aspas = codigo[i]
+    j = i + 1
+    while j < len(codigo):
+        if codigo[j] == '\\':
+            j += 2
+            continue
+        if codigo[j] == aspas or codigo[j] == '\n':
+            return j + 1
+        j += 1
+    return len(codigo)
+
+def _fim_comentario(codigo, i):
+    if codigo.startswith('//', i):
+        fim = codigo.find('\n', i)
+        return len(codigo) if fim == -1 else fim
+    fim = codigo.find('*/', i + 2)
+    return len(codigo) if fim == -1 else fim + 2
+
+def _fim_template(codigo, i):
+    j = i + 1
+    while j < len(codigo):
+        caractere = codigo[j]
+        if caractere == '\\':
+            j += 2
+            continue
+        if caractere == '`':
+            return j + 1
+        if caractere == '$' and codigo.startswith('{', j + 1):
+            j = _fim_expressao_template(codigo, j + 2)
+            continue
+        j += 1
+    return len(codigo)
+
+def _fim_expressao_template(codigo, j):
+    profundidade = 1
+    while j < len(codigo):
+        caractere = codigo[j]
+        if caractere in '\'"':
+            j = _fim_string(codigo, j)
+            continue
+        if caractere == '`':
+            j = _fim_template(codigo, j)
+            continue
+        if codigo.startswith('//', j) or codigo.startswith('/*', j):
+            j = _fim_comentario(codigo, j)
+            continue
+        if caractere == '{':
+            profundidade += 1
+        elif caractere == '}':
+            profundidade -= 1
+            if profundidade == 0:
+                return j + 1
+        j += 1
+    return len(codigo)
+
+def _fim_regex(codigo, i):
+    j = i + 1
+    em_classe = False
+    while j < len(codigo):
+        caractere = codigo[j]
+        if caractere == '\\':
+            j += 2
+            continue
+        if caractere == '\n':
+            return j
+        if caractere == '[':
+            em_classe = True
+        elif caractere == ']':
+            em_classe = False
+        elif caractere == '/' and not em_classe:
+            fim_flags = _PALAVRA.match(codigo, j + 1)
+            return fim_flags.end() if fim_flags else j + 1
+        j += 1
+    return len(codigo)
+
+def _regex_permitida(anterior):
+    if anterior is None:
+        return True
+    if _CARACTER_PALAVRA.match(anterior[-1]):
+        return anterior in _PALAVRAS_ANTES_DE_REGEX
+    if anterior[0] in '\'"`' or (anterior[0] == '/' and len(anterior) > 1):
+        return False  # depois de string, template ou regex
+    return anterior not in (')', ']', '}')
+
+def tokenizar(codigo):
+    """Gera (tipo, texto) com tipo 'espaco', 'comentario' ou 'codigo'"""
+    i = 0
+    anterior = None
+    while i < len(codigo):
+        caractere = codigo[i]
+        espaco = _ESPACO.match(codigo, i)
+        if espaco:
+            yield 'espaco', espaco.group()
+            i = espaco.end()
+            continue
+        if codigo.startswith('//', i) or codigo.startswith('/*', i):
+            fim = _fim_comentario(codigo, i)
+            yield 'comentario', codigo[i:fim]
+            i = fim
+            continue
+        if caractere in '\'"':
+            fim = _fim_string(codigo, i)
+        elif caractere == '`':
+            fim = _fim_template(codigo, i)
+        elif caractere == '/' and _regex_permitida(anterior):
+            fim = _fim_regex(codigo, i)
+        else:
+            palavra = _PALAVRA.match(codigo, i)
+            fim = palavra.end() if palavra else i + 1
+        anterior = codigo[i:fim]
+        yield 'codigo', anterior
+        i = fim
+
+# ---------------------------------------------------------------------------
+# Minificação e source map
+# ---------------------------------------------------------------------------
+
+_BASE64 = 'ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789+/'
+
+def _vlq(valor):
+    valor = (-valor << 1) | 1 if valor < 0 else valor << 1
+    saida = ''
+    while True:
+        digito = valor & 31
+        valor >>= 5
+        if valor:
+            digito |= 32
+        saida += _BASE64[digito]
+        if not valor:
+            return saida
+
+def _colunas(texto):
+    # Colunas do source map contam unidades UTF-16, como o navegador
+    return len(texto.encode('utf-16-le')) // 2
+
+def _precisa_espaco(anterior, proximo):
+    fim, inicio = anterior[-1], proximo[0]
+    if _CARACTER_PALAVRA.match(fim) and _CARACTER_PALAVRA.match(inicio):
+        return True
+    if fim + inicio in ('++', '--', '//', '/*'):
+        return True
+    # "1 .toString()" não pode virar "1.toString()"
+    return inicio == '.' and anterior.isdigit()
+
+class _Saida:
+    """Texto do pacote com os segmentos do source map ([linha][coluna, fonte, linha, coluna])"""
+
+    def __init__(self):
+        self.partes = []
+        self.linha = 0
+        self.coluna = 0
+        self.segmentos = [[]]
+
+    def escrever(self, texto):
+        self.partes.append(texto)
+        quebras = texto.count('\n')
+        if quebras:
+            self.linha += quebras
+            self.segmentos.extend([] for _ in range(quebras))
+            self.coluna = _colunas(texto[texto.rfind('\n') + 1:])
+        else:
+            self.coluna += _colunas(texto)
+
+    def mapear(self, fonte, linha, coluna):
+        self.segmentos[self.linha].append((self.coluna, fonte, linha, coluna))
+
+    def mappings(self):
+        linhas = []
+        fonte_ant = linha_ant = coluna_ant = 0
+        for segmentos in self.segmentos:
+            coluna_saida_ant = 0
+            partes = []
+            for coluna_saida, fonte, linha, coluna in segmentos:
+                partes.append(_vlq(coluna_saida - coluna_saida_ant) + _vlq(fonte - fonte_ant)
+                              + _vlq(linha - linha_ant) + _vlq(coluna - coluna_ant))
+                coluna_saida_ant, fonte_ant, linha_ant, coluna_ant = coluna_saida, fonte, linha, coluna
+            linhas.append(','.join(partes))
+        return ';'.join(linhas)
+
+def minificar_js(codigo, saida=None, fonte=0):
+    """Minifica ``codigo`` em ``saida`` (uma _Saida), mapeando os tokens para a ``fonte``"""
+    saida = saida or _Saida()
+    linha = coluna = 0
+    anterior = None
+    quebra = False      # o trecho removido tinha quebra de linha
+    removido = True     # houve espaço/comentário removido antes do token
+    for tipo, texto in tokenizar(codigo):
+        if tipo == 'codigo':
+            if anterior is not None:
+                if quebra:
+                    saida.escrever('\n')
+                elif removido and _precisa_espaco(anterior, texto):
+                    saida.escrever(' ')
+            if removido or quebra:
+                saida.mapear(fonte, linha, coluna)
+            saida.escrever(texto)
+            anterior = texto
+            quebra = removido = False
+        else:
+            removido = True
+            quebra = quebra or any(terminador in texto for terminador in _TERMINADORES_LINHA)
+        quebras = texto.count('\n')
+        if quebras:
+            linha += quebras
+            coluna = _colunas(texto[texto.rfind('\n') + 1:])
+        else:
+            coluna += _colunas(texto)
+    return saida
+
+def declaracoes_globais(codigo):
+    """Nomes de const/let/class no nível superior (repetidos entre arquivos quebram o pacote)"""
+    nomes = []
+    profundidade = 0
+    declarando = False
+    for tipo, texto in tokenizar(codigo):
+        if tipo != 'codigo':
+            continue
+        if texto in ('{', '(', '['):
+            profundidade += 1
+        elif texto in ('}', ')', ']'):
+            profundidade -= 1
+        elif declarando and _CARACTER_PALAVRA.match(texto[0]):
+            nomes.append(texto)
+        elif profundidade == 0 and texto in ('const', 'let', 'class'):
+            declarando = True
+            continue
+        declarando = False
+    return nomes
+
+# ---------------------------------------------------------------------------
+# Build
+# ---------------------------------------------------------------------------
+
+def _gravar(caminho, conteudo):
+    descritor, temporario = tempfile.mkstemp(dir=os.path.dirname(caminho), suffix='.tmp')
+    with os.fdopen(descritor, 'w', encoding='utf-8', newline='\n') as f:
+        f.write(conteudo)
+    os.replace(temporario, caminho)
+
+def _atualizado(destino, origens):
+    try:
+        mtime = os.path.getmtime(destino)
+        return all(os.path.getmtime(origem) <= mtime for origem in origens)
+    except OSError:
+        return False
+
+def _ler(pasta, relativo):
+    with open(os.path.join(pasta, relativo), encoding='utf-8-sig') as f:
+        return f.read()
+
+def construir_pacote(pasta, nome, arquivos, carregados_antes=()):
+    """Gera dist/<nome>.js e dist/<nome>.js.map; retorna o item do relatório de tamanhos.
+    
+    ``carregados_antes`` são os arquivos que a página já executou (o pacote base):
+    eles dividem o escopo global com o pacote e não podem repetir declarações.
+    """
+    saida = _Saida()
+    nomes_vistos = {}
+    for relativo in carregados_antes:
+        for declarado in declaracoes_globais(_ler(pasta, relativo)):
+            nomes_vistos.setdefault(declarado, relativo)
+    tamanho_original = 0
+    for indice, relativo in enumerate(arquivos):
+        codigo = _ler(pasta, relativo)
+        tamanho_original += len(codigo.encode('utf-8'))
+        for declarado in declaracoes_globais(codigo):
+            if declarado in nomes_vistos and nomes_vistos[declarado] != relativo:
+                raise ValueError(f"'{declarado}' declarado em {nomes_vistos[declarado]} e {relativo}: "
+                                 f"a página do pacote '{nome}' daria SyntaxError")
+            nomes_vistos[declarado] = relativo
+        if indice:
+            # Separa os arquivos: um arquivo sem ";" no fim não se junta ao próximo
+            saida.escrever('\n;\n')
+        minificar_js(codigo, saida, indice)
+
+    destino = os.path.join(pasta, PASTA_PACOTES, f'{nome}.js')
+    mapa = {
+        'version': 3,
+        'file': f'{nome}.js',
+        'sources': [os.path.relpath(os.path.join(pasta, relativo), os.path.dirname(destino)).replace(os.sep, '/')
+                    for relativo in arquivos],
+        'names': [],
+        'mappings': saida.mappings(),
+    }
+    codigo_minificado = ''.join(saida.partes) + f'\n//# sourceMappingURL={nome}.js.map\n'
+    _gravar(destino, codigo_minificado)
+    _gravar(destino + '.map', json.dumps(mapa, separators=(',', ':')))
+
+    dados = codigo_minificado.encode('utf-8')
+    return {
+        'pacote': nome,
+        'arquivos': len(arquivos),
+        'original': tamanho_original,
+        'minificado': len(dados),
+        'gzip': len(gzip.compress(dados, compresslevel=9, mtime=0)),
+        'brotli': len(brotli.compress(dados, quality=11)) if brotli is not None else None,
+    }
+
+def construir_pacotes(pasta, forcar=False):
+    """Gera os pacotes desatualizados de PACOTES; retorna o relatório dos que foram gerados"""
+    os.makedirs(os.path.join(pasta, PASTA_PACOTES), exist_ok=True)
+    relatorio = []
+    for nome, arquivos in PACOTES.items():
+        carregados_antes = PACOTES[PACOTE_BASE] if nome != PACOTE_BASE else []
+        destino = os.path.join(pasta, PASTA_PACOTES, f'{nome}.js')
+        origens = [os.path.join(pasta, relativo) for relativo in carregados_antes + arquivos]
+        origens.append(os.path.abspath(__file__))
+        if not forcar and _atualizado(destino, origens) and os.path.isfile(destino + '.map'):
+            continue
+        relatorio.append(construir_pacote(pasta, nome, arquivos, carregados_antes))
+    return relatorio
+
+def formatar_relatorio(relatorio):
+    def kb(valor):
+        return '-' if valor is None else f'{valor / 1024:.1f} KB'
+    linhas = [f"{'Pacote':<12} {'Arquivos':>8} {'Original':>11} {'Minificado':>11} {'gzip':>10} {'brotli':>10}"]
+    for item in relatorio:
+        linhas.append(f"{item['pacote']:<12} {item['arquivos']:>8} {kb(item['original']):>11} "
+                      f"{kb(item['minificado']):>11} {kb(item['gzip']):>10} {kb(item['brotli']):>10}")
+    return '\n'.join(linhas)
+
+class PacotesJs:
+    """Extensão Flask: ``scripts_pacote(nome)`` nos templates devolve as URLs dos scripts da página"""
+
+    def __init__(self, app=None):
+        self.app = None
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        self.app = app
+        app.add_template_global(self.scripts_pacote)
+        app.extensions['pacotes_js'] = self
+
+    def atualizar(self):
+        """Gera os pacotes desatualizados; em caso de erro as páginas usam os arquivos originais"""
+        try:
+            relatorio = construir_pacotes(self.app.static_folder)
+        except (OSError, ValueError) as e:
+            logging.warning(f"Não foi possível gerar os pacotes JavaScript: {e}")
+            return
+        if relatorio:
+            logging.info(f"Pacotes JavaScript gerados:\n{formatar_relatorio(relatorio)}")
+
+    def scripts_pacote(self, nome=PACOTE_BASE):
+        pacote = f'{PASTA_PACOTES}/{nome}.js'
+        if not self.app.debug and os.path.isfile(os.path.join(self.app.static_folder, pacote)):
+            return [url_for('static', filename=pacote)]
+        return [url_for('static', filename=arquivo) for arquivo in PACOTES[nome]]
+
+if __name__ == '__main__':
+    pasta = sys.argv[1] if len(sys.argv) > 1 else os.path.join(os.path.dirname(os.path.abspath(__file__)), 'static')
+    relatorio = construir_pacotes(pasta, forcar=True)
+    print(f"📦 {len(relatorio)} pacotes gerados em {os.path.join(pasta, PASTA_PACOTES)}")
+    print(formatar_relatorio(relatorio))
@@ -0,0 +1,736 @@
+"""
+Geração da ficha do elevador em PDF (ReportLab).
+
+Módulo separado do app.py para poder ser importado pelos processos do pool de
+renderização sem carregar o Flask nem abrir conexões com o banco.
+"""
+import os
+import copy
+import logging
+import threading
+from concurrent.futures import ProcessPoolExecutor, TimeoutError as FuturesTimeoutError
+from concurrent.futures.process import BrokenProcessPool
+from functools import partial
+from io import BytesIO
+
+import reportlab
+from reportlab.lib.pagesizes import A4
+from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle, Flowable
+from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+from reportlab.lib.units import inch, cm
+from reportlab.lib.utils import ImageReader
+from reportlab.lib import colors
+from reportlab.graphics.shapes import Drawing, Rect, Polygon, String
+
+# Internos do ReportLab usados por LogoPdf (ver a classe); sem eles o logo usa só o drawImage
+try:
+    from reportlab.pdfbase.pdfdoc import PDFImageXObject
+    from reportlab.pdfgen.canvas import _digester
+except ImportError:
+    PDFImageXObject = _digester = None
+
+# Versões em que o logo pré-comprimido gera o mesmo PDF que o drawImage (conferido
+# com testar_logo_pdf.py: 3.6.13, 4.0.4, 4.1.0, 4.2.5, 4.4.4, 5.0.1). Fora da faixa,
+# o logo volta ao caminho público até a nova versão ser conferida.
+REPORTLAB_TESTADO = ((3, 6), (5, 0))
+
+# Incrementar ao mudar o layout da ficha: muda a chave de todos os PDFs em cache
+PDF_TEMPLATE_VERSAO = 2
+
+# ========== CONSTANTES DE CONFIGURAÇÃO DO PDF ==========
+# Margens do documento (você pode alterar estas margens individualmente)
+MARGEM_ESQUERDA = 0.05*cm   # Margem esquerda - reduzida para aproveitar mais espaço
+MARGEM_DIREITA = 0.05*cm    # Margem direita - reduzida para aproveitar mais espaço
+MARGEM_SUPERIOR = 0.3*cm    # Margem superior
+MARGEM_INFERIOR = 0.3*cm    # Margem inferior
+
+# Tamanhos de fonte
+FONTE_TITULO = 32
+FONTE_SECAO = 20
+FONTE_TABELA = 14
+FONTE_CABECALHO = 14
+FONTE_RODAPE = 12
+FONTE_DESENHO = 12
+
+# Espaçamentos
+ESPACAMENTO_TITULO = 16
+ESPACAMENTO_SECAO_ANTES = 16
+ESPACAMENTO_SECAO_DEPOIS = 8
+ESPACAMENTO_RODAPE = 4
+ESPACAMENTO_TABELA_VERTICAL = 6
+ESPACAMENTO_TABELA_HORIZONTAL = 4
+ESPACAMENTO_GERAL = 6
+
+# Dimensões de imagem
+LOGO_LARGURA = 3*inch
+LOGO_ALTURA = 0.8*inch
+
+# Dimensões de tabelas - otimizadas para melhor distribuição horizontal
+LARGURA_COLUNA_PEQUENA = 2*cm
+LARGURA_COLUNA_MEDIA = 2.5*cm
+LARGURA_COLUNA_GRANDE = 4*cm
+LARGURA_CABECALHO_1 = 3.5*cm      # Aumentada ligeiramente
+LARGURA_CABECALHO_2 = 4.5*cm      # Aumentada para melhor proporção
+LARGURA_CABECALHO_3 = 14*cm        # Aumentada para aproveitar espaço
+LARGURA_DESENHO_CABINE = 6*cm     # Aumentada para melhor proporção
+LARGURA_DESENHO_VISUAL = 10*cm    # Aumentada para aproveitar espaço extra
+
+# Larguras específicas para cada seção - otimizadas para melhor distribuição
+LARGURA_INFO_COLUNA_1 = 3*cm      # Aumentada para melhor distribuição
+LARGURA_INFO_COLUNA_2 = 4.5*cm    # Aumentada para aproveitar espaço
+LARGURA_INFO_COLUNA_3 = 3*cm      # Aumentada para melhor distribuição
+LARGURA_INFO_COLUNA_4 = 4.5*cm    # Aumentada para aproveitar espaço
+
+LARGURA_CABINE_COLUNA_1 = 2.5*cm  # Aumentada ligeiramente
+LARGURA_CABINE_COLUNA_2 = 3.5*cm  # Aumentada para melhor proporção
+
+LARGURA_ESTRUTURA_COLUNA_1 = 3.5*cm   # Aumentada para melhor distribuição
+LARGURA_ESTRUTURA_COLUNA_2 = 3*cm     # Aumentada ligeiramente
+LARGURA_ESTRUTURA_COLUNA_3 = 3.5*cm   # Aumentada para melhor distribuição
+LARGURA_ESTRUTURA_COLUNA_4 = 3*cm     # Aumentada ligeiramente
+
+LARGURA_ADICIONAIS_COLUNA_1 = 6*cm  # Aumentada para melhor distribuição
+LARGURA_ADICIONAIS_COLUNA_2 = 1*cm    # Aumentada para aproveitar espaço
+LARGURA_ADICIONAIS_COLUNA_3 = 6*cm  # Aumentada para melhor distribuição
+LARGURA_ADICIONAIS_COLUNA_4 = 1*cm    # Aumentada para aproveitar espaço
+
+# Espaçamentos adicionais
+ESPACAMENTO_TABELA_SECAO = 6
+
+# Dimensões e configurações do desenho da cabine
+DESENHO_LARGURA = 180
+DESENHO_ALTURA = 120
+DESENHO_ESCALA = 1.5
+DESENHO_LARGURA_PADRAO = 50
+DESENHO_ALTURA_PADRAO = 35
+DESENHO_MARGEM_PLATAFORMA = 6
+DESENHO_TAMANHO_SETA = 12
+DESENHO_OFFSET_SETA_DUPLA = 15
+DESENHO_OFFSET_SETA_Y = 18
+DESENHO_OFFSET_SETA_X = 18
+DESENHO_POSICAO_DIMENSOES_Y = 10
+DESENHO_POSICAO_CENTRO_X = 90
+DESENHO_POSICAO_CENTRO_Y = 60
+# ====================================================
+
+def criar_desenho_cabine(largura, profundidade, lado_entrada, lado_saida):
+    try:
+        # Criar desenho
+        drawing = Drawing(DESENHO_LARGURA, DESENHO_ALTURA)
+        
+        # Dimensões base para o desenho (escaladas)
+        scale = DESENHO_ESCALA
+        
+        # Usar dimensões reais se disponíveis, senão usar valores padrão
+        cab_width = float(largura) * scale if largura else DESENHO_LARGURA_PADRAO
+        cab_height = float(profundidade) * scale if profundidade else DESENHO_ALTURA_PADRAO
+        
+        # Centralizar desenho
+        start_x = DESENHO_POSICAO_CENTRO_X - cab_width/2
+        start_y = DESENHO_POSICAO_CENTRO_Y - cab_height/2
+        
+        # Desenhar cabine (retângulo principal)
+        cabine_rect = Rect(start_x, start_y, cab_width, cab_height)
+        cabine_rect.fillColor = colors.lightblue
+        cabine_rect.strokeColor = colors.black
+        cabine_rect.strokeWidth = 2
+        drawing.add(cabine_rect)
+        
+        # Desenhar plataforma (retângulo menor dentro da cabine)
+        plat_margin = DESENHO_MARGEM_PLATAFORMA
+        plataforma = Rect(start_x + plat_margin, start_y + plat_margin,
+                        cab_width - 2*plat_margin, cab_height - 2*plat_margin)
+        plataforma.fillColor = colors.lightyellow
+        plataforma.strokeColor = colors.darkgray
+        plataforma.strokeWidth = 1
+        drawing.add(plataforma)
+        
+        # Função para desenhar seta
+        def desenhar_seta(x, y, direcao, cor=colors.red):
+            seta_tamanho = DESENHO_TAMANHO_SETA
+            if direcao == 'direita':
+                # Seta para direita
+                seta = Polygon([x, y, x+seta_tamanho, y+seta_tamanho/2, x, y+seta_tamanho, x+2, y+seta_tamanho/2])
+            elif direcao == 'esquerda':
+                # Seta para esquerda
+                seta = Polygon([x+seta_tamanho, y, x, y+seta_tamanho/2, x+seta_tamanho, y+seta_tamanho, x+seta_tamanho-2, y+seta_tamanho/2])
+            elif direcao == 'cima':
+                # Seta para cima
+                seta = Polygon([x, y+seta_tamanho, x+seta_tamanho/2, y, x+seta_tamanho, y+seta_tamanho, x+seta_tamanho/2, y+seta_tamanho-2])
+            elif direcao == 'baixo':
+                # Seta para baixo
+                seta = Polygon([x, y, x+seta_tamanho/2, y+seta_tamanho, x+seta_tamanho, y, x+seta_tamanho/2, y+2])
+            else:
+                return
+            
+            seta.fillColor = cor
+            seta.strokeColor = colors.darkred
+            seta.strokeWidth = 1
+            drawing.add(seta)
+        
+        # Mapear lados para posições e direções
+        lados_config = {
+            'frente': {'pos': (start_x + cab_width/2 - DESENHO_TAMANHO_SETA/2, start_y - DESENHO_OFFSET_SETA_Y), 'dir': 'cima'},
+            'tras': {'pos': (start_x + cab_width/2 - DESENHO_TAMANHO_SETA/2, start_y + cab_height + 6), 'dir': 'baixo'},
+            'direita': {'pos': (start_x + cab_width + 6, start_y + cab_height/2 - DESENHO_TAMANHO_SETA/2), 'dir': 'direita'},
+            'esquerda': {'pos': (start_x - DESENHO_OFFSET_SETA_X, start_y + cab_height/2 - DESENHO_TAMANHO_SETA/2), 'dir': 'esquerda'}
+        }
+        
+        # Desenhar seta de entrada
+        if lado_entrada and lado_entrada.lower() in lados_config:
+            config = lados_config[lado_entrada.lower()]
+            desenhar_seta(config['pos'][0], config['pos'][1], config['dir'], colors.green)
+            
+            # Adicionar texto "E"
+            entrada_text = String(config['pos'][0] + DESENHO_TAMANHO_SETA/2, config['pos'][1] - 8, 'E')
+            entrada_text.fontSize = FONTE_DESENHO
+            entrada_text.fillColor = colors.green
+            entrada_text.textAnchor = 'middle'
+            drawing.add(entrada_text)
+        
+        # Desenhar seta de saída
+        if lado_saida and lado_saida.lower() in lados_config:
+            config = lados_config[lado_saida.lower()]
+            # Usar posição ligeiramente deslocada se for o mesmo lado da entrada
+            offset_x = DESENHO_OFFSET_SETA_DUPLA if lado_entrada == lado_saida else 0
+            desenhar_seta(config['pos'][0] + offset_x, config['pos'][1], config['dir'], colors.red)
+            
+            # Adicionar texto "S"
+            saida_text = String(config['pos'][0] + offset_x + DESENHO_TAMANHO_SETA/2, config['pos'][1] - 8, 'S')
+            saida_text.fontSize = FONTE_DESENHO
+            saida_text.fillColor = colors.red
+            saida_text.textAnchor = 'middle'
+            drawing.add(saida_text)
+        
+        # Adicionar dimensões como texto
+        if largura and profundidade:
+            dim_text = String(DESENHO_POSICAO_CENTRO_X, DESENHO_POSICAO_DIMENSOES_Y, f'{largura} x {profundidade}')
+            dim_text.fontSize = FONTE_DESENHO
+            dim_text.fillColor = colors.black
+            dim_text.textAnchor = 'middle'
+            drawing.add(dim_text)
+        
+        return drawing
+    
+    except Exception as e:
+        print(f"Erro ao criar desenho da cabine: {e}")
+        # Retornar desenho vazio em caso de erro
+        return Drawing(DESENHO_LARGURA, DESENHO_ALTURA)
+
+def _reportlab_testado():
+    try:
+        versao = tuple(int(parte) for parte in reportlab.Version.split('.')[:2])
+    except ValueError:
+        return False
+    minima, maxima = REPORTLAB_TESTADO
+    return _digester is not None and minima <= versao <= maxima
+
+class LogoPdf:
+    """Logo decodificado e comprimido uma única vez por processo.
+    
+    O canvas.drawImage refaz zlib + ASCII85 da imagem inteira a cada documento, o que
+    era a maior parte do tempo de uma ficha (~55 ms de ~70 ms). Aqui o XObject fica
+    pronto e cada PDF só registra uma cópia rasa dele (os bytes da imagem são
+    compartilhados).
+    
+    Isso depende de internos do ReportLab (_digester, ImageReader._dataA,
+    canvas._setXObjects e a numeração de objetos do PDFDocument), por isso o
+    requirements.txt fixa a versão e o caminho rápido só é usado nas versões de
+    REPORTLAB_TESTADO. Se os internos
+    mudarem ou falharem, ``rapido`` fica False e o drawImage embute o logo sozinho.
+    """
+
+    def __init__(self, logo_path):
+        self.imagem = ImageReader(logo_path)
+        self.rapido = False
+        if not _reportlab_testado():
+            logging.warning(f"ReportLab {reportlab.Version} não conferido com o logo pré-comprimido; "
+                            "usando drawImage (rode testar_logo_pdf.py)")
+            return
+        try:
+            # Mesmo nome que o canvas.drawImage calcula: ao desenhar, ele encontra o objeto já registrado
+            dados = self.imagem.getRGBData()  # também separa o canal alfa em _dataA
+            alfa = self.imagem._dataA
+            mascara = alfa.getRGBData() if alfa else b'auto'
+            self.nome = _digester(dados + mascara)
+            self._objeto = PDFImageXObject(self.nome, self.imagem, mask='auto')
+            self._mascara = getattr(self._objeto, '_smask', None)
+            if self._mascara is not None:
+                del self._objeto._smask
+            self.rapido = True
+        except Exception as e:
+            logging.warning(f"Logo pré-comprimido indisponível, usando drawImage: {e}")
+
+    def registrar(self, canv):
+        """Registra o XObject no documento do canvas, se ainda não estiver lá"""
+        if not self.rapido:
+            return
+        doc = canv._doc
+        nome_registro = doc.getXObjectName(self.nome)
+        if nome_registro in doc.idToObject:
+            return
+        try:
+            # O ReportLab amarra cada objeto ao primeiro documento em que é registrado
+            objeto = copy.copy(self._objeto)
+            canv._setXObjects(objeto)
+            mascara = None
+            if self._mascara is not None:
+                mascara = copy.copy(self._mascara)
+                canv._setXObjects(mascara)
+        except Exception as e:
+            self._desativar(e)
+            return
+        # Os objetos registrados a partir daqui têm número acima deste; numa falha eles
+        # saem do documento, que fica como se o logo nunca tivesse sido registrado
+        contador = doc.objectcounter
+        try:
+            doc.Reference(objeto, nome_registro)
+            doc.addForm(self.nome, objeto)
+            if mascara is not None:
+                objeto.smask = doc.Reference(mascara, doc.getXObjectName(mascara.name))
+        except Exception as e:
+            for numero in range(contador + 1, doc.objectcounter + 1):
+                nome = doc.numberToId.pop(numero, None)
+                doc.idToObject.pop(nome, None)
+                doc.idToObjectNumberAndVersion.pop(nome, None)
+            doc.objectcounter = contador
+            doc.inObject = None
+            self._desativar(e)
+
+    def _desativar(self, erro):
+        # O drawImage a seguir embute o logo pelo caminho público
+        self.rapido = False
+        logging.warning(f"Falha no logo pré-comprimido, usando drawImage: {erro}")
+
+class LogoFicha(Flowable):
+    """Flowable do logo no cabeçalho; leve, criado a cada ficha a partir de um LogoPdf"""
+
+    def __init__(self, logo, largura, altura):
+        Flowable.__init__(self)
+        self.logo = logo
+        self.width = largura
+        self.height = altura
+        self.hAlign = 'LEFT'
+
+    def wrap(self, availWidth, availHeight):
+        return self.width, self.height
+
+    def draw(self):
+        self.logo.registrar(self.canv)
+        self.canv.drawImage(self.logo.imagem, 0, 0, self.width, self.height, mask='auto')
+
+class ModeloFichaPdf:
+    """Partes fixas da ficha (estilos, TableStyles e logo), montadas uma vez por processo.
+    
+    ``renderizar`` só preenche os dados do elevador. Use obter_modelo_ficha em vez de
+    instanciar diretamente.
+    """
+
+    def __init__(self, logo_path):
+        # Configurar estilos com fontes maiores
+        styles = getSampleStyleSheet()
+        
+        self.title_style = ParagraphStyle('CustomTitle',
+                                          parent=styles['Heading1'],
+                                          fontSize=FONTE_TITULO,
+                                          spaceAfter=ESPACAMENTO_TITULO,
+                                          alignment=1)  # Centralizado
+        
+        self.section_style = ParagraphStyle('SectionStyle',
+                                            parent=styles['Heading2'],
+                                            fontSize=FONTE_SECAO,
+                                            spaceAfter=ESPACAMENTO_SECAO_DEPOIS,
+                                            spaceBefore=ESPACAMENTO_SECAO_ANTES,
+                                            textColor=colors.darkblue,
+                                            alignment=1)
+        
+        self.small_style = ParagraphStyle('Small',
+                                          parent=styles['Normal'],
+                                          fontSize=FONTE_RODAPE,
+                                          spaceAfter=ESPACAMENTO_RODAPE)
+        
+        self.text_style = ParagraphStyle('Text',
+                                         parent=styles['Normal'],
+                                         fontSize=FONTE_TABELA,
+                                         spaceAfter=ESPACAMENTO_GERAL)
+        
+        # Estilos das tabelas (pedido e cliente usam o mesmo)
+        self.estilo_cabecalho_dados = TableStyle([
+            ('FONTSIZE', (0, 0), (-1, -1), FONTE_CABECALHO),
+            ('BOTTOMPADDING', (0, 0), (-1, -1), ESPACAMENTO_TABELA_HORIZONTAL),
+            ('TOPPADDING', (0, 0), (-1, -1), ESPACAMENTO_TABELA_HORIZONTAL),
+            ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+        ])
+        
+        self.estilo_cabecalho = TableStyle([
+            ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
+            ('ALIGN', (1, 0), (1, 0), 'RIGHT'),
+            ('LEFTPADDING', (0, 0), (-1, -1), 0),
+            ('RIGHTPADDING', (0, 0), (-1, -1), 0),
+        ])
+        
+        self.estilo_info = TableStyle([
+            ('FONTSIZE', (0, 0), (-1, -1), FONTE_TABELA),
+            ('BOTTOMPADDING', (0, 0), (-1, -1), ESPACAMENTO_TABELA_HORIZONTAL),
+            ('TOPPADDING', (0, 0), (-1, -1), ESPACAMENTO_TABELA_HORIZONTAL),
+            ('GRID', (0, 0), (-1, -1), 0.5, colors.gray),
+            ('BACKGROUND', (0, 0), (0, -1), colors.lightgrey),
+            ('BACKGROUND', (2, 0), (2, -1), colors.lightgrey),
+        ])
+        
+        self.estilo_cabine = TableStyle([
+            ('FONTSIZE', (0, 0), (-1, -1), FONTE_TABELA),
+            ('BOTTOMPADDING', (0, 0), (-1, -1), ESPACAMENTO_TABELA_HORIZONTAL),
+            ('TOPPADDING', (0, 0), (-1, -1), ESPACAMENTO_TABELA_HORIZONTAL),
+            ('GRID', (0, 0), (-1, -1), 0.5, colors.gray),
+            ('BACKGROUND', (0, 0), (0, -1), colors.lightblue),
+        ])
+        
+        self.estilo_cabine_desenho = TableStyle([
+            ('VALIGN', (0, 0), (-1, -1), 'TOP'),
+            ('LEFTPADDING', (0, 0), (-1, -1), 5),
+            ('RIGHTPADDING', (0, 0), (-1, -1), 5),
+        ])
+        
+        self.estilo_coluna = TableStyle([
+            ('FONTSIZE', (0, 0), (-1, -1), FONTE_TABELA),
+            ('BOTTOMPADDING', (0, 0), (-1, -1), ESPACAMENTO_TABELA_HORIZONTAL),
+            ('TOPPADDING', (0, 0), (-1, -1), ESPACAMENTO_TABELA_HORIZONTAL),
+            ('GRID', (0, 0), (-1, -1), 0.5, colors.gray),
+            ('BACKGROUND', (0, 0), (0, -1), colors.lightgreen),
+            ('BACKGROUND', (2, 0), (2, -1), colors.lightgreen),
+        ])
+        
+        self.estilo_adicionais = TableStyle([
+            ('FONTSIZE', (0, 0), (-1, -1), FONTE_TABELA),
+            ('BOTTOMPADDING', (0, 0), (-1, -1), ESPACAMENTO_TABELA_HORIZONTAL),
+            ('TOPPADDING', (0, 0), (-1, -1), ESPACAMENTO_TABELA_HORIZONTAL),
+            ('GRID', (0, 0), (-1, -1), 0.5, colors.gray),
+            ('BACKGROUND', (0, 0), (0, -1), colors.lightyellow),
+            ('BACKGROUND', (2, 0), (2, -1), colors.lightyellow),
+        ])
+        
+        self.logo = LogoPdf(logo_path) if os.path.exists(logo_path) else None
+
+    def renderizar(self, result):
+        """Monta a ficha a partir de uma linha de PDF_ELEVADOR_SQL (app.py) e retorna os bytes do PDF"""
+        # Preparar dados
+        endereco_completo = 'Não informado'
+        if result[30]:  # rua
+            endereco_completo = f"{result[30]}, {result[31]}"
+            if result[32]:  # complemento
+                endereco_completo += f", {result[32]}"
+            endereco_completo += f" - {result[33]}/{result[34]} - CEP: {result[35]}"
+        
+        # Criar buffer em memória
+        buffer = BytesIO()
+        
+        # Configurar documento PDF - margens configuráveis
+        doc = SimpleDocTemplate(buffer, pagesize=A4,
+                              rightMargin=MARGEM_DIREITA, leftMargin=MARGEM_ESQUERDA,
+                              topMargin=MARGEM_SUPERIOR, bottomMargin=MARGEM_INFERIOR)
+        
+        # Conteúdo do PDF
+        story = []
+        
+        # # Título principal
+        # title = Paragraph(f"RELATÓRIO DO ELEVADOR #{result[0]}", self.title_style)
+        # story.append(title)
+        # story.append(Spacer(1, 4))
+        
+        # ====== CABEÇALHO COM LOGO, PEDIDO E CLIENTE ======
+        pedido_data = [
+            ['OS:', str(result[6]) if result[6] else 'N/A'],
+            ['Data Venda:', result[7].strftime('%d/%m/%Y') if result[7] else 'N/A'],
+            ['Data Entrega:', result[8].strftime('%d/%m/%Y') if result[8] else 'N/A']
+        ]
+        
+        if result[33] and result[34]:
+            cidade_estado = f"{result[33]}, {result[34]}"
+        elif result[33]:
+            cidade_estado = result[33]
+        else:
+            cidade_estado = 'N/A'
+        
+        cliente_data = [
+            ['Cliente:', result[10] or 'N/A'],
+            ['Cidade:', cidade_estado]
+        ]
+        
+        pedido_table = Table(pedido_data, colWidths=[LARGURA_CABECALHO_1, LARGURA_CABECALHO_2])
+        pedido_table.setStyle(self.estilo_cabecalho_dados)
+        
+        # Cabeçalho: logo à esquerda, pedido à direita - larguras otimizadas
+        if self.logo:
+            logo_img = LogoFicha(self.logo, LOGO_LARGURA, LOGO_ALTURA)
+            cabecalho_table = Table([[logo_img, pedido_table]], colWidths=[8*cm, 6*cm])
+        else:
+            cabecalho_table = Table([['', pedido_table]], colWidths=[8*cm, 6*cm])
+        cabecalho_table.setStyle(self.estilo_cabecalho)
+        story.append(cabecalho_table)
+        
+        # Cliente_data logo abaixo do cabeçalho
+        cliente_table = Table(cliente_data, colWidths=[LARGURA_CABECALHO_1, LARGURA_CABECALHO_3])
+        cliente_table.setStyle(self.estilo_cabecalho_dados)
+        story.append(cliente_table)
+        story.append(Spacer(1, ESPACAMENTO_GERAL))
+        
+        # SETOR 1: INFORMAÇÕES BÁSICAS
+        section_title = Paragraph("INFORMAÇÕES BÁSICAS", self.section_style)
+        story.append(section_title)
+        
+        info_data = [
+            ['Comando:', result[1] or 'Não informado', 'Cor:', result[5] or 'Não especificada'],
+            ['Porta Inferior:', result[3] or 'N/A', 'Porta Superior:', result[4] or 'N/A']]
+        
+        info_table = Table(info_data, colWidths=[LARGURA_INFO_COLUNA_1, LARGURA_INFO_COLUNA_2, LARGURA_INFO_COLUNA_3, LARGURA_INFO_COLUNA_4])
+        info_table.setStyle(self.estilo_info)
+        story.append(info_table)
+        story.append(Spacer(1, ESPACAMENTO_TABELA_SECAO))
+        
+        if result[2]:
+            text = f'Observação: {result[2]}.'
+        else:
+            text = 'Sem observações.'
+        obs = Paragraph(text, self.text_style)
+        story.append(obs)
+        
+        # SETOR 2 e 3: CABINE E DESENHO (lado a lado)
+        section_title = Paragraph("CABINE E VISUALIZAÇÃO", self.section_style)
+        story.append(section_title)
+        
+        # Dados da cabine
+        cabine_data = [
+            ['Altura:', str(result[12]) if result[12] else 'N/A'],
+            ['Largura:', str(result[13]) if result[13] else 'N/A'],
+            ['Profundidade:', str(result[14]) if result[14] else 'N/A'],
+            ['Piso:', result[15] or 'N/A'],
+            ['Montada:', 'Sim' if result[16] else 'Não'],
+            ['Entrada:', result[17] or 'N/A'],
+            ['Saída:', result[18] or 'N/A']
+        ]
+        
+        cabine_table = Table(cabine_data, colWidths=[LARGURA_CABINE_COLUNA_1, LARGURA_CABINE_COLUNA_2])
+        cabine_table.setStyle(self.estilo_cabine)
+        
+        # Criar desenho da cabine
+        desenho_cabine = criar_desenho_cabine(
+            result[13],  # largura
+            result[14],  # profundidade
+            result[17],  # lado_entrada
+            result[18]   # lado_saida
+        )
+        
+        # Juntar cabine e desenho lado a lado
+        cabine_desenho_table = Table([[cabine_table, desenho_cabine]], colWidths=[LARGURA_DESENHO_CABINE, LARGURA_DESENHO_VISUAL])
+        cabine_desenho_table.setStyle(self.estilo_cabine_desenho)
+        story.append(cabine_desenho_table)
+        story.append(Spacer(1, ESPACAMENTO_TABELA_SECAO))
+        
+        # SETOR 4: COLUNA E ESTRUTURA
+        section_title = Paragraph("COLUNA E ESTRUTURA", self.section_style)
+        story.append(section_title)
+        
+        coluna_data = [
+            ['Elevação:', str(result[19]) if result[19] else 'N/A', 'Coluna Montada:', 'Sim' if result[20] else 'Não'],
+            ['Galvanizada:', 'Sim' if result[29] else 'Não', '', '']
+        ]
+        
+        coluna_table = Table(coluna_data, colWidths=[LARGURA_ESTRUTURA_COLUNA_1, LARGURA_ESTRUTURA_COLUNA_2, LARGURA_ESTRUTURA_COLUNA_3, LARGURA_ESTRUTURA_COLUNA_4])
+        coluna_table.setStyle(self.estilo_coluna)
+        story.append(coluna_table)
+        story.append(Spacer(1, ESPACAMENTO_TABELA_SECAO))
+        
+        # SETOR 5: ADICIONAIS
+        section_title = Paragraph("ADICIONAIS", self.section_style)
+        story.append(section_title)
+        
+        adicionais_data = [
+            ['Cancela:', str(result[21]) if result[21] else '0', 'Porta:', str(result[22]) if result[22] else '0'],
+            ['Portão:', str(result[23]) if result[23] else '0', 'Barreira Eletrônica:', str(result[24]) if result[24] else '0'],
+            ['Lados Enclausuramento:', str(result[25]) if result[25] else '0', 'Sensor Esmagamento:', str(result[26]) if result[26] else '0'],
+            ['Rampa Acesso:', str(result[27]) if result[27] else '0', 'NoBreak:', str(result[28]) if result[28] else '0']
+        ]
+        
+        adicionais_table = Table(adicionais_data, colWidths=[LARGURA_ADICIONAIS_COLUNA_1, LARGURA_ADICIONAIS_COLUNA_2, LARGURA_ADICIONAIS_COLUNA_3, LARGURA_ADICIONAIS_COLUNA_4])
+        adicionais_table.setStyle(self.estilo_adicionais)
+        story.append(adicionais_table)
+        story.append(Spacer(1, ESPACAMENTO_RODAPE))
+        
+        # Sem rodapé com data/hora de geração: a ficha fica em cache (CachePdf, app.py)
+        # e seria servida depois com o horário da primeira renderização
+        
+        # Construir PDF
+        doc.build(story)
+        
+        # Obter dados do buffer
+        pdf_data = buffer.getvalue()
+        buffer.close()
+        return pdf_data
+
+# Um modelo por logo, criado no primeiro PDF de cada processo
+_modelos_ficha = {}
+_modelos_ficha_lock = threading.Lock()
+
+def obter_modelo_ficha(logo_path):
+    """Retorna o ModeloFichaPdf do processo, montando-o na primeira chamada"""
+    modelo = _modelos_ficha.get(logo_path)
+    if modelo is None:
+        with _modelos_ficha_lock:
+            modelo = _modelos_ficha.get(logo_path)
+            if modelo is None:
+                modelo = _modelos_ficha[logo_path] = ModeloFichaPdf(logo_path)
+    return modelo
+
+def renderizar_pdf_elevador(result, logo_path):
+    """Monta a ficha do elevador a partir de uma linha de PDF_ELEVADOR_SQL (app.py) e retorna os bytes do PDF"""
+    return obter_modelo_ficha(logo_path).renderizar(result)
+
+class ServicoSaturadoError(Exception):
+    """A fila de renderização está cheia; o cliente deve tentar de novo mais tarde."""
+
+class ServicoRenderizacaoPdf:
+    """Renderiza fichas num ProcessPoolExecutor, fora das threads das requisições.
+
+    - ``workers``: processos de renderização (padrão: número de CPUs)
+    - ``max_fila``: tarefas aceitas ao mesmo tempo, em execução ou aguardando;
+      acima disso ``submeter`` levanta ServicoSaturadoError
+    - ``timeout``: espera máxima por um PDF em ``renderizar``
+
+    O pool só é criado no primeiro uso e é recriado se um processo morrer. Uma tarefa
+    que estoura o timeout já em execução não pode ser cancelada: ``reciclar`` encerra
+    os processos do pool e zera a fila, para que ela não prenda o processo e a vaga.
+    """
+
+    # Função executada nos processos do pool (precisa ser importável por eles)
+    tarefa = staticmethod(renderizar_pdf_elevador)
+
+    def __init__(self, workers=None, max_fila=None, timeout=30):
+        self.workers = workers or os.cpu_count() or 1
+        self.max_fila = max_fila or self.workers * 4
+        self.timeout = timeout
+        self._vagas = threading.BoundedSemaphore(self.max_fila)
+        self._executor = None
+        self._executores = {}  # tarefa pendente -> pool em que foi submetida
+        self._lock = threading.Lock()
+        self._stats = {
+            'renderizados': 0,
+            'falhas': 0,
+            'rejeitados': 0,
+            'timeouts': 0,
+            'reciclagens': 0,
+            'em_fila': 0,
+        }
+
+    def _obter_executor(self, recriar=False):
+        with self._lock:
+            if recriar and self._executor is not None:
+                self._executor.shutdown(wait=False, cancel_futures=True)
+                self._executor = None
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(max_workers=self.workers)
+            return self._executor
+
+    def submeter(self, result, logo_path, espera=0):
+        """Agenda a renderização e retorna o Future com os bytes do PDF.
+
+        ``espera`` é quanto aguardar por uma vaga na fila (0 = não aguardar).
+        """
+        vagas = self._vagas
+        if espera:
+            vaga = vagas.acquire(timeout=espera)
+        else:
+            vaga = vagas.acquire(blocking=False)
+        if not vaga:
+            with self._lock:
+                self._stats['rejeitados'] += 1
+            raise ServicoSaturadoError("Fila de geração de PDF cheia")
+        try:
+            executor = self._obter_executor()
+            try:
+                futuro = executor.submit(self.tarefa, result, logo_path)
+            except BrokenProcessPool:
+                executor = self._obter_executor(recriar=True)
+                futuro = executor.submit(self.tarefa, result, logo_path)
+        except Exception:
+            vagas.release()
+            raise
+        with self._lock:
+            self._stats['em_fila'] += 1
+            self._executores[futuro] = executor
+        futuro.add_done_callback(partial(self._concluido, vagas))
+        return futuro
+
+    def _concluido(self, vagas, futuro):
+        # A vaga volta ao semáforo em que foi reservada: depois de uma reciclagem, o
+        # semáforo antigo é descartado e as tarefas do pool encerrado não contam mais
+        vagas.release()
+        with self._lock:
+            self._executores.pop(futuro, None)
+            if vagas is self._vagas:
+                self._stats['em_fila'] -= 1
+            if futuro.cancelled() or futuro.exception() is not None:
+                self._stats['falhas'] += 1
+            else:
+                self._stats['renderizados'] += 1
+
+    def desistir(self, futuro):
+        """Abandona uma tarefa que passou do prazo.
+
+        Se ela ainda estava na fila, só é cancelada; se já estava em execução, o pool
+        é reciclado para liberar o processo e a vaga.
+        """
+        with self._lock:
+            self._stats['timeouts'] += 1
+        if not futuro.cancel():
+            self.reciclar(futuro)
+
+    def reciclar(self, futuro=None):
+        """Encerra os processos do pool atual e recomeça com pool e fila novos.
+
+        Com ``futuro``, só recicla se a tarefa ainda estiver pendente no pool atual
+        (outra requisição pode já ter reciclado por causa dela). As demais tarefas do
+        pool encerrado terminam com BrokenProcessPool.
+        """
+        with self._lock:
+            executor = self._executor
+            if executor is None:
+                return
+            if futuro is not None and self._executores.get(futuro) is not executor:
+                return
+            self._executor = None
+            self._vagas = threading.BoundedSemaphore(self.max_fila)
+            self._stats['em_fila'] = 0
+            self._stats['reciclagens'] += 1
+        _terminar_executor(executor)
+
+    def renderizar(self, result, logo_path):
+        """Renderiza e espera o PDF; levanta ServicoSaturadoError ou TimeoutError."""
+        futuro = self.submeter(result, logo_path)
+        try:
+            return futuro.result(timeout=self.timeout)
+        except FuturesTimeoutError:
+            self.desistir(futuro)
+            raise
+
+    def stats(self):
+        with self._lock:
+            return {'workers': self.workers, 'max_fila': self.max_fila,
+                    'timeout': self.timeout, **self._stats}
+
+    def encerrar(self):
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=False, cancel_futures=True)
+                self._executor = None
+
+def _terminar_executor(executor):
+    """Encerra o pool sem esperar as tarefas em execução"""
+    if hasattr(executor, 'terminate_workers'):  # Python 3.14+
+        executor.terminate_workers()
+        return
+    # Antes do 3.14 não há API pública para isso: os processos ficam em _processes
+    processos = list((getattr(executor, '_processes', None) or {}).values())
+    executor.shutdown(wait=False, cancel_futures=True)
+    for processo in processos:
+        processo.terminate()
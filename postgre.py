@@ -1,7 +1,12 @@
 #import csv
 from dotenv import load_dotenv
 import os
+import select
+import threading
+import time
+from collections import deque
 import psycopg2
+import psycopg2.extensions
 #import pandas as pd
 
 # Carregar variáveis do arquivo .env
@@ -13,6 +18,14 @@ PASSWORD = os.getenv('PG_PASSWORD')
 HOST = os.getenv('PG_HOST')
 PORT = os.getenv('PG_PORT')
 
+# Configuração do pool de conexões (todas opcionais no .env)
+POOL_MIN = int(os.getenv('PG_POOL_MIN', '1'))
+POOL_MAX = int(os.getenv('PG_POOL_MAX', '10'))
+POOL_MAX_LIFETIME = float(os.getenv('PG_POOL_MAX_LIFETIME', '1800'))  # segundos de vida de uma conexão
+POOL_MAX_IDLE = float(os.getenv('PG_POOL_MAX_IDLE', '300'))           # segundos ociosa antes de ser fechada
+POOL_TIMEOUT = float(os.getenv('PG_POOL_TIMEOUT', '10'))              # espera máxima por uma conexão livre
+POOL_HEALTH_CHECK_AFTER = float(os.getenv('PG_POOL_HEALTH_CHECK_AFTER', '5'))  # ociosidade que exige SELECT 1
+
 def create_database():
     conn = psycopg2.connect(
         dbname='postgres',
@@ -65,13 +78,419 @@ def create_pg_connection(verbose=False):
         return None
 
 def end_pg_connection(conn, verbose=False):
-    """Faz commit e encerra a conexão com o banco de dados."""
+    """Faz commit e encerra a conexão com o banco de dados.
+
+    Conexões obtidas do pool são devolvidas a ele em vez de fechadas.
+    """
     if conn:
+        pool = getattr(conn, 'pool', None)
+        if pool is not None:
+            pool.putconn(conn)
+            if verbose:
+                print("Conexão devolvida ao pool.")
+            return
         conn.commit()
         conn.close()
         if verbose:
             print("Conexão encerrada.")
-            
+
+class PooledConnection(psycopg2.extensions.connection):
+    """Conexão psycopg2 que guarda a qual pool pertence e suas idades."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.pool = None
+        self.created_at = time.monotonic()
+        self.last_used = self.created_at
+
+class PoolTimeoutError(Exception):
+    """Nenhuma conexão ficou livre dentro do tempo de espera do pool."""
+
+class PgConnectionPool:
+    """Pool de conexões PostgreSQL thread-safe.
+
+    - ``min_size``/``max_size``: conexões mantidas abertas / limite total
+    - ``max_lifetime``: conexões mais velhas que isso são recicladas
+    - ``max_idle``: conexões ociosas além de ``min_size`` são fechadas após esse tempo
+    - ``health_check_after``: conexões ociosas há mais que isso são testadas com
+      ``SELECT 1`` antes de serem entregues
+    """
+
+    def __init__(self, min_size=POOL_MIN, max_size=POOL_MAX, max_lifetime=POOL_MAX_LIFETIME,
+                 max_idle=POOL_MAX_IDLE, timeout=POOL_TIMEOUT,
+                 health_check_after=POOL_HEALTH_CHECK_AFTER, reap_interval=30):
+        if max_size < 1:
+            raise ValueError("max_size deve ser pelo menos 1")
+        self.min_size = max(0, min(min_size, max_size))
+        self.max_size = max_size
+        self.max_lifetime = max_lifetime
+        self.max_idle = max_idle
+        self.timeout = timeout
+        self.health_check_after = health_check_after
+        self.reap_interval = reap_interval
+
+        self._idle = deque()
+        self._size = 0
+        self._waiting = 0
+        self._closed = False
+        self._cond = threading.Condition()
+        self._stats = {
+            'conexoes_criadas': 0,
+            'conexoes_fechadas': 0,
+            'checkouts': 0,
+            'timeouts': 0,
+            'falhas_health_check': 0,
+        }
+
+        self._reaper = threading.Thread(target=self._reap_loop, name='pg-pool-reaper', daemon=True)
+        self._reaper.start()
+
+    def _connect(self):
+        """Abre uma nova conexão física. Chamado fora do lock."""
+        conn = psycopg2.connect(
+            dbname=NAME,
+            user=USER,
+            password=PASSWORD,
+            host=HOST,
+            port=PORT,
+            connection_factory=PooledConnection
+        )
+        conn.pool = self
+        return conn
+
+    def _discard(self, conn):
+        """Fecha uma conexão e libera sua vaga. Deve ser chamado com o lock."""
+        try:
+            conn.close()
+        except Exception:
+            pass
+        self._size -= 1
+        self._stats['conexoes_fechadas'] += 1
+        self._cond.notify()
+
+    def _expired(self, conn, now):
+        return conn.closed or (self.max_lifetime and now - conn.created_at > self.max_lifetime)
+
+    def _healthy(self, conn, now):
+        """Testa uma conexão que ficou ociosa tempo demais. Chamado fora do lock."""
+        if now - conn.last_used < self.health_check_after:
+            return True
+        try:
+            cursor = conn.cursor()
+            cursor.execute("SELECT 1")
+            cursor.close()
+            conn.rollback()
+            return True
+        except Exception:
+            return False
+
+    def _reserve(self, deadline):
+        """Retira uma conexão ociosa ou reserva uma vaga para uma nova (retorna None).
+        Deve ser chamado com o lock."""
+        while True:
+            if self._closed:
+                raise psycopg2.InterfaceError("Pool de conexões encerrado")
+
+            while self._idle:
+                conn = self._idle.pop()  # LIFO: a mais recente está mais "quente"
+                if self._expired(conn, time.monotonic()):
+                    self._discard(conn)
+                    continue
+                return conn
+
+            if self._size < self.max_size:
+                self._size += 1
+                return None
+
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                self._stats['timeouts'] += 1
+                raise PoolTimeoutError(
+                    f"Nenhuma conexão livre após {self.timeout}s (máximo: {self.max_size})")
+            self._waiting += 1
+            try:
+                self._cond.wait(remaining)
+            finally:
+                self._waiting -= 1
+
+    def getconn(self):
+        """Retira uma conexão do pool, abrindo uma nova se houver vaga."""
+        deadline = time.monotonic() + self.timeout
+        while True:
+            with self._cond:
+                conn = self._reserve(deadline)
+            if conn is None:
+                break
+
+            # Health check fora do lock: um socket lento não trava os outros checkouts
+            # nem as devoluções (a conexão já saiu da fila e continua contando em _size)
+            now = time.monotonic()
+            if self._healthy(conn, now):
+                conn.last_used = now
+                with self._cond:
+                    self._stats['checkouts'] += 1
+                return conn
+            try:
+                conn.close()
+            except Exception:
+                pass
+            with self._cond:
+                self._stats['falhas_health_check'] += 1
+                self._stats['conexoes_fechadas'] += 1
+                self._size -= 1
+                self._cond.notify()
+
+        # Vaga reservada: conectar fora do lock para não bloquear as outras threads
+        try:
+            conn = self._connect()
+        except Exception:
+            with self._cond:
+                self._size -= 1
+                self._cond.notify()
+            raise
+        with self._cond:
+            self._stats['conexoes_criadas'] += 1
+            self._stats['checkouts'] += 1
+        return conn
+
+    def putconn(self, conn):
+        """Devolve uma conexão ao pool, fazendo commit do que estiver pendente."""
+        try:
+            if not conn.closed:
+                conn.commit()
+        except Exception:
+            try:
+                conn.rollback()
+            except Exception:
+                pass
+
+        with self._cond:
+            now = time.monotonic()
+            if self._closed or self._expired(conn, now) \
+                    or conn.info.transaction_status != psycopg2.extensions.TRANSACTION_STATUS_IDLE:
+                self._discard(conn)
+                return
+            conn.last_used = now
+            self._idle.append(conn)
+            self._cond.notify()
+
+    def _reap_loop(self):
+        while not self._closed:
+            time.sleep(self.reap_interval)
+            try:
+                self.reap()
+            except Exception as e:
+                print(f"Erro na manutenção do pool de conexões: {e}")
+
+    def reap(self):
+        """Fecha conexões ociosas/expiradas e repõe o mínimo configurado."""
+        with self._cond:
+            now = time.monotonic()
+            keep = deque()
+            # Percorre da mais antiga para a mais recente
+            while self._idle:
+                conn = self._idle.popleft()
+                idle_for = now - conn.last_used
+                surplus = self._size > self.min_size
+                if self._expired(conn, now) or (surplus and self.max_idle and idle_for > self.max_idle):
+                    self._discard(conn)
+                else:
+                    keep.append(conn)
+            self._idle = keep
+            missing = self.min_size - self._size
+            self._size += max(0, missing)
+
+        for _ in range(max(0, missing)):
+            try:
+                conn = self._connect()
+            except Exception as e:
+                with self._cond:
+                    self._size -= 1
+                print(f"Erro ao abrir conexão mínima do pool: {e}")
+                continue
+            with self._cond:
+                self._stats['conexoes_criadas'] += 1
+                conn.last_used = time.monotonic()
+                self._idle.appendleft(conn)
+                self._cond.notify()
+
+    def stats(self):
+        """Retorna um retrato do estado atual do pool."""
+        with self._cond:
+            return {
+                'min': self.min_size,
+                'max': self.max_size,
+                'total': self._size,
+                'ociosas': len(self._idle),
+                'em_uso': self._size - len(self._idle),
+                'aguardando': self._waiting,
+                **self._stats,
+            }
+
+    def close(self):
+        """Fecha todas as conexões ociosas e recusa novos checkouts."""
+        with self._cond:
+            self._closed = True
+            while self._idle:
+                self._discard(self._idle.pop())
+            self._cond.notify_all()
+
+_pool = None
+_pool_lock = threading.Lock()
+
+def get_pg_pool():
+    """Retorna o pool de conexões do processo, criando-o na primeira chamada."""
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = PgConnectionPool()
+    return _pool
+
+def get_pooled_connection():
+    """Obtém uma conexão do pool. Devolva-a com ``end_pg_connection``."""
+    if not all([NAME, USER, PASSWORD, HOST, PORT]):
+        return create_pg_connection()
+    try:
+        return get_pg_pool().getconn()
+    except PoolTimeoutError as e:
+        print(f"Erro: {e}")
+        return None
+    except psycopg2.OperationalError as e:
+        print(f"Erro de conexão PostgreSQL: {e}")
+        return None
+    except Exception as e:
+        print(f"Erro ao conectar ao banco de dados: {e}")
+        return None
+
+def close_pg_pool():
+    """Encerra o pool de conexões do processo, se existir."""
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.close()
+            _pool = None
+
+class PgListener:
+    """Escuta um canal LISTEN/NOTIFY numa conexão dedicada (fora do pool).
+
+    Roda numa thread daemon e chama ``callback(payload)`` para cada notificação.
+    Se a conexão cair, reconecta com espera crescente (até ``max_retry_interval``)
+    e chama ``callback(None)`` ao reconectar, pois notificações podem ter se perdido.
+    """
+
+    def __init__(self, channel, callback, poll_interval=5, max_retry_interval=60):
+        self.channel = channel
+        self.callback = callback
+        self.poll_interval = poll_interval
+        self.max_retry_interval = max_retry_interval
+        self._stop = threading.Event()
+        self._thread = None
+        self._lock = threading.Lock()
+
+    def start(self):
+        """Inicia a thread de escuta, se ainda não estiver rodando."""
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._stop.clear()
+                self._thread = threading.Thread(target=self._run, name=f'pg-listen-{self.channel}',
+                                                daemon=True)
+                self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+
+    def _run(self):
+        retry_interval = 1
+        connected_before = False
+        while not self._stop.is_set():
+            conn = create_pg_connection()
+            if conn is None:
+                self._stop.wait(retry_interval)
+                retry_interval = min(retry_interval * 2, self.max_retry_interval)
+                continue
+            try:
+                conn.set_isolation_level(psycopg2.extensions.ISOLATION_LEVEL_AUTOCOMMIT)
+                cursor = conn.cursor()
+                cursor.execute(f'LISTEN "{self.channel}"')
+                retry_interval = 1
+                if connected_before:
+                    self._dispatch(None)
+                connected_before = True
+
+                while not self._stop.is_set():
+                    if select.select([conn], [], [], self.poll_interval) == ([], [], []):
+                        continue
+                    conn.poll()
+                    while conn.notifies:
+                        self._dispatch(conn.notifies.pop(0).payload)
+            except Exception as e:
+                print(f"Erro na escuta do canal '{self.channel}': {e}")
+                self._stop.wait(retry_interval)
+                retry_interval = min(retry_interval * 2, self.max_retry_interval)
+            finally:
+                try:
+                    conn.close()
+                except Exception:
+                    pass
+
+    def _dispatch(self, payload):
+        try:
+            self.callback(payload)
+        except Exception as e:
+            print(f"Erro ao tratar notificação do canal '{self.channel}': {e}")
+
+MIGRATIONS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'migrations')
+MIGRATIONS_LOCK_ID = 727001  # chave do advisory lock que serializa as migrações
+
+def apply_migrations(conn, verbose=False):
+    """Aplica, em ordem, os arquivos migrations/NNN_*.sql ainda não registrados.
+
+    As versões aplicadas ficam na tabela schema_migrations. Um advisory lock
+    impede que dois processos apliquem a mesma migração ao mesmo tempo.
+    """
+    cursor = conn.cursor()
+    try:
+        cursor.execute("SELECT pg_advisory_lock(%s)", (MIGRATIONS_LOCK_ID,))
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS public.schema_migrations
+            (
+                versao character varying(100) PRIMARY KEY,
+                aplicada_em timestamp DEFAULT now()
+            )
+        """)
+        conn.commit()
+
+        cursor.execute("SELECT versao FROM schema_migrations")
+        aplicadas = {row[0] for row in cursor.fetchall()}
+
+        arquivos = sorted(f for f in os.listdir(MIGRATIONS_DIR) if f.endswith('.sql')) \
+            if os.path.isdir(MIGRATIONS_DIR) else []
+        for arquivo in arquivos:
+            versao = arquivo[:-4]
+            if versao in aplicadas:
+                continue
+            with open(os.path.join(MIGRATIONS_DIR, arquivo), 'r', encoding='utf-8') as f:
+                sql = f.read()
+            try:
+                cursor.execute(sql)
+                cursor.execute("INSERT INTO schema_migrations (versao) VALUES (%s)", (versao,))
+                conn.commit()
+                if verbose:
+                    print(f"Migração {versao} aplicada.")
+            except Exception as e:
+                conn.rollback()
+                print(f"Erro ao aplicar migração {versao}: {e}")
+                return False
+        return True
+    finally:
+        try:
+            cursor.execute("SELECT pg_advisory_unlock(%s)", (MIGRATIONS_LOCK_ID,))
+            conn.commit()
+        except Exception:
+            pass
+        cursor.close()
+
 def drop_all_tables(conn):
     cursor = conn.cursor()
     try:
@@ -151,6 +570,8 @@ if __name__ == '__main__':
     cursor = conn.cursor()
     pop = False
 
+    apply_migrations(conn, True)
+
     # Desabilitado temporariamente para evitar conflitos com recreate_db.py
     if False and pop:
         drop_all_tables(conn)
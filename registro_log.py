@@ -0,0 +1,85 @@
+"""
+Logging assíncrono do HomeManager.
+
+Os handlers ficam atrás de um QueueHandler: quem loga só enfileira o registro e uma
+thread (QueueListener) grava no arquivo e no console. Assim a latência do disco não
+entra no tempo das requisições.
+
+    - homemanager.log: uma linha JSON por registro, com rotação por tamanho
+    - console: formato legível, como antes
+"""
+import os
+import json
+import queue
+import atexit
+import logging
+import logging.handlers
+from datetime import datetime, timezone
+
+# Atributos padrão de um LogRecord; o que não estiver aqui veio de extra={...}
+_ATRIBUTOS_PADRAO = set(vars(logging.LogRecord('', 0, '', 0, '', (), None))) | {'message', 'asctime'}
+
+class FormatadorJson(logging.Formatter):
+    """Formata o registro como uma linha JSON; campos passados em extra={...} entram no objeto"""
+
+    def format(self, record):
+        dados = {
+            'ts': datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec='milliseconds'),
+            'nivel': record.levelname,
+            'logger': record.name,
+            'msg': record.getMessage(),
+        }
+        for chave, valor in vars(record).items():
+            if chave not in _ATRIBUTOS_PADRAO and not chave.startswith('_'):
+                dados[chave] = valor
+        if record.exc_info:
+            dados['exc'] = self.formatException(record.exc_info)
+        return json.dumps(dados, ensure_ascii=False, default=str)
+
+_ouvinte = None
+_manipulador_fila = None
+
+def configurar_logging(arquivo='homemanager.log', nivel='INFO', max_bytes=10 * 1024 * 1024, backups=5):
+    """Troca os handlers do logger raiz pela fila assíncrona e inicia a thread de escrita"""
+    global _ouvinte, _manipulador_fila
+    if _ouvinte is not None:
+        return _ouvinte
+
+    arquivo_handler = logging.handlers.RotatingFileHandler(
+        arquivo, maxBytes=max_bytes, backupCount=backups, encoding='utf-8', delay=True)
+    arquivo_handler.setFormatter(FormatadorJson())
+
+    console_handler = logging.StreamHandler()
+    console_handler.setFormatter(logging.Formatter('%(asctime)s - %(levelname)s - %(message)s'))
+
+    fila = queue.Queue(-1)
+    _manipulador_fila = logging.handlers.QueueHandler(fila)
+    raiz = logging.getLogger()
+    for handler in list(raiz.handlers):
+        raiz.removeHandler(handler)
+    raiz.addHandler(_manipulador_fila)
+    raiz.setLevel(nivel)
+
+    _ouvinte = logging.handlers.QueueListener(fila, arquivo_handler, console_handler,
+                                              respect_handler_level=True)
+    _ouvinte.start()
+    atexit.register(encerrar_logging)
+    if hasattr(os, 'register_at_fork'):
+        os.register_at_fork(after_in_child=_reiniciar_no_processo_filho)
+    return _ouvinte
+
+def encerrar_logging():
+    """Grava o que ainda está na fila; chamar antes de os._exit"""
+    if _ouvinte is not None and _ouvinte._thread is not None:
+        _ouvinte.stop()
+
+def _reiniciar_no_processo_filho():
+    # A thread de escrita não sobrevive ao fork (workers do gunicorn): o filho
+    # ganha uma fila nova e a própria thread
+    if _ouvinte is None or _ouvinte._thread is None:
+        return
+    fila = queue.Queue(-1)
+    _manipulador_fila.queue = fila
+    _ouvinte.queue = fila
+    _ouvinte._thread = None
+    _ouvinte.start()
@@ -0,0 +1,155 @@
+"""
+Servidor de produção do HomeManager.
+
+O servidor de desenvolvimento do Flask (app.run) é de um processo só e não serve
+para uso contínuo. Aqui a aplicação roda no waitress (padrão, funciona no Windows)
+ou no gunicorn (Linux, vários processos), sempre com o modo debug desligado.
+
+Configuração pelo .env:
+    SERVIDOR_WSGI            waitress | gunicorn | desenvolvimento (padrão: waitress)
+    WSGI_WORKERS             processos do gunicorn (padrão: 2; o waitress usa um só)
+    WSGI_THREADS             threads por processo (padrão: 16; cada página aberta
+                             mantém uma conexão SSE ocupando uma thread)
+    WSGI_KEEPALIVE           segundos que uma conexão ociosa fica aberta (padrão: 5)
+    WSGI_TIMEOUT             segundos sem resposta antes de derrubar a conexão
+                             (waitress) ou o processo travado (gunicorn) (padrão: 60)
+    WSGI_TEMPO_ENCERRAMENTO  espera pelas requisições em andamento ao encerrar (padrão: 30)
+"""
+import os
+import sys
+import signal
+import logging
+
+SERVIDORES = ('waitress', 'gunicorn', 'desenvolvimento')
+
+_ao_encerrar = []
+
+def ao_encerrar(funcao):
+    """Registra uma função chamada quando o servidor começa a encerrar, antes de
+    esperar as requisições em andamento (ex.: fechar streams que nunca terminam)"""
+    _ao_encerrar.append(funcao)
+    return funcao
+
+def _executar_ao_encerrar():
+    for funcao in _ao_encerrar:
+        try:
+            funcao()
+        except Exception as e:
+            logging.warning(f"Erro ao encerrar ({funcao.__name__}): {e}")
+
+def servidor_da_linha_de_comando(argv=None):
+    """Lê --servidor=<nome> dos argumentos (sobrepõe SERVIDOR_WSGI do .env)"""
+    for arg in (sys.argv[1:] if argv is None else argv):
+        if arg.startswith('--servidor='):
+            return arg.split('=', 1)[1]
+    return None
+
+def configuracao_servidor(servidor=None):
+    """Lê a configuração do servidor do ambiente; ``servidor`` sobrepõe SERVIDOR_WSGI"""
+    servidor = (servidor or os.getenv('SERVIDOR_WSGI') or 'waitress').lower()
+    if servidor not in SERVIDORES:
+        logging.warning(f"SERVIDOR_WSGI inválido ({servidor}), usando waitress")
+        servidor = 'waitress'
+    return {
+        'servidor': servidor,
+        'workers': max(1, int(os.getenv('WSGI_WORKERS', '2'))),
+        'threads': max(1, int(os.getenv('WSGI_THREADS', '16'))),
+        'keepalive': int(os.getenv('WSGI_KEEPALIVE', '5')),
+        'timeout': int(os.getenv('WSGI_TIMEOUT', '60')),
+        'tempo_encerramento': int(os.getenv('WSGI_TEMPO_ENCERRAMENTO', '30')),
+    }
+
+def servir(app, host='127.0.0.1', port=5000, servidor=None):
+    """Roda a aplicação no servidor configurado até receber SIGINT/SIGTERM"""
+    config = configuracao_servidor(servidor)
+    app.debug = False
+
+    if config['servidor'] == 'gunicorn' and os.name == 'nt':
+        logging.warning("gunicorn não roda no Windows, usando waitress")
+        config['servidor'] = 'waitress'
+
+    if config['servidor'] == 'gunicorn':
+        try:
+            return _servir_gunicorn(app, host, port, config)
+        except ImportError:
+            logging.warning("gunicorn não instalado, usando waitress")
+            config['servidor'] = 'waitress'
+
+    if config['servidor'] == 'waitress':
+        try:
+            return _servir_waitress(app, host, port, config)
+        except ImportError:
+            logging.warning("waitress não instalado (pip install -r requirements.txt), "
+                            "usando o servidor de desenvolvimento")
+
+    print(f"⚠️  Servidor de desenvolvimento em http://{host}:{port} (debug desligado)")
+    app.run(host=host, port=port, debug=False, use_reloader=False, threaded=True)
+
+def _servir_waitress(app, host, port, config):
+    from waitress.server import create_server
+
+    servidor = create_server(
+        app,
+        host=host,
+        port=port,
+        threads=config['threads'],
+        channel_timeout=max(config['keepalive'], config['timeout']),
+        cleanup_interval=max(1, min(config['keepalive'], 30)),
+        connection_limit=max(100, config['threads'] * 8),
+        ident='HomeManager',
+    )
+
+    # SIGINT/SIGTERM viram SystemExit, que o waitress trata como pedido de encerramento
+    def encerrar(signum, frame):
+        _executar_ao_encerrar()
+        sys.exit(0)
+    signal.signal(signal.SIGINT, encerrar)
+    signal.signal(signal.SIGTERM, encerrar)
+
+    print(f"🚀 waitress em http://{host}:{port} ({config['threads']} threads)")
+    try:
+        # Ao sair do loop o waitress para as threads, esperando no máximo 5s
+        servidor.run()
+    finally:
+        servidor.close()  # para de aceitar conexões
+        # Completa a espera pelas requisições em andamento até WSGI_TEMPO_ENCERRAMENTO
+        servidor.task_dispatcher.shutdown(timeout=config['tempo_encerramento'])
+        print("👋 Servidor encerrado")
+
+def _servir_gunicorn(app, host, port, config):
+    from gunicorn.app.base import BaseApplication
+    from postgre import close_pg_pool
+
+    class AplicacaoGunicorn(BaseApplication):
+        def load_config(self):
+            opcoes = {
+                'bind': f'{host}:{port}',
+                'workers': config['workers'],
+                # gthread: conexões SSE longas não bloqueiam o processo inteiro
+                'worker_class': 'gthread',
+                'threads': config['threads'],
+                'keepalive': config['keepalive'],
+                'timeout': config['timeout'],
+                'graceful_timeout': config['tempo_encerramento'],
+                'post_worker_init': post_worker_init,
+            }
+            for chave, valor in opcoes.items():
+                self.cfg.set(chave, valor)
+
+        def load(self):
+            return app
+
+    def post_worker_init(worker):
+        # O worker gthread espera as requisições em andamento ao receber SIGTERM
+        handle_exit = worker.handle_exit
+        def encerrar(signum, frame):
+            _executar_ao_encerrar()
+            handle_exit(signum, frame)
+        signal.signal(signal.SIGTERM, encerrar)
+
+    # As conexões abertas no import do app (migrações) não podem ser herdadas pelos
+    # processos filhos; cada um cria o próprio pool no primeiro uso
+    close_pg_pool()
+
+    print(f"🚀 gunicorn em http://{host}:{port} ({config['workers']} processos x {config['threads']} threads)")
+    AplicacaoGunicorn().run()
@@ -84,6 +84,23 @@ def setup_database():
         print(f"❌ Erro ao configurar banco de dados: {e}")
         return False
 
+def build_static():
+    """Gera os pacotes JavaScript, as cópias com hash dos arquivos estáticos, o manifesto
+    e as variantes .gz/.br (o app não gera nada disso ao iniciar)"""
+    print("🔖 Versionando arquivos estáticos...")
+    try:
+        from pacotes_js import construir_pacotes, formatar_relatorio
+        from estaticos import gerar_manifesto
+        from compressao import precomprimir_estaticos
+        print(formatar_relatorio(construir_pacotes("static", forcar=True)))
+        manifesto = gerar_manifesto("static")
+        print(f"✅ {len(manifesto)} arquivos versionados")
+        print(f"🗜️  {precomprimir_estaticos('static')} variantes comprimidas geradas")
+        return True
+    except Exception as e:
+        print(f"❌ Erro ao versionar arquivos estáticos: {e}")
+        return False
+
 def run_app():
     """Executa a aplicação"""
     print("🚀 Iniciando aplicação...")
@@ -125,9 +142,10 @@ def main():
         print("2. Configurar banco de dados")
         print("3. Executar aplicação")
         print("4. Fazer tudo (setup completo)")
-        print("5. Sair")
+        print("5. Versionar arquivos estáticos")
+        print("6. Sair")
         
-        escolha = input("\n➤ Digite sua escolha (1-5): ").strip()
+        escolha = input("\n➤ Digite sua escolha (1-6): ").strip()
         
         if escolha == "1":
             install_requirements()
@@ -136,10 +154,12 @@ def main():
         elif escolha == "3":
             run_app()
         elif escolha == "4":
-            if install_requirements() and setup_database():
+            if install_requirements() and setup_database() and build_static():
                 print("\n🎉 Setup completo! Iniciando aplicação...")
                 run_app()
         elif escolha == "5":
+            build_static()
+        elif escolha == "6":
             print("👋 Até logo!")
             break
         else:
@@ -21,6 +21,7 @@ def verificar_ambiente():
     try:
         import flask
         import psycopg2
+        import waitress
         from dotenv import load_dotenv
         print("✅ Dependências encontradas!")
     except ImportError as e:
@@ -42,6 +43,11 @@ PG_PORT=5432
 # Configurações da Aplicação
 FLASK_ENV=development
 FLASK_DEBUG=True
+
+# Servidor de produção (ver servidor_wsgi.py)
+SERVIDOR_WSGI=waitress
+WSGI_THREADS=16
+WSGI_TIMEOUT=60
 """
     
     with open(".env", "w", encoding="utf-8") as f:
@@ -172,9 +178,11 @@ def executar_sistema():
     print("="*60)
     
     try:
-        # Importar e executar a aplicação
+        # Importar e executar a aplicação no servidor de produção (SERVIDOR_WSGI no .env
+        # ou --servidor=waitress|gunicorn|desenvolvimento na linha de comando)
         from app import app
-        app.run(debug=False, host='0.0.0.0', port=5000, use_reloader=False)
+        from servidor_wsgi import servir, servidor_da_linha_de_comando
+        servir(app, host='0.0.0.0', port=5000, servidor=servidor_da_linha_de_comando())
         
     except KeyboardInterrupt:
         print("\n👋 Sistema encerrado pelo usuário")
@@ -5,8 +5,7 @@ let eventoAtual = null;
 
 // Inicializar calendário ao carregar a página
 document.addEventListener('DOMContentLoaded', function() {
-    inicializarCalendario();
-    carregarEventosComFiltro(); // Usar a nova função
+    inicializarCalendario(); // O callback datesSet carrega os eventos da janela inicial
     
     // Aguardar um pouco mais para garantir que todos os elementos estejam renderizados
     setTimeout(() => {
@@ -136,6 +135,10 @@ function inicializarCalendario() {
         },
         height: 'auto',
         events: [],
+        datesSet: function() {
+            // Buscar apenas os eventos do período visível
+            carregarEventosComFiltro();
+        },
         eventClick: function(info) {
             mostrarDetalhesEvento(info.event);
         },
@@ -184,32 +187,23 @@ async function carregarEventos() {
 }
 
 // Função para atualizar estatísticas
-function atualizarEstatisticas() {
-    const hoje = new Date();
-    const inicioMes = new Date(hoje.getFullYear(), hoje.getMonth(), 1);
-    const fimMes = new Date(hoje.getFullYear(), hoje.getMonth() + 1, 0);
-    
-    let totalElevadores = eventos.length;
-    let entregasMes = 0;
-    let entregasPendentes = 0;
-    
-    eventos.forEach(evento => {
-        const dataEntrega = criarDataSegura(evento.start);
-        
-        // Entregas deste mês
-        if (dataEntrega >= inicioMes && dataEntrega <= fimMes) {
-            entregasMes++;
-        }
-        
-        // Entregas pendentes (futuras)
-        if (dataEntrega > hoje) {
-            entregasPendentes++;
-        }
-    });
-    
-    document.getElementById('totalElevadores').textContent = totalElevadores;
-    document.getElementById('entregasMes').textContent = entregasMes;
-    document.getElementById('entregasPendentes').textContent = entregasPendentes;
+// Os eventos carregados cobrem só a janela visível, então os totais vêm do servidor
+async function atualizarEstatisticas() {
+    try {
+        const estatisticas = await apiRequest('/api/calendario/estatisticas');
+        document.getElementById('totalElevadores').textContent = estatisticas.total_elevadores;
+        document.getElementById('entregasMes').textContent = estatisticas.entregas_mes;
+        document.getElementById('entregasPendentes').textContent = estatisticas.entregas_pendentes;
+    } catch (error) {
+        console.error('Erro ao carregar estatísticas:', error);
+    }
+}
+
+// Formatar data local como YYYY-MM-DD (sem conversão para UTC)
+function formatarDataISO(data) {
+    const mes = String(data.getMonth() + 1).padStart(2, '0');
+    const dia = String(data.getDate()).padStart(2, '0');
+    return `${data.getFullYear()}-${mes}-${dia}`;
 }
 
 // Função para mostrar detalhes do evento
@@ -669,6 +663,9 @@ function createFullscreenOverlay() {
                     },
                     height: '100%',
                     events: eventos || [],
+                    datesSet: function() {
+                        carregarEventosComFiltro();
+                    },
                     eventClick: function(info) {
                         if (typeof mostrarDetalhesEvento === 'function') {
                             mostrarDetalhesEvento(info.event);
@@ -715,6 +712,9 @@ function restoreOriginalCalendar() {
             },
             height: 'auto',
             events: eventos || [],
+            datesSet: function() {
+                carregarEventosComFiltro();
+            },
             eventClick: function(info) {
                 if (typeof mostrarDetalhesEvento === 'function') {
                     mostrarDetalhesEvento(info.event);
@@ -781,8 +781,10 @@ document.addEventListener('DOMContentLoaded', function() {
         }
     });
     
-    // Atualizar eventos a cada 5 minutos
-    setInterval(carregarEventosComFiltro, 5 * 60 * 1000);
+    // Alterações chegam pelo canal de eventos; o intervalo de 5 minutos fica como
+    // garantia caso a conexão SSE não esteja disponível
+    assinarAlteracoes(['elevador', 'contrato', 'cliente'], agruparChamadas(sincronizarCalendario));
+    setInterval(sincronizarCalendario, 5 * 60 * 1000);
 });
 
 // Função para exportar calendário
@@ -849,10 +851,82 @@ function aplicarFiltroStatus() {
     calendar.addEventSource(eventosFiltrados);
 }
 
+// Contador para descartar respostas de janelas que já saíram da tela
+let requisicaoEventosAtual = 0;
+
+// Estado da sincronização incremental: token do servidor e janela a que ele se refere
+let tokenCalendario = null;
+let janelaCalendario = null;
+
+// Buscar eventos do calendário devolvendo também o token de sincronização (X-Sync-Token)
+async function buscarCalendario(params) {
+    const response = await fetch(`${API_BASE}/api/calendario?${params}`, {
+        headers: { 'Content-Type': 'application/json' }
+    });
+    const data = await response.json();
+    
+    if (!response.ok) {
+        throw new Error(data.error || `Erro HTTP ${response.status}: ${response.statusText}`);
+    }
+    
+    return { dados: data, token: response.headers.get('X-Sync-Token') };
+}
+
+// Janela visível atual no formato aceito pela API
+function obterJanelaCalendario() {
+    return {
+        start: formatarDataISO(calendar.view.activeStart),
+        end: formatarDataISO(calendar.view.activeEnd)
+    };
+}
+
+// Aplicar apenas as alterações desde o último token; recarrega tudo se a janela mudou
+async function sincronizarCalendario() {
+    if (!calendar) return;
+    
+    const janela = obterJanelaCalendario();
+    if (!tokenCalendario || !janelaCalendario ||
+        janela.start !== janelaCalendario.start || janela.end !== janelaCalendario.end) {
+        return carregarEventosComFiltro();
+    }
+    
+    const requisicao = ++requisicaoEventosAtual;
+    const params = new URLSearchParams({ ...janela, since: tokenCalendario });
+    
+    try {
+        const { dados, token } = await buscarCalendario(params);
+        if (requisicao !== requisicaoEventosAtual) return;
+        tokenCalendario = token;
+        
+        if (dados.eventos.length === 0 && dados.removidos.length === 0) return;
+        
+        // Substituir os eventos alterados e tirar os removidos (mesmo id = mesmo elevador)
+        const idsAlterados = new Set([...dados.removidos, ...dados.eventos.map(evento => evento.id)]);
+        eventosOriginais = eventosOriginais
+            .filter(evento => !idsAlterados.has(evento.id))
+            .concat(dados.eventos);
+        eventos = eventosOriginais;
+        
+        calendar.removeAllEvents();
+        calendar.addEventSource(eventos);
+        atualizarEstatisticas();
+    } catch (error) {
+        console.error('Erro ao sincronizar eventos:', error);
+    }
+}
+
 // Modificar a função carregarEventos para armazenar eventos originais
 async function carregarEventosComFiltro() {
+    if (!calendar) return;
+    
+    const requisicao = ++requisicaoEventosAtual;
+    const janela = obterJanelaCalendario();
+    
     try {
-        const eventosCarregados = await apiRequest('/api/calendario');
+        const { dados: eventosCarregados, token } = await buscarCalendario(new URLSearchParams(janela));
+        if (requisicao !== requisicaoEventosAtual) return;
+        tokenCalendario = token;
+        janelaCalendario = janela;
         eventosOriginais = eventosCarregados;
         eventos = eventosCarregados;
         
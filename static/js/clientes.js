@@ -2,31 +2,64 @@
 let clientes = [];
 let clienteAtual = null;
 let tabelaClientes = null;
+let paginaClientes = { proximoId: null, total: 0, termo: '' };
 
 // Carregar clientes ao inicializar a página
 document.addEventListener('DOMContentLoaded', function() {
     carregarClientes();
 });
 
-// Função para carregar clientes
-async function carregarClientes() {
+// Função para carregar clientes (primeira página, com busca feita no servidor)
+async function carregarClientes(termo = paginaClientes.termo) {
     try {
-        clientes = await apiRequest('/api/clientes');
+        paginaClientes.termo = termo;
+        const pagina = await apiRequestPaginada('/api/clientes', { limit: TAMANHO_PAGINA, q: termo });
+        clientes = pagina.dados;
+        paginaClientes.proximoId = pagina.proximoId;
+        paginaClientes.total = pagina.total;
         
         // Inicializar tabela ordenável se ainda não foi inicializada
         if (!tabelaClientes) {
-            tabelaClientes = new TabelaOrdenavel('clientesTable', clientes, renderizarTabelaClientes);
+            tabelaClientes = new TabelaOrdenavel('clientesTable', clientes, renderizarTabelaClientes, {
+                pesquisaServidor: carregarClientes
+            });
+            renderizarTabelaClientes(clientes);
         } else {
             tabelaClientes.atualizarDados(clientes);
         }
         
-        renderizarTabelaClientes(clientes);
+        atualizarPaginacaoClientes();
+    } catch (error) {
+        console.error('Erro ao carregar clientes:', error);
+        showToast('Erro ao carregar clientes: ' + error.message, 'error');
+    }
+}
+
+// Função para carregar a próxima página de clientes
+async function carregarMaisClientes() {
+    try {
+        const pagina = await apiRequestPaginada('/api/clientes', {
+            limit: TAMANHO_PAGINA,
+            after_id: paginaClientes.proximoId,
+            q: paginaClientes.termo
+        });
+        clientes = clientes.concat(pagina.dados);
+        paginaClientes.proximoId = pagina.proximoId;
+        paginaClientes.total = pagina.total;
+        
+        tabelaClientes.atualizarDados(clientes);
+        atualizarPaginacaoClientes();
     } catch (error) {
         console.error('Erro ao carregar clientes:', error);
         showToast('Erro ao carregar clientes: ' + error.message, 'error');
     }
 }
 
+function atualizarPaginacaoClientes() {
+    atualizarRodapePaginacao('clientesTable', clientes.length, paginaClientes.total,
+                             paginaClientes.proximoId !== null, carregarMaisClientes);
+}
+
 // Função para renderizar tabela de clientes
 function renderizarTabelaClientes(dadosParaRenderizar = clientes) {
     const tbody = document.querySelector('#clientesTable tbody');
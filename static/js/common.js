@@ -110,18 +110,55 @@ function showToast(message, type = 'info') {
     toastElement.show();
 }
 
+// Respostas GET guardadas com o ETag: a próxima requisição à mesma URL envia
+// If-None-Match e, se o servidor responder 304, os dados guardados são reaproveitados
+const respostasValidadas = new Map();
+const RESPOSTAS_VALIDADAS_MAX = 50;
+
+// fetch com validadores; retorna { ok, status, statusText, headers, data }
+async function fetchCondicional(url, options = {}) {
+    const metodo = (options.method || 'GET').toUpperCase();
+    const guardada = metodo === 'GET' ? respostasValidadas.get(url) : null;
+    const headers = {
+        'Content-Type': 'application/json',
+        ...options.headers
+    };
+    if (guardada) {
+        headers['If-None-Match'] = guardada.etag;
+    }
+    
+    const response = await fetch(API_BASE + url, { ...options, headers });
+    
+    if (response.status === 304 && guardada) {
+        // Reposiciona como a mais recente (descarte das mais antigas)
+        respostasValidadas.delete(url);
+        respostasValidadas.set(url, guardada);
+        // JSON.parse a cada uso: quem chamou pode alterar os dados sem afetar o guardado
+        return { ok: true, status: 200, statusText: 'OK', headers: guardada.headers, data: JSON.parse(guardada.texto) };
+    }
+    
+    const texto = await response.text();
+    const data = JSON.parse(texto);
+    
+    if (metodo === 'GET') {
+        const etag = response.headers.get('ETag');
+        respostasValidadas.delete(url);
+        if (response.ok && etag) {
+            respostasValidadas.set(url, { etag, texto, headers: response.headers });
+            if (respostasValidadas.size > RESPOSTAS_VALIDADAS_MAX) {
+                respostasValidadas.delete(respostasValidadas.keys().next().value);
+            }
+        }
+    }
+    
+    return { ok: response.ok, status: response.status, statusText: response.statusText, headers: response.headers, data };
+}
+
 // Função para fazer requisições API
 async function apiRequest(url, options = {}) {
     try {
-        const response = await fetch(API_BASE + url, {
-            headers: {
-                'Content-Type': 'application/json',
-                ...options.headers
-            },
-            ...options
-        });
-        
-        const data = await response.json();
+        const response = await fetchCondicional(url, options);
+        const data = response.data;
         
         if (!response.ok) {
             throw new Error(data.error || `Erro HTTP ${response.status}: ${response.statusText}`);
@@ -134,6 +171,114 @@ async function apiRequest(url, options = {}) {
     }
 }
 
+// Tamanho de página padrão das listagens paginadas no servidor
+const TAMANHO_PAGINA = 100;
+
+// Função para requisições de listagens paginadas (keyset: limit/after_id)
+// Retorna { dados, total, proximoId } - proximoId é null quando não há mais páginas
+async function apiRequestPaginada(url, params = {}) {
+    const query = new URLSearchParams();
+    Object.entries(params).forEach(([chave, valor]) => {
+        if (valor !== null && valor !== undefined && valor !== '') {
+            query.append(chave, valor);
+        }
+    });
+    
+    try {
+        const response = await fetchCondicional(url + (query.toString() ? `?${query}` : ''));
+        const data = response.data;
+        
+        if (!response.ok) {
+            throw new Error(data.error || `Erro HTTP ${response.status}: ${response.statusText}`);
+        }
+        
+        const proximo = response.headers.get('X-Next-After-Id');
+        return {
+            dados: data,
+            total: parseInt(response.headers.get('X-Total-Count') || data.length),
+            proximoId: proximo ? parseInt(proximo) : null
+        };
+    } catch (error) {
+        console.error('Erro na API:', error);
+        throw error;
+    }
+}
+
+// Função para exibir "Mostrando X de Y" e o botão "Carregar mais" abaixo de uma tabela
+function atualizarRodapePaginacao(tabelaId, carregados, total, temMais, carregarMais) {
+    const tabela = document.getElementById(tabelaId);
+    if (!tabela) return;
+    
+    let rodape = document.getElementById(`paginacao-${tabelaId}`);
+    if (!rodape) {
+        rodape = document.createElement('div');
+        rodape.id = `paginacao-${tabelaId}`;
+        rodape.className = 'd-flex justify-content-between align-items-center mt-2';
+        const tableContainer = tabela.closest('.table-responsive') || tabela;
+        tableContainer.after(rodape);
+    }
+    
+    rodape.innerHTML = `
+        <small class="text-muted">Mostrando ${carregados} de ${total}</small>
+        ${temMais ? '<button type="button" class="btn btn-sm btn-outline-secondary"><i class="fas fa-angle-double-down"></i> Carregar mais</button>' : ''}
+    `;
+    
+    const botao = rodape.querySelector('button');
+    if (botao) {
+        botao.addEventListener('click', () => {
+            botao.disabled = true;
+            carregarMais();
+        });
+    }
+}
+
+// Canal de alterações em tempo real (Server-Sent Events em /api/eventos)
+// Uma única conexão por aba, compartilhada por todos os assinantes da página
+let fonteAlteracoes = null;
+let fonteAlteracoesJaAberta = false;
+const assinantesAlteracoes = [];
+
+// Registrar callback(alteracao) para as entidades ('elevador', 'contrato', 'cliente').
+// alteracao = { entidade, acao: 'criado'|'atualizado'|'removido', id, ... } ou
+// { acao: 'ressincronizar' } quando notificações podem ter sido perdidas.
+function assinarAlteracoes(entidades, callback) {
+    assinantesAlteracoes.push({ entidades, callback });
+    if (fonteAlteracoes || typeof EventSource === 'undefined') return;
+
+    fonteAlteracoes = new EventSource(API_BASE + '/api/eventos');
+    fonteAlteracoes.onopen = function() {
+        // Reconexão: o que mudou enquanto a conexão estava caída não foi recebido
+        if (fonteAlteracoesJaAberta) {
+            distribuirAlteracao({ acao: 'ressincronizar' });
+        }
+        fonteAlteracoesJaAberta = true;
+    };
+    fonteAlteracoes.onmessage = function(evento) {
+        try {
+            distribuirAlteracao(JSON.parse(evento.data));
+        } catch (error) {
+            console.error('Alteração inválida recebida:', error);
+        }
+    };
+}
+
+function distribuirAlteracao(alteracao) {
+    assinantesAlteracoes.forEach(({ entidades, callback }) => {
+        if (alteracao.acao === 'ressincronizar' || entidades.includes(alteracao.entidade)) {
+            callback(alteracao);
+        }
+    });
+}
+
+// Agrupar chamadas em sequência (ex.: várias alterações salvas juntas) numa só execução
+function agruparChamadas(funcao, espera = 1000) {
+    let temporizador = null;
+    return function(...args) {
+        clearTimeout(temporizador);
+        temporizador = setTimeout(() => funcao(...args), espera);
+    };
+}
+
 // Função para confirmar exclusão
 function confirmarExclusao(callback, mensagem = 'Tem certeza que deseja excluir este item?') {
     if (confirm(mensagem)) {
@@ -599,12 +744,15 @@ document.addEventListener('DOMContentLoaded', function() {
 });
 
 // Sistema de ordenação e pesquisa para tabelas
+// opcoes.pesquisaServidor: se informado, a busca é delegada ao servidor
+// (recebe o termo digitado) em vez de filtrar os dados já carregados
 class TabelaOrdenavel {
-    constructor(tabelaId, dados, renderCallback) {
+    constructor(tabelaId, dados, renderCallback, opcoes = {}) {
         this.tabelaId = tabelaId;
         this.dados = dados;
         this.dadosOriginais = [...dados];
         this.renderCallback = renderCallback;
+        this.opcoes = opcoes;
         this.ordemAtual = { coluna: null, crescente: true };
         this.termoPesquisa = '';
         
@@ -676,10 +824,15 @@ class TabelaOrdenavel {
             
             // Adicionar evento de pesquisa
             const searchInput = document.getElementById(`search-${this.tabelaId}`);
-            searchInput.addEventListener('input', (e) => {
-                this.termoPesquisa = e.target.value.toLowerCase();
-                this.filtrarEAtualizar();
-            });
+            if (this.opcoes.pesquisaServidor) {
+                const pesquisar = debounce(termo => this.opcoes.pesquisaServidor(termo), 300);
+                searchInput.addEventListener('input', (e) => pesquisar(e.target.value.trim()));
+            } else {
+                searchInput.addEventListener('input', (e) => {
+                    this.termoPesquisa = e.target.value.toLowerCase();
+                    this.filtrarEAtualizar();
+                });
+            }
         }
     }
     
@@ -4,6 +4,7 @@ let clientes = [];
 let contratoAtual = null;
 let dataCalculada = null;
 let tabelaContratos = null;
+let paginaContratos = { proximoId: null, total: 0, termo: '' };
 
 // Funções para gerenciamento do campo vendedor
 function toggleVendedorCustom() {
@@ -67,7 +68,9 @@ document.addEventListener('DOMContentLoaded', function() {
     console.log('DOM carregado - inicializando contratos');
     
     // Inicializar tabela com ordenação (sem dados iniciais)
-    tabelaContratos = new TabelaOrdenavel('contratosTable', [], renderizarTabelaContratos);
+    tabelaContratos = new TabelaOrdenavel('contratosTable', [], renderizarTabelaContratos, {
+        pesquisaServidor: carregarContratos
+    });
     
     carregarContratos();
     carregarClientes();
@@ -100,15 +103,18 @@ function calcularStatusContrato(contrato) {
     }
 }
 
-// Função para carregar contratos
-async function carregarContratos() {
+// Função para carregar contratos (primeira página, com busca feita no servidor)
+async function carregarContratos(termo = paginaContratos.termo) {
     try {
         console.log('Carregando contratos...');
-        contratos = await apiRequest('/api/contratos');
-        console.log('Contratos carregados:', contratos.length);
+        paginaContratos.termo = termo;
+        const pagina = await apiRequestPaginada('/api/contratos', { limit: TAMANHO_PAGINA, q: termo });
+        paginaContratos.proximoId = pagina.proximoId;
+        paginaContratos.total = pagina.total;
+        console.log('Contratos carregados:', pagina.dados.length, 'de', pagina.total);
         
         // Adicionar campo status calculado a cada contrato
-        contratos = contratos.map(contrato => ({
+        contratos = pagina.dados.map(contrato => ({
             ...contrato,
             status: calcularStatusContrato(contrato)
         }));
@@ -117,15 +123,46 @@ async function carregarContratos() {
         if (tabelaContratos) {
             console.log('Atualizando dados da TabelaOrdenavel...');
             tabelaContratos.atualizarDados(contratos);
+        } else {
+            renderizarTabelaContratos(contratos);
         }
         
-        renderizarTabelaContratos(contratos);
+        atualizarPaginacaoContratos();
+    } catch (error) {
+        console.error('Erro ao carregar contratos:', error);
+        showToast('Erro ao carregar contratos: ' + error.message, 'error');
+    }
+}
+
+// Função para carregar a próxima página de contratos
+async function carregarMaisContratos() {
+    try {
+        const pagina = await apiRequestPaginada('/api/contratos', {
+            limit: TAMANHO_PAGINA,
+            after_id: paginaContratos.proximoId,
+            q: paginaContratos.termo
+        });
+        paginaContratos.proximoId = pagina.proximoId;
+        paginaContratos.total = pagina.total;
+        
+        contratos = contratos.concat(pagina.dados.map(contrato => ({
+            ...contrato,
+            status: calcularStatusContrato(contrato)
+        })));
+        
+        tabelaContratos.atualizarDados(contratos);
+        atualizarPaginacaoContratos();
     } catch (error) {
         console.error('Erro ao carregar contratos:', error);
         showToast('Erro ao carregar contratos: ' + error.message, 'error');
     }
 }
 
+function atualizarPaginacaoContratos() {
+    atualizarRodapePaginacao('contratosTable', contratos.length, paginaContratos.total,
+                             paginaContratos.proximoId !== null, carregarMaisContratos);
+}
+
 // Função para carregar clientes
 async function carregarClientes() {
     try {
@@ -4,6 +4,7 @@ let contratos = [];
 let clientes = [];
 let elevadorAtual = null;
 let tabelaElevadores = null;
+let paginaElevadores = { proximoId: null, total: 0, termo: '' };
 
 // Inicializar quando a página carregar
 document.addEventListener('DOMContentLoaded', function() {
@@ -15,6 +16,9 @@ document.addEventListener('DOMContentLoaded', function() {
     // Carregar dados imediatamente
     carregarDados();
     
+    // Receber alterações feitas em outras abas/estações
+    assinarAlteracoes(['elevador', 'contrato', 'cliente'], tratarAlteracaoElevadores);
+    
     // Event listeners
     document.getElementById('corSelect').addEventListener('change', alterarSelecaoCor);
     
@@ -112,7 +116,10 @@ async function carregarDados() {
         
         console.log('8. Inicializando TabelaOrdenavel...');
         // Inicializar tabela com ordenação após dados carregados
-        tabelaElevadores = new TabelaOrdenavel('elevadoresTable', elevadores, renderizarElevadores);
+        tabelaElevadores = new TabelaOrdenavel('elevadoresTable', elevadores, renderizarElevadores, {
+            pesquisaServidor: carregarElevadores
+        });
+        atualizarPaginacaoElevadores();
         
         console.log('=== CARREGAMENTO CONCLUÍDO ===');
         
@@ -122,12 +129,26 @@ async function carregarDados() {
     }
 }
 
+// Buscar a primeira página de elevadores (busca feita no servidor)
+async function buscarPaginaElevadores(termo) {
+    paginaElevadores.termo = termo;
+    const pagina = await apiRequestPaginada('/api/elevadores', { limit: TAMANHO_PAGINA, q: termo });
+    elevadores = pagina.dados;
+    paginaElevadores.proximoId = pagina.proximoId;
+    paginaElevadores.total = pagina.total;
+}
+
 // Carregar elevadores
-async function carregarElevadores() {
+async function carregarElevadores(termo = paginaElevadores.termo) {
     try {
-        elevadores = await apiRequest('/api/elevadores');
+        await buscarPaginaElevadores(termo);
         console.log('Elevadores carregados:', elevadores);
-        renderizarElevadores();
+        if (tabelaElevadores) {
+            tabelaElevadores.atualizarDados(elevadores);
+        } else {
+            renderizarElevadores();
+        }
+        atualizarPaginacaoElevadores();
     } catch (error) {
         console.error('Erro ao carregar elevadores:', error);
         showToast('Erro ao carregar elevadores: ' + error.message, 'error');
@@ -137,7 +158,7 @@ async function carregarElevadores() {
 // Carregar elevadores sem renderizar (para uso na inicialização)
 async function carregarElevadoresSemRender() {
     try {
-        elevadores = await apiRequest('/api/elevadores');
+        await buscarPaginaElevadores(paginaElevadores.termo);
         console.log('Elevadores carregados (sem render):', elevadores);
     } catch (error) {
         console.error('Erro ao carregar elevadores:', error);
@@ -145,6 +166,74 @@ async function carregarElevadoresSemRender() {
     }
 }
 
+// Carregar a próxima página de elevadores
+async function carregarMaisElevadores() {
+    try {
+        const pagina = await apiRequestPaginada('/api/elevadores', {
+            limit: TAMANHO_PAGINA,
+            after_id: paginaElevadores.proximoId,
+            q: paginaElevadores.termo
+        });
+        elevadores = elevadores.concat(pagina.dados);
+        paginaElevadores.proximoId = pagina.proximoId;
+        paginaElevadores.total = pagina.total;
+        
+        tabelaElevadores.atualizarDados(elevadores);
+        atualizarPaginacaoElevadores();
+    } catch (error) {
+        console.error('Erro ao carregar elevadores:', error);
+        showToast('Erro ao carregar elevadores: ' + error.message, 'error');
+    }
+}
+
+// Recarregar a primeira página agrupando rajadas de alterações
+const recarregarElevadoresAgrupado = agruparChamadas(() => carregarElevadores());
+
+// Aplicar na lista uma alteração recebida pelo canal de eventos
+async function tratarAlteracaoElevadores(alteracao) {
+    // Contratos/clientes alteram colunas de vários elevadores e um elevador novo
+    // depende da ordenação/filtro atual: nesses casos recarregar a lista
+    if (alteracao.entidade !== 'elevador' || alteracao.acao === 'criado') {
+        recarregarElevadoresAgrupado();
+        return;
+    }
+    
+    if (!elevadores.some(elevador => elevador.id === alteracao.id)) return;
+    
+    try {
+        let atualizado = null;
+        if (alteracao.acao === 'atualizado') {
+            // Reaplicar a busca atual: se não corresponder mais, sai da lista
+            const params = new URLSearchParams({ id: alteracao.id });
+            if (paginaElevadores.termo) params.append('q', paginaElevadores.termo);
+            [atualizado] = await apiRequest(`/api/elevadores?${params}`);
+        }
+        
+        const indice = elevadores.findIndex(elevador => elevador.id === alteracao.id);
+        if (indice === -1) return;
+        if (atualizado) {
+            elevadores[indice] = atualizado;
+        } else {
+            elevadores.splice(indice, 1);
+            paginaElevadores.total = Math.max(0, paginaElevadores.total - 1);
+        }
+        
+        if (tabelaElevadores) {
+            tabelaElevadores.atualizarDados(elevadores);
+        } else {
+            renderizarElevadores();
+        }
+        atualizarPaginacaoElevadores();
+    } catch (error) {
+        console.error('Erro ao aplicar alteração do elevador:', error);
+    }
+}
+
+function atualizarPaginacaoElevadores() {
+    atualizarRodapePaginacao('elevadoresTable', elevadores.length, paginaElevadores.total,
+                             paginaElevadores.proximoId !== null, carregarMaisElevadores);
+}
+
 // Carregar contratos
 async function carregarContratos() {
     try {
@@ -1313,14 +1402,47 @@ function atualizarVisualizacaoCabine() {
     }
 }
 // Função para gerar PDF do elevador
+// Limite de fichas por ZIP (PDF_LOTE_MAX no servidor)
+const MAX_FICHAS_LOTE = 500;
+
+// Baixar num ZIP as fichas em PDF dos elevadores listados (o servidor envia aos poucos)
+function baixarFichasElevadores() {
+    if (elevadores.length === 0) {
+        showToast('Nenhum elevador listado para exportar', 'warning');
+        return;
+    }
+    
+    if (elevadores.length > MAX_FICHAS_LOTE) {
+        showToast(`Serão exportadas apenas as primeiras ${MAX_FICHAS_LOTE} fichas`, 'warning');
+    }
+    
+    const ids = elevadores.slice(0, MAX_FICHAS_LOTE).map(elevador => elevador.id).join(',');
+    const link = document.createElement('a');
+    link.href = `/api/elevadores/pdf-lote?ids=${ids}`;
+    link.download = '';
+    document.body.appendChild(link);
+    link.click();
+    link.remove();
+    
+    showToast('Gerando fichas... o download começa em instantes', 'info');
+}
+
 async function gerarPDF(elevadorId) {
     try {
         showToast('Preparando PDF para visualização...', 'info');
         
-        const response = await fetch(`/api/elevadores/${elevadorId}/pdf`, {
+        let response = await fetch(`/api/elevadores/${elevadorId}/pdf`, {
             method: 'GET'
         });
         
+        // Servidor ocupado gerando outros PDFs (503): aguardar o Retry-After e tentar de novo
+        for (let tentativa = 0; response.status === 503 && tentativa < 3; tentativa++) {
+            const espera = parseInt(response.headers.get('Retry-After') || '5');
+            showToast(`Servidor ocupado gerando PDFs, nova tentativa em ${espera}s...`, 'warning');
+            await new Promise(resolve => setTimeout(resolve, espera * 1000));
+            response = await fetch(`/api/elevadores/${elevadorId}/pdf`, { method: 'GET' });
+        }
+        
         if (!response.ok) {
             const errorText = await response.text();
             throw new Error(`Erro ${response.status}: ${errorText}`);
@@ -6,6 +6,9 @@ let filtrosDisponiveis = {};
 // Carregar dados ao inicializar a página
 document.addEventListener('DOMContentLoaded', function() {
     carregarRelatorios();
+    
+    // Atualizar os totais quando elevadores, contratos ou clientes mudarem
+    assinarAlteracoes(['elevador', 'contrato', 'cliente'], agruparChamadas(() => filtrarDados(true), 2000));
 });
 
 // Função para mostrar/ocultar loading
@@ -733,9 +736,10 @@ let dadosFiltrados = [];
 let chartVendas = null; // Variável para o gráfico
 
 // Função para filtrar dados
-async function filtrarDados() {
+// silencioso: atualização automática (sem loading nem toast)
+async function filtrarDados(silencioso = false) {
     try {
-        showLoading(true);
+        if (!silencioso) showLoading(true);
         
         // Primeiro, recarregar dados temporais com os novos filtros
         await carregarDadosTemporais();
@@ -768,7 +772,7 @@ async function filtrarDados() {
         
         showLoading(false);
         
-        if (typeof showToast === 'function') {
+        if (!silencioso && typeof showToast === 'function') {
             showToast('Filtros aplicados com sucesso', 'success');
         }
         
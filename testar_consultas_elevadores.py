@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+Teste de regressão do N+1 em GET /api/elevadores: a listagem deve executar o mesmo
+número de comandos SQL para 1 ou para centenas de elevadores.
+
+Não precisa do banco: get_db_connection é trocado por uma conexão falsa que conta os
+comandos e devolve N elevadores completos (cabine, coluna e adicionais).
+
+    python testar_consultas_elevadores.py
+"""
+import sys
+import os
+
+# Adicionar o diretório atual ao path para importar app
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import app as homemanager
+
+# Comandos da própria listagem: consulta principal + COUNT(*) quando paginada
+# (a leitura de versao_entidade do GET condicional é contada à parte)
+MAX_COMANDOS_LISTAGEM = 2
+
+def linha_elevador(elevador_id):
+    return (
+        elevador_id, 1, 'Botoeira', None, 'Automática', 'Eixo Vert', 'Branco', 'Não iniciado',
+        True, 2100, 1100, 1400, 'Antiderr', False, None, None,
+        True, 3500, False,
+        True, 1, 0, 2, 0, 0, 0, 0, 1, True,
+        None, 'Cliente de teste',
+    )
+
+class CursorContador:
+    def __init__(self, banco):
+        self.banco = banco
+        self.resultado = []
+
+    def execute(self, query, params=None):
+        self.banco.comandos.append(query)
+        if 'versao_entidade' in query:
+            self.resultado = [('cliente', 1), ('contrato', 1), ('elevador', 1)]
+        elif 'COUNT(*)' in query:
+            self.resultado = [(self.banco.quantidade,)]
+        elif 'FROM elevador' in query:
+            self.resultado = [linha_elevador(i) for i in range(1, self.banco.quantidade + 1)]
+        else:
+            self.resultado = []
+
+    def fetchone(self):
+        return self.resultado[0] if self.resultado else None
+
+    def fetchall(self):
+        return self.resultado
+
+    def close(self):
+        pass
+
+class BancoFalso:
+    """Conexões falsas que compartilham a lista de comandos executados"""
+
+    def __init__(self, quantidade):
+        self.quantidade = quantidade
+        self.comandos = []
+
+    def conectar(self):
+        banco = self
+
+        class Conexao:
+            def cursor(self):
+                return CursorContador(banco)
+
+            def commit(self):
+                pass
+
+            def rollback(self):
+                pass
+
+        return Conexao()
+
+def contar_comandos(quantidade, url):
+    banco = BancoFalso(quantidade)
+    homemanager.get_db_connection = banco.conectar
+    homemanager.end_pg_connection = lambda conn: None
+    response = homemanager.app.test_client().get(url)
+    assert response.status_code == 200, response.get_data(as_text=True)
+    elevadores = response.get_json()
+    assert len(elevadores) == quantidade and elevadores[-1]['cabine']['altura'] == 2100
+    listagem = [q for q in banco.comandos if 'versao_entidade' not in q]
+    return len(elevadores), len(listagem)
+
+def testar_consultas_elevadores():
+    conectar_original = homemanager.get_db_connection
+    encerrar_original = homemanager.end_pg_connection
+    sucesso = True
+    try:
+        for url in ('/api/elevadores', '/api/elevadores?limit=500'):
+            contagens = set()
+            for quantidade in (1, 10, 500):
+                elevadores, comandos = contar_comandos(quantidade, url)
+                print(f"   {url:<28} {elevadores:>4} elevadores -> {comandos} comandos SQL")
+                contagens.add(comandos)
+            if len(contagens) != 1 or max(contagens) > MAX_COMANDOS_LISTAGEM:
+                print(f"❌ {url}: número de comandos varia com a quantidade ou passa de {MAX_COMANDOS_LISTAGEM}")
+                sucesso = False
+            else:
+                print(f"✅ {url}: {contagens.pop()} comandos, independente da quantidade")
+    finally:
+        homemanager.get_db_connection = conectar_original
+        homemanager.end_pg_connection = encerrar_original
+    return sucesso
+
+if __name__ == "__main__":
+    print("🧪 Teste de consultas da listagem de elevadores")
+    print("=" * 60)
+    resultado = testar_consultas_elevadores()
+    print("=" * 60)
+    sys.exit(0 if resultado else 1)
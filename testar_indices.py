@@ -0,0 +1,240 @@
+#!/usr/bin/env python3
+"""
+Teste dos índices de migrations/001_indices_chaves_e_relatorios.sql: as consultas
+mais usadas (elevadores de um contrato, janela do calendário, filtros de contratos e
+dos relatórios) devem ler as tabelas grandes por índice, não por Seq Scan.
+
+Os planos são conferidos com random_page_cost = 1.1 na sessão do EXPLAIN, o ajuste
+recomendado em AJUSTE_POSTGRESQL.md para servidores com SSD; o teste não altera a
+configuração do servidor nem do banco.
+
+Usa o servidor do .env, mas num banco próprio (<PG_NAME>_teste_indices) criado,
+populado e apagado pelo teste. As consultas não são copiadas do app.py: as rotas
+são chamadas pelo cliente de teste do Flask, o SQL executado é capturado pelo
+observador de CursorMedido e cada comando passa por EXPLAIN (FORMAT JSON).
+
+    python testar_indices.py
+"""
+import sys
+import os
+
+# Adicionar o diretório atual ao path para importar postgre e app
+DIRETORIO = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(DIRETORIO)
+
+from dotenv import load_dotenv
+
+# O banco de teste precisa estar em PG_NAME antes de importar postgre/app
+load_dotenv(os.path.join(DIRETORIO, '.env'))
+BANCO_PRINCIPAL = os.getenv('PG_NAME')
+BANCO_TESTE = f'{BANCO_PRINCIPAL}_teste_indices'
+os.environ['PG_NAME'] = BANCO_TESTE
+
+import psycopg2
+import postgre
+from consultas_lentas import texto_sql
+from metricas import CursorMedido
+
+# Custo de leitura aleatória recomendado em AJUSTE_POSTGRESQL.md (o padrão 4 supõe
+# disco giratório e faz o calendário e os relatórios ao vivo lerem elevador inteiro)
+CUSTO_LEITURA_ALEATORIA = 1.1
+
+# Volume suficiente para o planejador preferir os índices
+CLIENTES = 20000
+CONTRATOS = 50000
+ELEVADORES = 100000
+
+DADOS_TESTE = f"""
+    INSERT INTO cliente (nome, comercial)
+    SELECT 'Cliente ' || g, g % 3 = 0 FROM generate_series(1, {CLIENTES}) g;
+
+    INSERT INTO endereco (id_cliente, cidade, estado)
+    SELECT cl.id, 'Cidade ' || (cl.id % 500), est.siglas[1 + cl.id % array_length(est.siglas, 1)]
+    FROM cliente cl, (SELECT array_agg(sigla ORDER BY sigla) AS siglas FROM estado) est;
+
+    -- Como no uso real: contratos cadastrados em ordem de venda ao longo de 10 anos
+    -- (entrega de 30 a 120 dias depois) e os elevadores de cada contrato juntos
+    INSERT INTO contrato (data_venda, data_entrega, id_cliente, vendedor)
+    SELECT DATE '2015-01-01' + g * 3650 / {CONTRATOS},
+           DATE '2015-01-01' + g * 3650 / {CONTRATOS} + 30 + g % 91,
+           1 + g % {CLIENTES},
+           'Vendedor ' || g % 8
+    FROM generate_series(1, {CONTRATOS}) g;
+
+    INSERT INTO elevador (id_contrato, comando, cor, status)
+    SELECT 1 + (g - 1) / {ELEVADORES // CONTRATOS}, 'Botoeira', 'Branco',
+           CASE WHEN g % 20 = 0 THEN 'Pronto'
+                WHEN g % 20 < 4 THEN 'Entregue'
+                WHEN g % 20 < 10 THEN 'Em produção'
+                ELSE 'Não iniciado' END
+    FROM generate_series(1, {ELEVADORES}) g;
+
+    INSERT INTO cabine (id_elevador, altura, largura, profundidade) SELECT id, 2100, 1100, 1400 FROM elevador;
+    INSERT INTO coluna (id_elevador, elevacao) SELECT id, 3000 + id % 2000 FROM elevador;
+    INSERT INTO adicionais (id_elevador, cancela, porta, portao) SELECT id, 1, 0, id % 2 FROM elevador;
+"""
+
+# Rota -> {tabela: índices aceitos}. Cada tabela listada precisa ser lida por um
+# desses índices (Index Scan, Index Only Scan ou Bitmap) e nunca por Seq Scan.
+CASOS = [
+    ('/api/elevadores?contrato=1234',
+     {'elevador': {'idx_elevador_id_contrato'}}),
+    ('/api/elevadores?status=Pronto&entrega_de=2020-03-01&entrega_ate=2020-03-31',
+     {'contrato': {'idx_contrato_data_entrega'},
+      'elevador': {'idx_elevador_status_contrato', 'idx_elevador_id_contrato'}}),
+    ('/api/calendario?start=2020-03-01T00:00:00-03:00&end=2020-04-01T00:00:00-03:00',
+     {'contrato': {'idx_contrato_data_entrega'},
+      'elevador': {'idx_elevador_id_contrato'},
+      'endereco': {'idx_endereco_id_cliente'}}),
+    ('/api/contratos?cliente=4321',
+     {'contrato': {'idx_contrato_id_cliente'}}),
+    ('/api/contratos?venda_de=2020-03-01&venda_ate=2020-03-31',
+     {'contrato': {'idx_contrato_data_venda'}}),
+    ('/api/relatorios/vendas-por-estado?mes=03/2020&fonte=ao-vivo',
+     {'contrato': {'idx_contrato_data_venda'},
+      'elevador': {'idx_elevador_id_contrato'}}),
+]
+
+def preparar_banco():
+    """Cria o banco de teste com o esquema de create.txt, os dados e as migrações"""
+    remover_banco()
+    postgre.create_database()
+    conn = postgre.create_pg_connection()
+    if not conn:
+        return False
+    diretorio_anterior = os.getcwd()
+    os.chdir(DIRETORIO)  # create_tables lê create.txt do diretório atual
+    try:
+        postgre.create_tables(conn)
+        conn.commit()
+        postgre.insert_initial_data(conn)
+        conn.commit()
+        cursor = conn.cursor()
+        cursor.execute(DADOS_TESTE)
+        conn.commit()
+        # As migrações rodam depois dos dados: a 002 já carrega relatorio_vendas
+        if not postgre.apply_migrations(conn):
+            return False
+        conn.autocommit = True
+        cursor.execute("ANALYZE")
+        cursor.close()
+        return True
+    finally:
+        os.chdir(diretorio_anterior)
+        conn.close()
+
+def remover_banco():
+    conn = psycopg2.connect(dbname='postgres', user=postgre.USER, password=postgre.PASSWORD,
+                            host=postgre.HOST, port=postgre.PORT)
+    conn.autocommit = True
+    cursor = conn.cursor()
+    try:
+        # FORCE (PostgreSQL 13+) derruba conexões que o app ainda tenha abertas
+        cursor.execute(f'DROP DATABASE IF EXISTS "{BANCO_TESTE}" WITH (FORCE)')
+    except psycopg2.errors.SyntaxError:
+        cursor.execute(f'DROP DATABASE IF EXISTS "{BANCO_TESTE}"')
+    finally:
+        cursor.close()
+        conn.close()
+
+def capturar_sql(app, url):
+    """Chama a rota e devolve os comandos executados, já com os parâmetros aplicados"""
+    comandos = []
+
+    def observador(cursor, query, parametros, duracao):
+        comandos.append(cursor.mogrify(texto_sql(query, cursor), parametros).decode('utf-8'))
+
+    app.extensions['metricas'].observar_sql(observador)
+    try:
+        response = app.test_client().get(url)
+    finally:
+        CursorMedido.observadores.remove(observador)
+    if response.status_code != 200:
+        raise RuntimeError(f"{url} respondeu {response.status_code}: {response.get_data(as_text=True)[:200]}")
+    return comandos
+
+def varreduras(plano):
+    """(tabela, tipo do nó, índices usados) de cada leitura de tabela do plano"""
+    tipo = plano['Node Type']
+    if 'Relation Name' in plano:
+        if tipo in ('Index Scan', 'Index Only Scan'):
+            indices = {plano['Index Name']}
+        elif tipo == 'Bitmap Heap Scan':
+            indices = {n['Index Name'] for n in _nos(plano) if n['Node Type'] == 'Bitmap Index Scan'}
+        else:
+            indices = set()
+        yield plano['Relation Name'], tipo, indices
+    for filho in plano.get('Plans', []):
+        yield from varreduras(filho)
+
+def _nos(plano):
+    yield plano
+    for filho in plano.get('Plans', []):
+        yield from _nos(filho)
+
+def verificar_caso(conn, app, url, esperado):
+    leituras = []
+    cursor = conn.cursor()
+    try:
+        for sql in capturar_sql(app, url):
+            cursor.execute("EXPLAIN (FORMAT JSON) " + sql)
+            leituras.extend(varreduras(cursor.fetchone()[0][0]['Plan']))
+    finally:
+        cursor.close()
+        conn.rollback()
+
+    problemas = []
+    for tabela, aceitos in esperado.items():
+        da_tabela = [(tipo, indices) for nome, tipo, indices in leituras if nome == tabela]
+        if not da_tabela:
+            problemas.append(f"{tabela}: não aparece no plano")
+        elif any(tipo == 'Seq Scan' for tipo, _ in da_tabela):
+            problemas.append(f"{tabela}: Seq Scan")
+        elif not any(indices & aceitos for _, indices in da_tabela):
+            usados = sorted(set().union(*(indices for _, indices in da_tabela)))
+            problemas.append(f"{tabela}: usou {', '.join(usados)} em vez de {', '.join(sorted(aceitos))}")
+    return problemas
+
+def testar_indices():
+    if not all([BANCO_PRINCIPAL, postgre.USER, postgre.PASSWORD, postgre.HOST, postgre.PORT]):
+        print("❌ Configure o banco no .env (PG_NAME, PG_USER, PG_PASSWORD, PG_HOST, PG_PORT)")
+        return False
+
+    print(f"🏗️  Criando e populando o banco {BANCO_TESTE}...")
+    if not preparar_banco():
+        print("❌ Não foi possível preparar o banco de teste")
+        return False
+
+    sucesso = True
+    try:
+        from app import app
+        conn = postgre.create_pg_connection()
+        try:
+            # Só nesta sessão: o commit evita que o rollback de verificar_caso desfaça o SET
+            cursor = conn.cursor()
+            cursor.execute("SET random_page_cost = %s", (CUSTO_LEITURA_ALEATORIA,))
+            cursor.close()
+            conn.commit()
+            for url, esperado in CASOS:
+                problemas = verificar_caso(conn, app, url, esperado)
+                if problemas:
+                    sucesso = False
+                    print(f"❌ {url}")
+                    for problema in problemas:
+                        print(f"     {problema}")
+                else:
+                    print(f"✅ {url}")
+        finally:
+            conn.close()
+    finally:
+        postgre.close_pg_pool()
+        remover_banco()
+        print(f"🧹 Banco {BANCO_TESTE} removido")
+    return sucesso
+
+if __name__ == "__main__":
+    print("🧪 Teste de uso dos índices nas consultas principais")
+    print("=" * 60)
+    resultado = testar_indices()
+    print("=" * 60)
+    sys.exit(0 if resultado else 1)
@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""
+Teste do logo pré-comprimido da ficha (pdf_elevador.LogoPdf) com o ReportLab instalado.
+
+O LogoPdf usa internos do ReportLab para não recomprimir o logo a cada PDF. A ficha
+gerada por ele deve ser idêntica (fora as datas e o /ID do documento) à ficha com o
+logo embutido pelo drawImage público. Rodar ao atualizar o ReportLab e, se passar,
+incluir a versão em REPORTLAB_TESTADO.
+
+    python testar_logo_pdf.py
+"""
+import sys
+import os
+import re
+
+# Adicionar o diretório atual ao path para importar pdf_elevador
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import reportlab
+import pdf_elevador
+from benchmark_pdf import LINHA_EXEMPLO, LOGO_PATH
+
+_METADADOS = re.compile(rb'/(CreationDate|ModDate) \(D:[^)]*\)|/ID\s*\[[^\]]*\]')
+
+def _sem_metadados(pdf):
+    return _METADADOS.sub(b'', pdf)
+
+def testar_logo_pdf():
+    print(f"📦 ReportLab {reportlab.Version}")
+    testado = pdf_elevador._reportlab_testado()
+    if not testado:
+        print("⚠️  Versão fora de REPORTLAB_TESTADO: conferindo o caminho rápido mesmo assim")
+
+    # Liberar a versão instalada só para a comparação
+    faixa_original = pdf_elevador.REPORTLAB_TESTADO
+    versao = tuple(int(parte) for parte in reportlab.Version.split('.')[:2])
+    pdf_elevador.REPORTLAB_TESTADO = (min(faixa_original[0], versao), max(faixa_original[1], versao))
+    try:
+        rapido = pdf_elevador.ModeloFichaPdf(LOGO_PATH)
+    finally:
+        pdf_elevador.REPORTLAB_TESTADO = faixa_original
+    if not rapido.logo.rapido:
+        print("❌ Os internos do ReportLab mudaram: o logo pré-comprimido não pôde ser montado")
+        return False
+
+    publico = pdf_elevador.ModeloFichaPdf(LOGO_PATH)
+    publico.logo.rapido = False
+
+    # Duas fichas seguidas: a segunda reaproveita o XObject já montado
+    fichas_rapidas = [rapido.renderizar(LINHA_EXEMPLO) for _ in range(2)]
+    if not rapido.logo.rapido:
+        print("❌ O registro do logo pré-comprimido falhou durante a renderização")
+        return False
+    referencia = _sem_metadados(publico.renderizar(LINHA_EXEMPLO))
+    if any(_sem_metadados(ficha) != referencia for ficha in fichas_rapidas):
+        print("❌ A ficha com o logo pré-comprimido difere da ficha com drawImage")
+        return False
+
+    print("✅ Ficha idêntica à do drawImage")
+    if not testado:
+        print(f"   Inclua {versao[0]}.{versao[1]} em REPORTLAB_TESTADO (pdf_elevador.py)")
+    return True
+
+if __name__ == "__main__":
+    print("🧪 Teste do logo pré-comprimido da ficha em PDF")
+    print("=" * 60)
+    resultado = testar_logo_pdf()
+    print("=" * 60)
+    sys.exit(0 if resultado else 1)
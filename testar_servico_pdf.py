@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+Teste do timeout do serviço de PDF (pdf_elevador.ServicoRenderizacaoPdf): uma tarefa
+travada num processo não pode prender o processo nem a vaga na fila. Depois de mais
+timeouts do que a fila comporta, o serviço ainda deve aceitar e renderizar fichas.
+
+Não precisa do banco: a tarefa do pool é trocada por uma que dorme o tempo pedido.
+
+    python testar_servico_pdf.py
+"""
+import sys
+import os
+import time
+from concurrent.futures import TimeoutError as FuturesTimeoutError
+
+# Adicionar o diretório atual ao path para importar pdf_elevador
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from pdf_elevador import ServicoRenderizacaoPdf, ServicoSaturadoError
+
+TIMEOUT = 0.5
+TRAVADA = 60  # segundos: bem além do timeout
+
+def dormir(segundos, logo_path):
+    """Tarefa de teste: dorme e devolve o PID do processo que a executou"""
+    time.sleep(segundos)
+    return os.getpid()
+
+class ServicoTeste(ServicoRenderizacaoPdf):
+    tarefa = staticmethod(dormir)
+
+def testar_servico_pdf():
+    servico = ServicoTeste(workers=1, max_fila=2, timeout=TIMEOUT)
+    sucesso = True
+    try:
+        processo_inicial = servico.renderizar(0, None)
+
+        # Mais tarefas travadas do que vagas: sem reciclar o pool, a terceira já daria 503
+        for tentativa in range(servico.max_fila + 1):
+            inicio = time.perf_counter()
+            try:
+                servico.renderizar(TRAVADA, None)
+                print(f"❌ Tarefa travada {tentativa + 1} terminou antes do timeout")
+                return False
+            except ServicoSaturadoError:
+                print(f"❌ Tarefa travada {tentativa + 1}: fila cheia (503), vagas não foram devolvidas")
+                return False
+            except FuturesTimeoutError:
+                print(f"   Tarefa travada {tentativa + 1}: timeout em {time.perf_counter() - inicio:.2f} s")
+
+        stats = servico.stats()
+        if stats['em_fila'] != 0 or stats['reciclagens'] != servico.max_fila + 1:
+            print(f"❌ Fila não foi liberada: {stats}")
+            sucesso = False
+        else:
+            print(f"✅ Vagas devolvidas ({stats['reciclagens']} reciclagens, em_fila = 0)")
+
+        inicio = time.perf_counter()
+        try:
+            processo_novo = servico.renderizar(0, None)
+        except (ServicoSaturadoError, FuturesTimeoutError) as e:
+            print(f"❌ Serviço não voltou a renderizar: {type(e).__name__}")
+            return False
+        if processo_novo == processo_inicial:
+            print("❌ A ficha seguinte rodou no processo que estava travado")
+            sucesso = False
+        else:
+            print(f"✅ Processo novo renderizou em {time.perf_counter() - inicio:.2f} s "
+                  f"(PID {processo_inicial} -> {processo_novo})")
+    finally:
+        servico.encerrar()
+    return sucesso
+
+if __name__ == "__main__":
+    print("🧪 Teste do timeout do serviço de PDF")
+    print("=" * 60)
+    resultado = testar_servico_pdf()
+    print("=" * 60)
+    sys.exit(0 if resultado else 1)
@@ -232,6 +232,19 @@ class UpdateManager:
             print(f"❌ Erro ao aplicar atualização: {e}")
             return None
     
+    def build_static(self):
+        """Regenera os pacotes JavaScript, as cópias com hash de static/, o manifesto e as variantes .gz/.br"""
+        try:
+            from pacotes_js import construir_pacotes, formatar_relatorio
+            from estaticos import gerar_manifesto
+            from compressao import precomprimir_estaticos
+            print(formatar_relatorio(construir_pacotes(str(self.current_dir / "static"), forcar=True)))
+            manifesto = gerar_manifesto(str(self.current_dir / "static"))
+            print(f"🔖 Manifesto de static/ atualizado: {len(manifesto)} arquivos")
+            print(f"🗜️  {precomprimir_estaticos(str(self.current_dir / 'static'))} variantes comprimidas geradas")
+        except Exception as e:
+            print(f"⚠️  Erro ao gerar manifesto de static/: {e}")
+    
     def update_version(self, new_version):
         """Atualiza o arquivo de versão"""
         try:
@@ -313,10 +326,13 @@ class UpdateManager:
                 self.rollback()
                 return False
             
-            # 6. Atualizar versão
+            # 6. Versionar os arquivos estáticos (cópias com hash e manifesto)
+            self.build_static()
+            
+            # 7. Atualizar versão
             self.update_version(update_info['remote_version'])
             
-            # 7. Limpeza
+            # 8. Limpeza
             self.cleanup()
             
             print("=" * 50)